@@ -1,3 +1,16 @@
+import fs from 'fs';
+
+// 配信用データの対応表（論理名 → ハッシュ付きファイル）をビルド時に埋め込む
+// scripts/build-data-artifacts.py がビルド前に生成（ローカル開発などでなければ元のファイルを使う）
+function loadDataFiles() {
+  try {
+    const manifest = JSON.parse(fs.readFileSync('./public/data/data-manifest.json', 'utf8'));
+    return Object.fromEntries(Object.entries(manifest.files).map(([name, entry]) => [name, entry.file]));
+  } catch {
+    return {};
+  }
+}
+
 /** @type {import('next').NextConfig} */
 const nextConfig = {
   output: 'export',
@@ -6,6 +19,9 @@ const nextConfig = {
   images: {
     unoptimized: true,
   },
+  env: {
+    DATA_FILES: JSON.stringify(loadDataFiles()),
+  },
 };
 
 export default nextConfig;
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI応答キャッシュ（data/ai-cache.json）
+同じ入力に対するGemini呼び出しを実行をまたいで再利用する
+
+- キー: (モデル名, プロンプトテンプレートのバージョン, 正規化した入力のハッシュ)
+  → 記事が浄化・クリーンアップで消えても、同じ入力なら再びAPIを使わない
+- 値: 生の応答テキストと解析済みの結果
+- 上限件数を超えたら最も長く使われていないものから破棄（LRU）
+
+プロンプトを変更したら呼び出し側のテンプレートバージョンを上げること（古い応答は使われなくなる）
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from datetime import datetime
+
+from state_store import load_state, save_state
+
+AI_CACHE_FILE = "ai-cache.json"
+AI_CACHE_MAX_ENTRIES = 3000
+
+_entries = None  # {キー: {"model", "template", "raw", "result", "createdAt", "lastUsedAt"}}（古い順）
+_dirty = False
+STATS = {"hits": 0, "misses": 0}
+
+
+def normalize_input(text) -> str:
+    """入力テキストを正規化（全角半角・連続空白の違いでキーが変わらないように）"""
+    if not text:
+        return ""
+    normalized = unicodedata.normalize('NFKC', str(text))
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+
+def make_key(model: str, template: str, *inputs) -> str:
+    """キャッシュキーを作成"""
+    payload = json.dumps([model, template] + [normalize_input(x) for x in inputs], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def _load():
+    """初回アクセス時に読み込む"""
+    global _entries
+    if _entries is None:
+        _entries = load_state(AI_CACHE_FILE, {}) or {}
+    return _entries
+
+
+def get(key: str):
+    """
+    キャッシュを参照
+    Returns:
+        {"raw": 応答テキスト, "result": 解析済み結果, ...} または None
+    """
+    global _dirty
+    entries = _load()
+    entry = entries.pop(key, None)
+    if entry is None:
+        STATS["misses"] += 1
+        return None
+
+    # 末尾（最近使用）へ移動
+    entry["lastUsedAt"] = datetime.now().isoformat()
+    entries[key] = entry
+    _dirty = True
+    STATS["hits"] += 1
+    return entry
+
+
+def put(key: str, raw: str, result, model: str, template: str) -> None:
+    """応答を保存（上限を超えたら古いものから破棄）"""
+    global _dirty
+    entries = _load()
+    now = datetime.now().isoformat()
+    entries.pop(key, None)
+    entries[key] = {
+        "model": model,
+        "template": template,
+        "raw": raw,
+        "result": result,
+        "createdAt": now,
+        "lastUsedAt": now,
+    }
+    while len(entries) > AI_CACHE_MAX_ENTRIES:
+        entries.pop(next(iter(entries)))
+    _dirty = True
+
+
+def save_cache() -> None:
+    """変更があれば保存"""
+    global _dirty
+    if _entries is not None and _dirty:
+        save_state(AI_CACHE_FILE, _entries)
+        _dirty = False
+
+
+def print_stats() -> None:
+    """ヒット数を表示"""
+    if STATS["hits"] or STATS["misses"]:
+        print(f"  AI応答キャッシュ: ヒット {STATS['hits']}件 / ミス {STATS['misses']}件")
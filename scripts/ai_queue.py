@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI判定待ちの作業キュー（data/ai-queue.json）
+実行ごとの上限で後回しになった作業を次回以降に持ち越し、優先度の高い順に処理する
+
+- 種類:
+  - new: 新規記事の候補（上限で今回AIに回せなかったもの）
+  - retry: 要約が取れず【要約準備中】・ローカル要約のまま保存された記事
+  - recategorize: カテゴリーが現在の定義にない記事
+- 優先度: 理念スコア + 待ち時間（古い作業ほど少しずつ上がり、いつまでも後回しにならない）
+- 同じURLの作業は1つにまとめる（スコアは高い方、登録日時は古い方を残す）
+- 朝刊・夕刊・要約専用モードのどれからでも、残りの枠の分だけ取り出して処理する
+- 再挑戦の上限・有効期限に達した作業・SKIP判定の作業は data/ai-queue-exhausted.json に記録し、
+  保存済み記事の作業（retry・recategorize）として再登録しない（毎回AI枠を使い続けないように）
+
+使用例:
+    ai_queue.push("new", candidate["url"], score, candidate)
+    for item in ai_queue.pop_best(5, kinds={"retry"}):
+        ...
+    ai_queue.save_queue()
+"""
+
+from datetime import datetime
+
+from state_store import load_state, save_state
+
+AI_QUEUE_FILE = "ai-queue.json"
+AI_QUEUE_EXHAUSTED_FILE = "ai-queue-exhausted.json"
+AI_QUEUE_MAX_ITEMS = 500
+AGE_BONUS_PER_DAY = 5  # 1日待つごとに加算する優先度
+AGE_BONUS_MAX = 30
+MAX_ATTEMPTS = 3  # AIに回しても結果が得られなかった場合の再挑戦回数
+EXHAUSTED_TTL_DAYS = 90  # 打ち切りの記録を残す日数（記事の保存期間より長く）
+
+# 種類ごとの有効期限（日）。新規記事は古くなるとニュースとしての価値が下がる
+MAX_AGE_DAYS = {
+    "new": 14,
+    "retry": 60,
+    "recategorize": 60,
+}
+
+_items = None  # {URL: {"kind", "score", "enqueuedAt", "attempts", "payload"}}
+_exhausted = None  # {URL: {"kind", "at", "attempts"}}
+_dirty = False
+
+
+def _load():
+    """初回アクセス時に読み込み、期限切れの作業を除く（保存済み記事の作業は打ち切りとして記録）"""
+    global _items, _exhausted, _dirty
+    if _items is None:
+        _items = load_state(AI_QUEUE_FILE, {}) or {}
+        _exhausted = load_state(AI_QUEUE_EXHAUSTED_FILE, {}) or {}
+        now = datetime.now()
+        for key in [k for k, item in _items.items() if get_age_days(item, now) > MAX_AGE_DAYS.get(item.get("kind"), 14)]:
+            _mark_exhausted(key, _items.pop(key))
+            _dirty = True
+        for key in [k for k, record in _exhausted.items() if get_age_days({"enqueuedAt": record.get("at", "")}, now) > EXHAUSTED_TTL_DAYS]:
+            del _exhausted[key]
+            _dirty = True
+    return _items
+
+
+def _mark_exhausted(key: str, item: dict) -> None:
+    if item.get("kind") != "new":
+        _exhausted[key] = {"kind": item.get("kind"), "at": datetime.now().isoformat(), "attempts": item.get("attempts", 0)}
+
+
+def is_exhausted(key: str) -> bool:
+    """打ち切り済みの作業か"""
+    _load()
+    return key in _exhausted
+
+
+def get_age_days(item: dict, now: datetime = None) -> float:
+    """登録からの経過日数"""
+    try:
+        enqueued_at = datetime.fromisoformat(item.get("enqueuedAt", ""))
+    except ValueError:
+        return 0.0
+    return max(0.0, ((now or datetime.now()) - enqueued_at).total_seconds() / 86400)
+
+
+def get_priority(item: dict, now: datetime = None) -> float:
+    """優先度（理念スコア + 待ち時間）"""
+    return item.get("score", 0) + min(AGE_BONUS_MAX, get_age_days(item, now) * AGE_BONUS_PER_DAY)
+
+
+def push(kind: str, key: str, score: int, payload: dict) -> None:
+    """作業を登録（同じURLの作業があればまとめる。打ち切り済みの保存済み記事の作業は登録しない）"""
+    global _dirty
+    items = _load()
+    if kind != "new" and key in _exhausted:
+        return
+    existing = items.get(key)
+    if existing:
+        existing["score"] = max(existing.get("score", 0), score)
+        existing["payload"] = dict(existing.get("payload") or {}, **payload)
+        if kind != "new":
+            existing["kind"] = kind  # 保存済み記事の作業を優先
+    else:
+        items[key] = {
+            "kind": kind,
+            "score": score,
+            "enqueuedAt": datetime.now().isoformat(),
+            "attempts": 0,
+            "payload": payload,
+        }
+    _dirty = True
+
+    # 上限を超えたら優先度の低いものから破棄
+    if len(items) > AI_QUEUE_MAX_ITEMS:
+        now = datetime.now()
+        for drop_key in sorted(items, key=lambda k: get_priority(items[k], now))[:len(items) - AI_QUEUE_MAX_ITEMS]:
+            del items[drop_key]
+
+
+def requeue(item: dict) -> bool:
+    """
+    結果が得られなかった作業を戻す（登録日時は維持）
+    Returns:
+        False: 再挑戦の上限に達したため破棄した
+    """
+    global _dirty
+    items = _load()
+    attempts = item.get("attempts", 0) + 1
+    if attempts >= MAX_ATTEMPTS:
+        _mark_exhausted(item["key"], dict(item, attempts=attempts))
+        _dirty = True
+        return False
+    items[item["key"]] = {k: v for k, v in item.items() if k != "key"}
+    items[item["key"]]["attempts"] = attempts
+    _dirty = True
+    return True
+
+
+def peek(kinds=None) -> list:
+    """登録中の作業を優先度の高い順に返す（キューからは除かない）"""
+    items = _load()
+    now = datetime.now()
+    selected = [
+        dict(item, key=key) for key, item in items.items()
+        if kinds is None or item.get("kind") in kinds
+    ]
+    selected.sort(key=lambda item: get_priority(item, now), reverse=True)
+    return selected
+
+
+def pop_best(limit: int, kinds=None) -> list:
+    """優先度の高い順に最大 limit 件を取り出す"""
+    selected = peek(kinds)[:max(0, limit)]
+    for item in selected:
+        remove(item["key"])
+    return selected
+
+
+def give_up(item: dict) -> None:
+    """作業を打ち切る（AIがSKIP判定した保存済み記事など。以後は再登録しない）"""
+    global _dirty
+    _load()
+    _items.pop(item["key"], None)
+    _mark_exhausted(item["key"], item)
+    _dirty = True
+
+
+def remove(key: str) -> None:
+    """作業を除く（処理済み・不要になった場合）"""
+    global _dirty
+    if _load().pop(key, None) is not None:
+        _dirty = True
+
+
+def save_queue() -> None:
+    """変更があれば保存"""
+    global _dirty
+    if _items is not None and _dirty:
+        save_state(AI_QUEUE_FILE, _items)
+        save_state(AI_QUEUE_EXHAUSTED_FILE, _exhausted)
+        _dirty = False
+
+
+def print_stats() -> None:
+    """種類ごとの件数を表示"""
+    items = _load()
+    if not items:
+        return
+    counts = {}
+    for item in items.values():
+        counts[item.get("kind", "new")] = counts.get(item.get("kind", "new"), 0) + 1
+    print(f"  AI作業キュー: {len(items)}件（" + " / ".join(f"{kind} {count}件" for kind, count in sorted(counts.items())) + "）"
+          + (f"、打ち切り {len(_exhausted)}件" if _exhausted else ""))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+記事の差分フィード（public/data/articles-delta/）
+articles.json の書き出し（ジャーナルの圧縮）1回分の変更を1ファイルに記録し、
+「lastUpdated 以降に何が変わったか」だけを取得できるようにする
+
+- <実行日時>.json: 1回分の変更（記事IDをキーにする）
+  {"since": 前回の lastUpdated, "until": 今回の lastUpdated,
+   "added": {ID: 記事}, "updated": {ID: 記事}, "summaries": {ID: {"summary", "summarySource"}},
+   "categories": {ID: {"category", "categorySource"}}, "removed": [ID, ...]}
+- index.json: 差分ファイルの一覧（古い順）
+  {"latest": 最新の lastUpdated, "oldest": 取得できる最も古い lastUpdated, "deltas": [{"since", "until", "file", "counts"}]}
+  手元の lastUpdated が oldest より古ければ articles.json を全件取得し直す
+- 差分ファイルは MAX_DELTAS 件まで保持（古いものから削除）
+
+使用例（post-tweet.py）:
+    changes = article_delta.load_changes_since(last_updated)
+    if changes is None:
+        ...  # 全件を読み直す
+"""
+
+import json
+import os
+import tempfile
+
+from state_store import PROJECT_ROOT
+
+DELTA_DIR = os.path.join(PROJECT_ROOT, "public", "data", "articles-delta")
+INDEX_FILE = "index.json"
+MAX_DELTAS = 90  # 1日3回の実行で約1か月分
+
+
+def _write_json(path: str, data, indent=None) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent, separators=None if indent else (',', ':'))
+    os.replace(tmp_path, path)
+
+
+def _load_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return default
+
+
+def _remove(delta_dir: str, file: str) -> None:
+    path = os.path.join(delta_dir, file)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def load_index(delta_dir: str = None) -> dict:
+    """差分ファイルの一覧（なければ空）"""
+    return _load_json(os.path.join(delta_dir or DELTA_DIR, INDEX_FILE), {}) or {}
+
+
+def build_delta(events: list, since: str, until: str) -> dict:
+    """
+    記事一覧の差分イベント（article_journal.diff_events の結果）を1回分の差分にまとめる
+    同じ記事に複数のイベントがある場合は後のイベントを優先
+    """
+    delta = {"since": since, "until": until, "added": {}, "updated": {}, "summaries": {}, "categories": {}, "removed": []}
+    for event in events:
+        kind = event.get("event")
+        article_id = event.get("id", "")
+        if kind == "add":
+            delta["added"][article_id] = event["article"]
+        elif kind == "update":
+            delta["updated"][article_id] = event["article"]
+        elif kind == "update_summary":
+            delta["summaries"][article_id] = {k: event.get(k, "") for k in ("summary", "summarySource")}
+        elif kind == "recategorize":
+            delta["categories"][article_id] = {k: event.get(k, "") for k in ("category", "categorySource")}
+        elif kind == "purge" and article_id not in delta["removed"]:
+            delta["removed"].append(article_id)
+    return delta
+
+
+def write_delta(events: list, since: str, until: str, delta_dir: str = None) -> dict:
+    """
+    1回分の差分ファイルを書き出し、一覧を更新する
+    Args:
+        events: 前回の書き出しとの差分イベント
+        since: 前回の書き出しの lastUpdated
+        until: 今回の書き出しの lastUpdated
+        delta_dir: 出力先（省略時は public/data/articles-delta）
+    Returns:
+        更新した一覧
+    """
+    delta_dir = delta_dir or DELTA_DIR
+    index = load_index(delta_dir)
+    deltas = index.get("deltas", [])
+
+    # 前回の書き出しとつながらない場合（初回・articles.json を手作業で編集した等）は、それまでの差分を使えなくする
+    if index.get("latest") != since:
+        for entry in deltas:
+            _remove(delta_dir, entry["file"])
+        deltas = []
+        index["oldest"] = since
+
+    if events:
+        delta = build_delta(events, since, until)
+        file = until.replace("-", "").replace(":", "").replace(".", "") + ".json"
+        _write_json(os.path.join(delta_dir, file), delta)
+        deltas.append({
+            "since": since,
+            "until": until,
+            "file": file,
+            "counts": {key: len(delta[key]) for key in ("added", "updated", "summaries", "categories", "removed")},
+        })
+
+    # 古い差分を削除（取得できる最も古い lastUpdated も進める）
+    while len(deltas) > MAX_DELTAS:
+        _remove(delta_dir, deltas.pop(0)["file"])
+        index["oldest"] = deltas[0]["since"]
+
+    index["latest"] = until
+    index["deltas"] = deltas
+    _write_json(os.path.join(delta_dir, INDEX_FILE), index, indent=2)
+
+    if events:
+        counts = deltas[-1]["counts"]
+        print(f"✓ 差分フィード: {deltas[-1]['file']}（" + " / ".join(f"{k} {v}件" for k, v in counts.items() if v) + "）")
+    return index
+
+
+def load_changes_since(last_updated: str, delta_dir: str = None):
+    """
+    指定の lastUpdated より後の差分を1つにまとめて返す（後続のスクリプト用）
+    Returns:
+        build_delta と同じ形式の差分（変更なしなら中身が空）。差分で追えない場合は None
+    """
+    delta_dir = delta_dir or DELTA_DIR
+    index = load_index(delta_dir)
+    if not index or not last_updated or last_updated < index.get("oldest", ""):
+        return None
+
+    merged = build_delta([], last_updated, index.get("latest", last_updated))
+    for entry in index.get("deltas", []):
+        if entry["until"] <= last_updated:
+            continue
+        delta = _load_json(os.path.join(delta_dir, entry["file"]), None)
+        if delta is None:
+            return None
+        for article_id in delta.get("removed", []):
+            for key in ("added", "updated", "summaries", "categories"):
+                merged[key].pop(article_id, None)
+            if article_id not in merged["removed"]:
+                merged["removed"].append(article_id)
+        for key in ("added", "updated", "summaries", "categories"):
+            for article_id, value in delta.get(key, {}).items():
+                if article_id in merged["removed"]:
+                    merged["removed"].remove(article_id)
+                merged[key][article_id] = value
+    return merged
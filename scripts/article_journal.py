@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+記事ジャーナル（追記のみの変更履歴: data/article-journal.jsonl）
+記事の変更を1行ずつ追記し、articles.json の書き直しは圧縮（compact）時に1回だけ行う
+
+- イベント: add / update / update_summary / recategorize / exclude / trash / restore / purge
+  （反映の内容は article_store._apply_events を参照）
+- record(): ジャーナルに追記し、記事ストア（SQLite）にも反映する
+  → 同じ実行の後続スクリプトは記事ストアから最新の記事を読める
+- compact(): 記事ストアから articles.json を書き出し、反映済みのイベントを
+  月別のアーカイブ（data/article-journal/YYYY-MM.jsonl）に移す
+  前回の書き出しとの差分は差分フィード（public/data/articles-delta/: article_delta.py）にも記録
+  収集（daily-update）・除外・手動投稿の各ワークフローの最後に1回実行
+- replay(): 最初の記録時に保存した articles.json（data/article-journal/baseline.json）に
+  指定日時までのイベントを反映し、その時点の記事一覧を再現（フィルタの不具合調査用）
+
+使用方法:
+  python scripts/article_journal.py compact
+  python scripts/article_journal.py status
+  python scripts/article_journal.py replay --until 2026-10-01T06:00 [--output replay.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from datetime import datetime
+
+import article_delta
+import article_store
+from state_store import load_state, save_state, state_path
+
+JOURNAL_FILE = "article-journal.jsonl"
+ARCHIVE_DIR = "article-journal"
+BASELINE_FILE = os.path.join(ARCHIVE_DIR, "baseline.json")
+
+EVENTS = ("add", "update", "update_summary", "recategorize", "exclude", "trash", "restore", "purge")
+
+
+def _read_lines(path: str) -> list:
+    events = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        print(f"警告: ジャーナルの壊れた行をスキップ - {line[:60]}")
+    return events
+
+
+def _append_lines(path: str, events: list) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _ensure_baseline() -> None:
+    """最初の記録の前に、その時点の articles.json を再現の起点として保存"""
+    if os.path.exists(state_path(BASELINE_FILE)):
+        return
+    data = {"articles": [], "savedAt": datetime.now().isoformat()}
+    if os.path.exists(article_store.ARTICLES_FILE):
+        with open(article_store.ARTICLES_FILE, 'r', encoding='utf-8') as f:
+            data["articles"] = json.load(f).get('articles', [])
+    save_state(BASELINE_FILE, data)
+
+
+def make_event(event: str, article_id: str = "", url: str = "", **fields) -> dict:
+    """イベントを作成（記録はしない）"""
+    if event not in EVENTS:
+        raise ValueError(f"不明なイベント: {event}")
+    entry = {"at": datetime.now().isoformat(), "event": event}
+    if article_id:
+        entry["id"] = article_id
+    if url:
+        entry["url"] = url
+    entry.update(fields)
+    return entry
+
+
+def record_events(events: list) -> None:
+    """イベントをまとめて追記し、記事ストアに1トランザクションで反映"""
+    if not events:
+        return
+    # 記事ストアを先に同期（articles.json の取り込み時に今回のイベントを二重に適用しないため）
+    article_store.connect()
+    _ensure_baseline()
+    _append_lines(state_path(JOURNAL_FILE), events)
+    article_store.apply_events(events)
+
+
+def record(event: str, article_id: str = "", url: str = "", **fields) -> dict:
+    """
+    イベントを1件追記し、記事ストアに反映
+    例: record("add", article=article) / record("exclude", url=url) / record("purge", article_id)
+    """
+    if event in ("add", "update") and not article_id:
+        article_id = fields["article"]["id"]
+    entry = make_event(event, article_id, url, **fields)
+    record_events([entry])
+    return entry
+
+
+def diff_events(before: list, after: list) -> list:
+    """
+    記事一覧の変更前後の差分をイベントにする（収集スクリプトの保存用）
+    新しい記事は after の後ろから追加する（同じ日付では after の先頭の記事が先に並ぶ）
+    """
+    before_by_id = {a['id']: a for a in before if a.get('id')}
+    after_ids = {a['id'] for a in after if a.get('id')}
+    events = []
+    for article in reversed(after):
+        old = before_by_id.get(article.get('id'))
+        if old is None:
+            events.append(make_event("add", article['id'], article.get('url', ''), article=article))
+        elif old != article:
+            changed = {k for k in set(old) | set(article) if old.get(k) != article.get(k)}
+            if changed <= {"summary", "summarySource"}:
+                events.append(make_event("update_summary", article['id'], summary=article.get('summary', ''),
+                                         summarySource=article.get('summarySource', '')))
+            elif changed <= {"category", "categorySource"}:
+                events.append(make_event("recategorize", article['id'], category=article.get('category', ''),
+                                         categorySource=article.get('categorySource', '')))
+            else:
+                events.append(make_event("update", article['id'], article=article))
+    for article_id, article in before_by_id.items():
+        if article_id not in after_ids:
+            events.append(make_event("purge", article_id, article.get('url', '')))
+    return events
+
+
+def pending_events() -> list:
+    """まだ articles.json に書き出していないイベント"""
+    return _read_lines(state_path(JOURNAL_FILE))
+
+
+def _export() -> None:
+    """記事ストアから articles.json などを書き出し、前回の書き出しとの差分を差分フィードに記録"""
+    before = {}
+    if os.path.exists(article_store.ARTICLES_FILE):
+        with open(article_store.ARTICLES_FILE, 'r', encoding='utf-8') as f:
+            before = json.load(f)
+    data = article_store.export_json()
+    events = diff_events(before.get('articles', []), data["articles"])
+    article_delta.write_delta(events, before.get('lastUpdated') or "", data["lastUpdated"])
+
+
+def compact() -> int:
+    """
+    記事ストアから articles.json を書き出し、反映済みのイベントをアーカイブに移す
+    Returns:
+        アーカイブに移したイベント数
+    """
+    events = pending_events()
+    article_store.connect()
+    if not events:
+        print("記事ジャーナル: 未反映のイベントなし")
+        # 分割ファイルなどがまだない場合（導入直後）は書き出しだけ行う
+        if article_store.exports_missing():
+            _export()
+        return 0
+
+    _export()
+
+    by_month = {}
+    for event in events:
+        by_month.setdefault(event.get("at", "")[:7] or "unknown", []).append(event)
+    for month, month_events in sorted(by_month.items()):
+        _append_lines(state_path(os.path.join(ARCHIVE_DIR, f"{month}.jsonl")), month_events)
+    open(state_path(JOURNAL_FILE), 'w').close()
+
+    counts = {}
+    for event in events:
+        counts[event["event"]] = counts.get(event["event"], 0) + 1
+    print(f"✓ 記事ジャーナルを圧縮: {len(events)}件（" + " / ".join(f"{k} {v}件" for k, v in sorted(counts.items())) + "）")
+    print(f"  → articles.json: {article_store.count()}件")
+    return len(events)
+
+
+def replay(until: str = None) -> list:
+    """指定日時（ISO形式、省略時は現在）までのイベントを反映した記事一覧"""
+    baseline = load_state(BASELINE_FILE, {}) or {}
+    events = []
+    for path in sorted(glob.glob(state_path(os.path.join(ARCHIVE_DIR, "*.jsonl")))):
+        events.extend(_read_lines(path))
+    events.extend(pending_events())
+    if until:
+        events = [e for e in events if e.get("at", "") <= until]
+    return article_store.replay(baseline.get("articles", []), events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='記事ジャーナル')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('compact', help='articles.json を書き出し、反映済みのイベントをアーカイブに移す')
+    sub.add_parser('status', help='未反映のイベント数を表示')
+    replay_parser = sub.add_parser('replay', help='指定日時の記事一覧を再現')
+    replay_parser.add_argument('--until', help='この日時（ISO形式）までのイベントを反映')
+    replay_parser.add_argument('--output', help='再現した記事一覧の出力先（省略時は件数のみ表示）')
+
+    args = parser.parse_args()
+
+    if args.command == 'compact':
+        compact()
+    elif args.command == 'status':
+        events = pending_events()
+        print(f"未反映のイベント: {len(events)}件" + (f"（最古 {events[0].get('at', '')[:19]}）" if events else ""))
+    else:
+        articles = replay(args.until)
+        print(f"{args.until or '現在'}時点の記事: {len(articles)}件")
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({"articles": articles, "replayedUntil": args.until}, f, ensure_ascii=False, indent=2)
+            print(f"  → {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+公開用の記事データの分割ファイル（カテゴリー別・月別・記事別）
+フロントエンドの各ページが articles.json 全体ではなく必要な分だけを取得できるようにする
+
+- public/data/shards/category/<カテゴリーID>.json: カテゴリー別（形式は articles.json と同じ {"articles": [...]}）
+- public/data/shards/month/<YYYY-MM>.json: 月別
+- public/data/shards/manifest.json: 分割ファイルの一覧（件数・日付の範囲・内容のハッシュ）
+- public/data/articles/<記事ID>.json: 記事1件（記事ページのビルドは自分の記事だけを読む）
+- public/data/articles/manifest.json: 記事IDごとのハッシュと、前回の書き出しから
+  追加・変更・削除された記事ID（変更のあったページだけを作り直す差分デプロイ用）
+- 内容が変わらないファイルは書き直さない（コミットの差分を増やさない）
+- 分割ファイルは articles.json の書き出し（article_store.export_json）のたびに作り直す
+- 記事別のファイルはコミットせず、デプロイ時に build-data-artifacts.py が作る
+  （前回の一覧は公開中の manifest.json を取得して使う。なければすべて追加として扱う）
+
+使用例:
+    manifest = article_shards.export_shards(articles)
+    build_manifest = article_shards.export_article_files(articles)
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+
+from state_store import PROJECT_ROOT
+
+SHARD_DIR = os.path.join(PROJECT_ROOT, "public", "data", "shards")
+ARTICLE_DIR = os.path.join(PROJECT_ROOT, "public", "data", "articles")
+MANIFEST_FILE = "manifest.json"
+ARTICLE_HASH_CHARS = 16  # 記事別のハッシュは先頭のみ（記事数が増えても一覧を小さく保つ）
+
+# カテゴリー名 → URL用のID（src/lib/types.ts の categories と同じ）
+CATEGORY_IDS = {
+    "支援・合理的配慮": "support",
+    "多様な学び": "diverse-learning",
+    "研究": "research",
+    "制度・行政": "policy",
+    "ICT・教材": "ict",
+    "イベント・研修": "events",
+    "実践・事例": "practice",
+    "書籍": "books",
+}
+OTHER_CATEGORY_ID = "other"  # 旧カテゴリー名など（フロントエンドのカテゴリーページには表示されない）
+
+
+def _serialize(data) -> bytes:
+    # 分割ファイルはフロントエンドが読むだけなので、インデントなしで小さくする
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _write_atomic(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _group(articles: list) -> dict:
+    """{"category": {ID: [記事]}, "month": {YYYY-MM: [記事]}}（記事の並び順は元のまま）"""
+    groups = {"category": {}, "month": {}}
+    for article in articles:
+        category_id = CATEGORY_IDS.get(article.get('category', ''), OTHER_CATEGORY_ID)
+        groups["category"].setdefault(category_id, []).append(article)
+        month = (article.get('date') or '')[:7] or "unknown"
+        groups["month"].setdefault(month, []).append(article)
+    return groups
+
+
+def load_manifest(shard_dir: str = None) -> dict:
+    """保存済みの一覧（なければ空）"""
+    return _load_json(os.path.join(shard_dir or SHARD_DIR, MANIFEST_FILE))
+
+
+def load_article_manifest(article_dir: str = None) -> dict:
+    """保存済みの記事別の一覧（なければ空）"""
+    return _load_json(os.path.join(article_dir or ARTICLE_DIR, MANIFEST_FILE))
+
+
+def _load_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def export_shards(articles: list, shard_dir: str = None) -> dict:
+    """
+    分割ファイルと一覧を書き出す
+    Args:
+        articles: 記事一覧（articles.json と同じ並び順）
+        shard_dir: 出力先（省略時は public/data/shards）
+    Returns:
+        書き出した一覧
+    """
+    shard_dir = shard_dir or SHARD_DIR
+    previous = {
+        entry["file"]: entry.get("hash")
+        for entries in load_manifest(shard_dir).get("shards", {}).values()
+        for entry in entries
+    }
+
+    shards = {}
+    written = 0
+    for kind, groups in _group(articles).items():
+        entries = []
+        for key, group in sorted(groups.items()):
+            content = _serialize({"articles": group})
+            digest = hashlib.sha1(content).hexdigest()
+            file = f"{kind}/{key}.json"
+            path = os.path.join(shard_dir, file)
+            if previous.get(file) != digest or not os.path.exists(path):
+                _write_atomic(path, content)
+                written += 1
+            dates = [a['date'] for a in group if a.get('date')]
+            entries.append({
+                "key": key,
+                "file": file,
+                "count": len(group),
+                "from": min(dates) if dates else "",
+                "to": max(dates) if dates else "",
+                "hash": digest,
+                "bytes": len(content),
+            })
+        shards[kind] = entries
+
+    # 記事がなくなったカテゴリー・月の分割ファイルを削除
+    current = {entry["file"] for entries in shards.values() for entry in entries}
+    removed = 0
+    for file in previous:
+        if file not in current and os.path.exists(os.path.join(shard_dir, file)):
+            os.remove(os.path.join(shard_dir, file))
+            removed += 1
+
+    manifest = {
+        "generatedAt": datetime.now().isoformat(),
+        "totalCount": len(articles),
+        "shards": shards,
+    }
+    _write_atomic(os.path.join(shard_dir, MANIFEST_FILE),
+                  json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    total = sum(len(entries) for entries in shards.values())
+    print(f"✓ 分割ファイル: {total}件（更新 {written}件 / 削除 {removed}件）")
+    return manifest
+
+
+def export_article_files(articles: list, article_dir: str = None) -> dict:
+    """
+    記事別のファイルと、前回の書き出しからの変更一覧を書き出す
+    Args:
+        articles: 記事一覧
+        article_dir: 出力先（省略時は public/data/articles）
+    Returns:
+        書き出した一覧 {"ids": {記事ID: ハッシュ}, "added", "changed", "removed", ...}
+    """
+    article_dir = article_dir or ARTICLE_DIR
+    previous = load_article_manifest(article_dir)
+    previous_ids = previous.get("ids", {})
+
+    ids = {}
+    added, changed = [], []
+    for article in articles:
+        article_id = article.get('id', '')
+        # 記事IDはファイル名になるため、英数字・ハイフン・アンダースコア以外を含むものは除く
+        if not re.fullmatch(r'[\w-]+', article_id) or article_id in ids:
+            continue
+        content = _serialize(article)
+        digest = hashlib.sha1(content).hexdigest()[:ARTICLE_HASH_CHARS]
+        ids[article_id] = digest
+        path = os.path.join(article_dir, f"{article_id}.json")
+        if previous_ids.get(article_id) != digest:
+            (changed if article_id in previous_ids else added).append(article_id)
+        if previous_ids.get(article_id) != digest or not os.path.exists(path):
+            _write_atomic(path, content)
+
+    removed = [article_id for article_id in previous_ids if article_id not in ids]
+    for article_id in removed:
+        path = os.path.join(article_dir, f"{article_id}.json")
+        if os.path.exists(path):
+            os.remove(path)
+
+    manifest = {
+        "generatedAt": datetime.now().isoformat(),
+        "previousGeneratedAt": previous.get("generatedAt"),
+        "totalCount": len(ids),
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "ids": ids,
+    }
+    _write_atomic(os.path.join(article_dir, MANIFEST_FILE),
+                  json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    print(f"✓ 記事別ファイル: {len(ids)}件（追加 {len(added)}件 / 変更 {len(changed)}件 / 削除 {len(removed)}件）")
+    return manifest
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+記事ストア（SQLite: data/articles.db）
+記事の正本をSQLiteに置き、各スクリプトはここから読み書きする
+公開用の public/data/articles.json は export_json() で書き出す
+（カテゴリー別・月別の分割ファイル public/data/shards/: article_shards.py も同時に書き出す。
+  記事別のファイル public/data/articles/ と検索インデックス public/data/search/ はデプロイ時に
+  build-data-artifacts.py が作る）
+
+- インデックス: ID（主キー）・正規化したURL・日付・カテゴリー・ソース
+  「このURLは登録済みか」「このURLの記事を削除」はJSON全件の読み込み・走査ではなく索引で処理
+- 追加・更新・削除はトランザクションでまとめて反映（途中で落ちても中途半端な状態を残さない）
+- 並び順は articles.json と同じ（日付の新しい順、同じ日付は後から追加した記事が先）
+- 記事の変更は記事ジャーナル（article_journal.py）に追記してから apply_events() で反映し、
+  articles.json の書き出しはジャーナルの圧縮時（export_json）にまとめて行う
+- articles.json が最後の書き出しと違う場合（Actionsの新しいチェックアウト・別ワークフローのコミット・
+  手作業での編集）は、接続時に articles.json から取り込み直し、未圧縮のジャーナルを適用する
+  （.db は Actions の実行間で引き継がないため、コミットされる articles.json + ジャーナルが実行をまたぐ正本の写し）
+
+使用例:
+    articles = article_store.get_articles()
+    if not article_store.has_url(url):
+        article_journal.record("add", article=article)  # 記事ストアにも反映される
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import datetime
+
+import article_delta
+import article_shards
+import url_canon
+from state_store import PROJECT_ROOT, state_path
+
+DB_FILE = "articles.db"
+ARTICLES_FILE = os.path.join(PROJECT_ROOT, "public", "data", "articles.json")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    canonical_url TEXT NOT NULL,
+    date TEXT NOT NULL DEFAULT '',
+    category TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_canonical_url ON articles(canonical_url);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date DESC, seq DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_category ON articles(category, date DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source, date DESC);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_conn = None
+
+
+def _file_hash(path: str) -> str:
+    if not os.path.exists(path):
+        return ""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _get_meta(conn, key: str, default: str = "") -> str:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def _set_meta(conn, key: str, value: str) -> None:
+    conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+
+
+def _row(article: dict, seq: int) -> tuple:
+    return (
+        article['id'],
+        url_canon.canonicalize(article.get('url', '')),
+        article.get('date', ''),
+        article.get('category', ''),
+        article.get('source', ''),
+        seq,
+        json.dumps(article, ensure_ascii=False),
+    )
+
+
+def _insert_all(conn, articles: list) -> None:
+    """先頭の記事ほど seq を大きくして登録（同じ日付の並び順を保つ）"""
+    conn.execute("DELETE FROM articles")
+    conn.executemany(
+        "INSERT OR REPLACE INTO articles (id, canonical_url, date, category, source, seq, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [_row(article, len(articles) - i) for i, article in enumerate(articles) if article.get('id')],
+    )
+
+
+def _sync_from_json(conn) -> None:
+    """articles.json が最後の書き出しと違えば取り込み直し、未圧縮のジャーナルを適用する"""
+    import article_journal  # article_journal が article_store を使うため、ここで読み込む
+
+    current_hash = _file_hash(ARTICLES_FILE)
+    if not current_hash or current_hash == _get_meta(conn, "exportedHash"):
+        return
+    with open(ARTICLES_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    pending = article_journal.pending_events()
+    with conn:
+        _insert_all(conn, data.get('articles', []))
+        _apply_events(conn, pending)
+        _set_meta(conn, "exportedHash", current_hash)
+        _set_meta(conn, "lastUpdated", data.get('lastUpdated') or "")
+    print(f"✓ 記事ストアに articles.json を取り込み: {len(data.get('articles', []))}件"
+          + (f"（未圧縮のジャーナル{len(pending)}件を適用）" if pending else ""))
+
+
+def connect() -> sqlite3.Connection:
+    """記事ストアに接続（初回のみ。スキーマ作成と articles.json との同期を行う）"""
+    global _conn
+    if _conn is None:
+        path = state_path(DB_FILE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _conn = sqlite3.connect(path)
+        _conn.executescript(SCHEMA)
+        _sync_from_json(_conn)
+    return _conn
+
+
+def get_articles(category: str = None, source: str = None, limit: int = None) -> list:
+    """記事一覧（日付の新しい順）"""
+    query = "SELECT data FROM articles"
+    conditions, params = [], []
+    if category:
+        conditions.append("category = ?")
+        params.append(category)
+    if source:
+        conditions.append("source = ?")
+        params.append(source)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY date DESC, seq DESC"
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+    return [json.loads(data) for (data,) in connect().execute(query, params)]
+
+
+def get_by_id(article_id: str):
+    """IDで記事を取得（なければ None）"""
+    row = connect().execute("SELECT data FROM articles WHERE id = ?", (article_id,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def get_by_url(url: str):
+    """URLで記事を取得（正規化したURLで照合。なければ None）"""
+    row = connect().execute("SELECT data FROM articles WHERE canonical_url = ?", (url_canon.canonicalize(url),)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def has_url(url: str) -> bool:
+    """URLの記事が登録済みか（正規化したURLで照合）"""
+    return connect().execute("SELECT 1 FROM articles WHERE canonical_url = ? LIMIT 1", (url_canon.canonicalize(url),)).fetchone() is not None
+
+
+def count() -> int:
+    """記事数"""
+    return connect().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+def _upsert(conn, article: dict) -> None:
+    """記事を追加・更新（既存のIDは内容のみ更新し、並び順は維持。新しい記事は同じ日付の記事より先に並ぶ）"""
+    next_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM articles").fetchone()[0] + 1
+    conn.execute(
+        "INSERT INTO articles (id, canonical_url, date, category, source, seq, data) VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET canonical_url = excluded.canonical_url, date = excluded.date, "
+        "category = excluded.category, source = excluded.source, data = excluded.data",
+        _row(article, next_seq),
+    )
+
+
+def _update_fields(conn, article_id: str, fields: dict) -> None:
+    row = conn.execute("SELECT data FROM articles WHERE id = ?", (article_id,)).fetchone()
+    if row:
+        _upsert(conn, dict(json.loads(row[0]), **fields))
+
+
+def _apply_events(conn, events: list) -> None:
+    """
+    ジャーナルのイベントを反映（同じイベントを2回反映しても結果は変わらない）
+    - add / update: 記事全体を追加・更新
+    - update_summary: 要約（summary・summarySource）を更新
+    - recategorize: カテゴリー（category・categorySource）を更新
+    - exclude: URLの記事を削除（ブラックリスト登録）
+    - purge: IDの記事を削除（保持期間・理念フィルタによる整理）
+    - trash / restore: 記録のみ（表示はゴミ箱 trashed-articles.json で制御し、元に戻せるため削除しない）
+    """
+    for event in events:
+        kind = event.get("event")
+        if kind in ("add", "update"):
+            _upsert(conn, event["article"])
+        elif kind == "update_summary":
+            _update_fields(conn, event["id"], {k: event[k] for k in ("summary", "summarySource") if k in event})
+        elif kind == "recategorize":
+            _update_fields(conn, event["id"], {k: event[k] for k in ("category", "categorySource") if k in event})
+        elif kind == "exclude":
+            conn.execute("DELETE FROM articles WHERE canonical_url = ?", (url_canon.canonicalize(event["url"]),))
+        elif kind == "purge":
+            conn.execute("DELETE FROM articles WHERE id = ?", (event["id"],))
+
+
+def apply_events(events: list) -> None:
+    """ジャーナルのイベントを1トランザクションで反映"""
+    conn = connect()
+    with conn:
+        _apply_events(conn, events)
+
+
+def replay(base_articles: list, events: list) -> list:
+    """
+    記事一覧にイベントを順に反映した結果を返す（記事ストア本体は変更しない）
+    ある時点の記事一覧の再現（フィルタの不具合調査など）に使う
+    """
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    _insert_all(conn, base_articles)
+    _apply_events(conn, events)
+    return [json.loads(data) for (data,) in conn.execute("SELECT data FROM articles ORDER BY date DESC, seq DESC")]
+
+
+def get_last_updated() -> str:
+    """最後に書き出した（取り込んだ）articles.json の更新日時"""
+    return _get_meta(connect(), "lastUpdated")
+
+
+def exports_missing() -> bool:
+    """articles.json と一緒に書き出すファイル（分割ファイル・差分フィード）がまだないか"""
+    return not (article_shards.load_manifest() and article_delta.load_index())
+
+
+def export_json(path: str = None) -> dict:
+    """
+    公開用の articles.json を書き出す（一時ファイルに書いてから置き換え）
+    Returns:
+        書き出したデータ
+    """
+    conn = connect()
+    path = path or ARTICLES_FILE
+    articles = get_articles()
+    sources = []
+    for article in articles:
+        if article.get('source') and article['source'] not in sources:
+            sources.append(article['source'])
+    data = {
+        "articles": articles,
+        "lastUpdated": datetime.now().isoformat(),
+        "totalCount": len(articles),
+        "sources": sources,
+    }
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+    if path == ARTICLES_FILE:
+        article_shards.export_shards(articles)
+        with conn:
+            _set_meta(conn, "exportedHash", _file_hash(path))
+            _set_meta(conn, "lastUpdated", data["lastUpdated"])
+    return data
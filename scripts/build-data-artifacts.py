@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配信用データの生成スクリプト（デプロイ時、npm run build の前に実行）
+public/data/*.json を圧縮・ハッシュ付きのファイル名で書き出し、
+論理名 → 実ファイルの対応表 public/data/data-manifest.json を生成
+
+【出力】
+- public/data/search/: 検索インデックス（search_index.py）。記事1件の追加で多くの分割ファイルが
+  変わるため、コミットせずにデプロイのたびに articles.json から作る
+- public/data/articles/: 記事別のファイル（article_shards.export_article_files）。同じくコミットしない
+  （前回の変更一覧との比較は、デプロイ前に公開中の manifest.json を取得して行う: deploy.yml）
+- public/data/hashed/<名前>.<ハッシュ>.json: インデントなしのJSON（内容が変わればファイル名も変わる）
+- 同じ名前の .gz / .br: 事前圧縮版（.br は brotli パッケージがある場合のみ）
+- public/data/data-manifest.json: {"files": {"articles.json": {"file": "hashed/articles.<ハッシュ>.json", ...}}}
+  next.config.mjs がビルド時に読み込んでフロントエンドに埋め込む（src/lib/types.ts の fetchDataFile）
+
+【GitHub Pages での効果】
+- Pages はヘッダーを設定できない（Cache-Control は一律 max-age=600、immutable は付かない）
+- .gz / .br を Content-Encoding 付きで配信することもできない（Pages 自身が gzip 圧縮する）
+- そのため Pages では、インデントなしによる転送量の削減と、ファイル名が変わることによる
+  デプロイ直後の古いキャッシュの回避のみ。長期キャッシュ・事前圧縮版は、ヘッダーを設定できる
+  CDN・サーバーに移した場合に使う
+
+【注意】
+- 生成物はデプロイのビルド時にだけ作り、コミットしない（.gitignore 済み）
+- 編集用の元ファイル（public/data/*.json）はこれまでどおり indent=2 のまま
+"""
+
+import glob
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+
+try:
+    import brotli
+except ImportError:  # brotli がない環境では .br を作らない（.gz のみ）
+    brotli = None
+
+import article_shards
+import search_index
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# パス設定
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DATA_DIR = os.path.join(PROJECT_ROOT, "public", "data")
+HASHED_DIR = os.path.join(DATA_DIR, "hashed")
+MANIFEST_FILE = os.path.join(DATA_DIR, "data-manifest.json")
+
+HASH_CHARS = 12
+
+
+def build_artifact(path: str) -> dict:
+    """
+    1ファイル分のハッシュ付きファイル（と圧縮版）を書き出す
+    Returns:
+        対応表の1件分 {"file", "hash", "bytes", "gzipBytes", "brBytes"}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    content = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()[:HASH_CHARS]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    file = f"hashed/{stem}.{digest}.json"
+    out_path = os.path.join(DATA_DIR, file)
+
+    with open(out_path, 'wb') as f:
+        f.write(content)
+    # mtime=0: 同じ内容なら同じ .gz になるように
+    gz = gzip.compress(content, compresslevel=9, mtime=0)
+    with open(out_path + ".gz", 'wb') as f:
+        f.write(gz)
+    entry = {"file": file, "hash": digest, "bytes": len(content), "gzipBytes": len(gz)}
+    if brotli is not None:
+        br = brotli.compress(content, quality=11)
+        with open(out_path + ".br", 'wb') as f:
+            f.write(br)
+        entry["brBytes"] = len(br)
+    return entry
+
+
+def build_article_exports() -> None:
+    """articles.json から、コミットしない記事データ（検索インデックス・記事別のファイル）を書き出す"""
+    path = os.path.join(DATA_DIR, "articles.json")
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        articles = json.load(f).get('articles', [])
+    search_index.export_index(articles)
+    article_shards.export_article_files(articles)
+
+
+def build_data_artifacts():
+    """public/data/*.json の配信用ファイルと対応表を生成"""
+    print("=== 配信用データ生成 ===")
+    build_article_exports()
+    if brotli is None:
+        print("  brotli パッケージがないため .br は作りません（pip install brotli）")
+
+    os.makedirs(HASHED_DIR, exist_ok=True)
+    files = {}
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.json"))):
+        name = os.path.basename(path)
+        if path == MANIFEST_FILE:
+            continue
+        try:
+            entry = build_artifact(path)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"  ✗ {name}: {e}（元のファイルをそのまま配信）")
+            continue
+        files[name] = entry
+        original = os.path.getsize(path)
+        print(f"  ✓ {name} → {entry['file']}（{original // 1024}KB → gzip {entry['gzipBytes'] // 1024}KB"
+              + (f" / br {entry['brBytes'] // 1024}KB" if "brBytes" in entry else "") + "）")
+
+    # 前回の生成物のうち、今回使わないものを削除
+    current = {os.path.basename(entry["file"]) for entry in files.values()}
+    removed = 0
+    for path in glob.glob(os.path.join(HASHED_DIR, "*")):
+        name = os.path.basename(path)
+        if name.removesuffix(".gz").removesuffix(".br") not in current:
+            os.remove(path)
+            removed += 1
+
+    manifest = {
+        "generatedAt": datetime.now().isoformat(),
+        "files": files,
+    }
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"\n=== 配信用データ生成完了 ===")
+    print(f"  - ファイル数: {len(files)}件（古い生成物の削除: {removed}件）")
+    print(f"  - 出力: {MANIFEST_FILE}")
+    return manifest
+
+
+if __name__ == "__main__":
+    build_data_artifacts()
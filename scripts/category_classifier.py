@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ローカルのカテゴリー分類器（文字n-gram + ナイーブベイズ）
+保存済み記事（articles.json）のカテゴリーを教師データにして学習し、
+確信度が高い記事はGeminiを使わずにカテゴリーを判定する
+
+- 特徴量: タイトル（2回分の重み）+ 要約の文字2-gram・3-gram
+- モデル: data/category-model.json（頻度の高い特徴量のみ・クラス別の出現数）
+- 学習時に一部の記事を検証用に取り分け、しきい値以上の判定の正解率が
+  MIN_PRECISION に届かなければ分類器を使わない（Geminiで判定する）
+- 教師データが RETRAIN_EVERY 件以上増えたら再学習
+
+使用例:
+    category_classifier.prepare([(title, summary, category), ...])
+    category, confidence = category_classifier.classify(title, summary)
+    if category:  # 確信度がしきい値以上
+        ...
+"""
+
+import hashlib
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from state_store import load_state, save_state
+
+MODEL_FILE = "category-model.json"
+MODEL_VERSION = 1
+
+NGRAM_SIZES = (2, 3)
+MAX_FEATURES = 6000
+MIN_FEATURE_COUNT = 2
+ALPHA = 0.5  # ラプラススムージング
+# 尤度は特徴量1つあたりの平均に直してから掛ける（長い要約ほど確信度が1に張り付くのを防ぐ）
+LIKELIHOOD_SCALE = 20
+
+CONFIDENCE_THRESHOLD = 0.9  # これ未満はGeminiで判定
+MIN_PRECISION = 0.9  # 検証用データでしきい値以上の判定がこの正解率に届かなければ使わない
+MIN_SAMPLES = 60  # 教師データがこれより少なければ学習しない
+MIN_HOLDOUT = 20
+HOLDOUT_RATIO = 0.2
+RETRAIN_EVERY = 50
+
+_model = None
+STATS = {"hits": 0, "fallbacks": 0}
+
+
+def extract_features(title: str, summary: str = "") -> Counter:
+    """文字n-gramの出現数（全角半角・大文字小文字・空白の違いは無視）"""
+    def normalize(text):
+        return re.sub(r'\s+', '', unicodedata.normalize('NFKC', text or '').lower())
+
+    features = Counter()
+    for text, weight in ((normalize(title), 2), (normalize(summary), 1)):
+        for n in NGRAM_SIZES:
+            for i in range(len(text) - n + 1):
+                features[text[i:i + n]] += weight
+    return features
+
+
+def _is_holdout(title: str) -> bool:
+    """検証用に取り分ける記事（タイトルのハッシュで固定的に分ける）"""
+    return int(hashlib.md5(title.encode('utf-8')).hexdigest()[:8], 16) % 100 < HOLDOUT_RATIO * 100
+
+
+def _fit(samples: list) -> dict:
+    """
+    ナイーブベイズの学習
+    Args:
+        samples: [(タイトル, 要約, カテゴリー)]
+    """
+    class_docs = Counter()
+    class_counts = defaultdict(Counter)
+    for title, summary, category in samples:
+        class_docs[category] += 1
+        class_counts[category].update(extract_features(title, summary))
+
+    totals = Counter()
+    for counts in class_counts.values():
+        totals.update(counts)
+    vocabulary = [f for f, c in totals.most_common(MAX_FEATURES) if c >= MIN_FEATURE_COUNT]
+
+    categories = sorted(class_docs)
+    return {
+        "version": MODEL_VERSION,
+        "categories": categories,
+        "docs": [class_docs[c] for c in categories],
+        "totals": [sum(class_counts[c][f] for f in vocabulary) for c in categories],
+        # 特徴量ごとのクラス別出現数（コンパクトに保存するため空白区切りの文字列）
+        "features": {f: " ".join(str(class_counts[c][f]) for c in categories) for f in vocabulary},
+    }
+
+
+def _predict(model: dict, title: str, summary: str):
+    """
+    Returns:
+        (カテゴリー, 確信度)
+    """
+    categories = model["categories"]
+    total_docs = sum(model["docs"])
+    vocabulary_size = len(model["features"]) or 1
+    denominators = [math.log(t + ALPHA * vocabulary_size) for t in model["totals"]]
+
+    rows = model.get("_rows")
+    if rows is None:
+        rows = model["_rows"] = {f: [int(x) for x in row.split()] for f, row in model["features"].items()}
+
+    likelihoods = [0.0] * len(categories)
+    matched = 0
+    for feature, count in extract_features(title, summary).items():
+        row = rows.get(feature)
+        if row is None:
+            continue
+        matched += count
+        for k, n in enumerate(row):
+            likelihoods[k] += count * (math.log(n + ALPHA) - denominators[k])
+
+    scores = [
+        math.log(d / total_docs) + LIKELIHOOD_SCALE * likelihood / max(1, matched)
+        for d, likelihood in zip(model["docs"], likelihoods)
+    ]
+
+    # 事後確率（softmax）
+    best = max(scores)
+    exps = [math.exp(s - best) for s in scores]
+    k = exps.index(1.0)
+    return categories[k], 1.0 / sum(exps)
+
+
+def train(samples: list) -> dict:
+    """
+    検証用データで精度を確認してから、全データで学習したモデルを返す
+    Args:
+        samples: [(タイトル, 要約, カテゴリー)]
+    """
+    train_set = [s for s in samples if not _is_holdout(s[0])]
+    holdout = [s for s in samples if _is_holdout(s[0])]
+
+    confident = correct = 0
+    if train_set and holdout:
+        trial = _fit(train_set)
+        for title, summary, category in holdout:
+            predicted, confidence = _predict(trial, title, summary)
+            if confidence >= CONFIDENCE_THRESHOLD:
+                confident += 1
+                correct += predicted == category
+
+    precision = correct / confident if confident else 0.0
+    model = _fit(samples)
+    model["trainedAt"] = datetime.now().isoformat()
+    model["trainedCount"] = len(samples)
+    model["holdout"] = {
+        "size": len(holdout),
+        "coverage": round(confident / len(holdout), 3) if holdout else 0.0,
+        "precision": round(precision, 3),
+    }
+    model["enabled"] = len(holdout) >= MIN_HOLDOUT and precision >= MIN_PRECISION
+    return model
+
+
+def prepare(samples: list) -> None:
+    """モデルを読み込む（なければ・教師データが増えていれば再学習して保存）"""
+    global _model
+    model = load_state(MODEL_FILE)
+    if len(samples) < MIN_SAMPLES:
+        _model = model if model and model.get("version") == MODEL_VERSION else None
+        return
+
+    if not model or model.get("version") != MODEL_VERSION or abs(len(samples) - model.get("trainedCount", 0)) >= RETRAIN_EVERY:
+        model = train(samples)
+        save_state(MODEL_FILE, model)
+        holdout = model["holdout"]
+        print(f"✓ カテゴリー分類器を学習: {len(samples)}件 / 検証 {holdout['size']}件"
+              f"（判定率 {holdout['coverage']:.0%}・正解率 {holdout['precision']:.0%}）"
+              f"{'' if model['enabled'] else ' → 精度不足のため使用しない'}")
+    _model = model
+
+
+def classify(title: str, summary: str = ""):
+    """
+    カテゴリーを判定
+    Returns:
+        (カテゴリー, 確信度)。確信度がしきい値未満・モデルが使えない場合は (None, 確信度)
+    """
+    if not _model or not _model.get("enabled"):
+        return None, 0.0
+    category, confidence = _predict(_model, title, summary)
+    if confidence < CONFIDENCE_THRESHOLD:
+        STATS["fallbacks"] += 1
+        return None, confidence
+    STATS["hits"] += 1
+    return category, confidence
+
+
+def print_stats() -> None:
+    """判定数を表示"""
+    if STATS["hits"] or STATS["fallbacks"]:
+        print(f"  ローカル分類器: 判定 {STATS['hits']}件 / Geminiへ {STATS['fallbacks']}件")
+
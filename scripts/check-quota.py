@@ -9,11 +9,11 @@ API消費チェッカー
   python scripts/check-quota.py --need 5  # 5件のAPI呼び出しが必要な場合
 """
 
-import json
 import os
 import sys
 import io
-from datetime import datetime, timedelta, timezone
+
+import quota_ledger
 
 # Windows環境での文字化け対策
 if sys.platform == 'win32':
@@ -22,103 +22,36 @@ if sys.platform == 'win32':
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-STATUS_FILE = os.path.join(PROJECT_ROOT, "public", "data", "status.json")
 
 # API制限設定
-DAILY_API_LIMIT = 20
-ROUTINE_RESERVED = 11  # 朝刊5 + 夕刊6
-CONSTRUCTION_AVAILABLE = DAILY_API_LIMIT - ROUTINE_RESERVED  # 9件
+DAILY_API_LIMIT = quota_ledger.DAILY_API_LIMIT
 
 def get_jst_now():
     """日本時間の現在時刻を取得"""
-    # UTCから+9時間
-    return datetime.now(timezone.utc) + timedelta(hours=9)
+    return quota_ledger.get_jst_now()
 
 def get_reset_time():
     """次のリセット時刻（17:00 JST）を取得"""
-    now = get_jst_now()
-    reset_today = now.replace(hour=17, minute=0, second=0, microsecond=0)
-
-    if now >= reset_today:
-        # 今日のリセット時刻を過ぎている場合、明日のリセット時刻
-        return reset_today + timedelta(days=1)
-    else:
-        return reset_today
-
-def load_status():
-    """status.jsonを読み込む"""
-    if not os.path.exists(STATUS_FILE):
-        return None
-    with open(STATUS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def calculate_used_today(status):
-    """今日（現在のクォータ期間）のAPI使用量を計算"""
-    if not status:
-        return 0
-
-    now = get_jst_now()
-    reset_time = get_reset_time()
-    # クォータ期間の開始時刻（前回のリセット時刻）
-    period_start = reset_time - timedelta(days=1)
-
-    # historyから該当期間の使用量を集計
-    total_used = 0
-    for entry in status.get('history', []):
-        try:
-            timestamp = datetime.fromisoformat(entry.get('timestamp', ''))
-            # JSTに変換（タイムスタンプがUTCの場合）
-            if timestamp.tzinfo is None:
-                # ナイーブな日時の場合、JSTと仮定
-                entry_time = timestamp
-            else:
-                entry_time = timestamp + timedelta(hours=9)
-
-            # 期間内のエントリを集計
-            if period_start <= entry_time < reset_time:
-                total_used += entry.get('apiCalls', 0)
-        except:
-            continue
-
-    # 最新の実行も含める
-    last_run = status.get('lastRun', {})
-    try:
-        last_timestamp = datetime.fromisoformat(last_run.get('timestamp', ''))
-        if period_start <= last_timestamp < reset_time:
-            # historyに含まれていない場合のみ追加
-            if last_run.get('timestamp') not in [h.get('timestamp') for h in status.get('history', [])]:
-                total_used += last_run.get('apiCalls', 0)
-    except:
-        pass
-
-    return total_used
+    return quota_ledger.get_reset_time()
 
 def check_quota(needed_calls=0):
     """API残量をチェック"""
-    status = load_status()
 
     now = get_jst_now()
     reset_time = get_reset_time()
     time_until_reset = reset_time - now
     hours_until_reset = time_until_reset.total_seconds() / 3600
 
-    # 今日の使用量
-    used_today = status.get('apiUsage', {}).get('used', 0) if status else 0
+    # 今日の使用量（API使用台帳）
+    usage = quota_ledger.get_usage()
+    used_today = usage['used']
 
-    # 残り使用可能量
-    remaining = DAILY_API_LIMIT - used_today
+    # 残り使用可能量（他の実行が予約中の枠は除く）
+    remaining = DAILY_API_LIMIT - used_today - usage['reserved']
 
     # 構築作業に使える量（ルーティン予約を除く）
-    # 次のルーティン実行までに必要な枠を計算
-    routine_needed = 0
-    if now.hour < 7:
-        routine_needed = 11  # 朝刊5 + 夕刊6
-    elif now.hour < 17:
-        routine_needed = 6   # 夕刊6のみ（朝刊は終了）
-    elif now.hour < 18:
-        routine_needed = 6   # 夕刊6
-    else:
-        routine_needed = 5   # 朝刊5（次の日）
+    # この期間にまだ実行されていないルーティンの枠を台帳から計算
+    routine_needed = quota_ledger.get_pending_routine_reserve(usage['routineRuns'], 'manual')
 
     construction_available = max(0, remaining - routine_needed)
 
@@ -132,6 +65,7 @@ def check_quota(needed_calls=0):
     print(f"【API使用状況】")
     print(f"  1日の上限:     {DAILY_API_LIMIT}件")
     print(f"  使用済み:      {used_today}件")
+    print(f"  予約中:        {usage['reserved']}件")
     print(f"  残り:          {remaining}件")
     print()
     print(f"【内訳】")
@@ -18,6 +18,10 @@ import hashlib
 import argparse
 from datetime import datetime
 
+import article_journal
+import article_store
+import url_canon
+
 # Windows環境での文字化け対策
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -25,7 +29,6 @@ if sys.platform == 'win32':
 # パス設定
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-ARTICLES_FILE = os.path.join(PROJECT_ROOT, "public", "data", "articles.json")
 MANUAL_FILE = os.path.join(PROJECT_ROOT, "public", "data", "manual-articles.json")
 AI_PICKS_FILE = os.path.join(PROJECT_ROOT, "public", "data", "ai-picks.json")
 EXCLUDED_FILE = os.path.join(PROJECT_ROOT, "public", "data", "excluded-urls.json")
@@ -57,7 +60,7 @@ def add_to_blacklist(url):
     """URLをブラックリストに追加"""
     excluded_data = load_json(EXCLUDED_FILE) or {"excludedUrls": [], "lastUpdated": None}
 
-    if url in excluded_data['excludedUrls']:
+    if url in url_canon.UrlIndex(excluded_data['excludedUrls']):
         print(f"このURLは既にブラックリストに含まれています: {url}")
         return False
 
@@ -68,27 +71,16 @@ def add_to_blacklist(url):
 
 
 def remove_from_articles(url):
-    """articles.json から記事を削除"""
-    articles_data = load_json(ARTICLES_FILE)
-    if not articles_data:
-        return False, None
-
-    original_count = len(articles_data.get('articles', []))
-    removed_article = None
-
-    new_articles = []
-    for article in articles_data.get('articles', []):
-        if article.get('url', '').strip() == url.strip():
-            removed_article = article
-            print(f"  削除: {article.get('title', '')[:50]}...")
-        else:
-            new_articles.append(article)
-
+    """
+    articles.json から記事を削除
+    記事ジャーナルに1行追記するだけで、articles.json の書き出しはワークフローの最後の圧縮で行う
+    """
+    removed_article = article_store.get_by_url(url)
     if removed_article:
-        articles_data['articles'] = new_articles
-        articles_data['lastUpdated'] = datetime.now().isoformat()
-        save_json(ARTICLES_FILE, articles_data)
-        print(f"  articles.json: {original_count} -> {len(new_articles)} 件")
+        print(f"  削除: {removed_article.get('title', '')[:50]}...")
+        original_count = article_store.count()
+        article_journal.record("exclude", url=url)
+        print(f"  記事ストア: {original_count} -> {article_store.count()} 件（articles.json には圧縮時に反映）")
 
     return removed_article is not None, removed_article
 
@@ -104,7 +96,7 @@ def remove_from_manual(url):
 
     new_articles = []
     for article in manual_data.get('articles', []):
-        if article.get('url', '').strip() == url.strip():
+        if url_canon.canonicalize(article.get('url', '')) == url_canon.canonicalize(url):
             removed_article = article
             print(f"  削除（手動記事）: {article.get('title', '')[:50]}...")
         else:
@@ -131,7 +123,7 @@ def remove_from_picks_and_refill(url):
     new_picks = []
     removed = False
     for pick in picks_data.get('picks', []):
-        if pick.get('url', '').strip() == url.strip():
+        if url_canon.canonicalize(pick.get('url', '')) == url_canon.canonicalize(url):
             print(f"  ピックアップから削除: {pick.get('title', '')[:50]}...")
             removed = True
         else:
@@ -145,20 +137,14 @@ def remove_from_picks_and_refill(url):
     # 5件未満なら補填
     if len(new_picks) < 5:
         print("  ピックアップ枠を補填中...")
-        articles_data = load_json(ARTICLES_FILE)
         excluded_data = load_json(EXCLUDED_FILE) or {"excludedUrls": []}
-        excluded_urls = set(excluded_data.get('excludedUrls', []))
+        excluded_urls = url_canon.UrlIndex(excluded_data.get('excludedUrls', []))
 
-        if articles_data:
+        # 日付順の記事（記事ストアから取得）から補填
+        sorted_articles = article_store.get_articles()
+        if sorted_articles:
             # 既にピックに含まれている記事URLを取得
-            picked_urls = {p.get('url') for p in new_picks}
-
-            # 日付順でソートした記事から補填
-            sorted_articles = sorted(
-                articles_data.get('articles', []),
-                key=lambda x: x.get('date', ''),
-                reverse=True
-            )
+            picked_urls = url_canon.UrlIndex(p.get('url') for p in new_picks)
 
             for article in sorted_articles:
                 if len(new_picks) >= 5:
@@ -20,7 +20,11 @@ import sys
 import io
 import time
 import argparse
+import calendar
 import shutil
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Optional, Set
 from urllib.parse import urlparse, urljoin
@@ -28,6 +32,19 @@ from collections import defaultdict
 import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
+import ai_cache
+import ai_queue
+import article_journal
+import article_store
+import category_classifier
+import local_summarizer
+import near_duplicate
+import url_canon
+import http_client
+import quota_ledger
+import rate_limiter
+from filter_rules import CORE_KEYWORDS, FilterEngine, RULESET_BASIC
+from state_store import load_state, save_state
 
 # .env.local から環境変数を読み込む
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env.local'))
@@ -41,6 +58,7 @@ def parse_args():
     parser.add_argument('--dev', action='store_true', help='開発モード（完全キャッシュモード）')
     parser.add_argument('--summary-only', action='store_true', help='要約生成のみ実行（新規記事収集をスキップ）')
     parser.add_argument('--max-calls', type=int, default=None, help='API呼び出し上限（ワークフローから渡される）')
+    parser.add_argument('--catch-up', action='store_true', help='前回実行を取りこぼした場合に各フィードを深くまで確認')
     return parser.parse_args()
 
 ARGS = parse_args()
@@ -87,6 +105,10 @@ if IS_DEV_MODE:
 
 # Gemini API初期化
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_MODEL = "gemini-2.5-flash"
+# 【AI応答キャッシュ】プロンプトを変更したらバージョンを上げる（古い応答を使わないため）
+PROMPT_VERSION_SUMMARY = "summary-v1"
+PROMPT_VERSION_CATEGORY = "category-v1"
 gemini_client = None
 
 if GEMINI_API_KEY:
@@ -235,9 +257,19 @@ RESEARCH_INSTITUTIONS = [
     },
 ]
 
+# スクレイピング対象の一覧ページ
+MEXT_PRESS_URL = "https://www.mext.go.jp/b_menu/houdou/index.htm"
+TSUKUBA_HUMAN_NEWS_URL = RESEARCH_INSTITUTIONS[0]["url"]
+KODOMO_IT_URL = "https://edu.watch.impress.co.jp/"
+
 # ドメインごとの最大記事数
 MAX_ARTICLES_PER_DOMAIN = 3
 
+# 【並列取得】フィード・一覧ページの同時取得設定
+# AI呼び出しは従来通り完全直列。並列化するのはHTTP取得のみ
+FETCH_MAX_WORKERS = 8  # 全体の同時接続数
+FETCH_PER_HOST_LIMIT = 2  # 同一ホストへの同時接続数（相手サーバーへの配慮）
+
 # 【朝刊・夕刊スタイル】1日2回実行（JST 7:00, 18:00）
 LIGHT_MODE = True
 MAX_ARTICLES_PER_SOURCE = 3  # 各ソースから最大3件
@@ -251,10 +283,10 @@ MAX_NEW_ARTICLES_PER_RUN = 5  # 1回の実行で追加する最大記事数
 #   - 夕刊 (18:00): 6件（5件 + AIピック1件）
 #   - ルーティン合計: 11件
 #   - 構築/要約補完用: 9件（20 - 11）
+#   （上限・ルーティン枠は quota_ledger の DAILY_API_LIMIT・ROUTINE_QUOTAS）
 # ========================================
-DAILY_API_LIMIT = 20
-ROUTINE_RESERVED = 11  # 朝刊5 + 夕刊6
-CONSTRUCTION_AVAILABLE = DAILY_API_LIMIT - ROUTINE_RESERVED  # 9件
+DAILY_API_LIMIT = quota_ledger.DAILY_API_LIMIT
+ROUTINE_RESERVED = sum(quota_ledger.ROUTINE_QUOTAS.values())  # 朝刊5 + 夕刊6
 
 # --max-calls 引数が指定されていればそれを使用（ワークフローからの予約制限）
 if ARGS.max_calls is not None:
@@ -276,24 +308,54 @@ elif SUMMARY_ONLY:
 else:
     MAX_AI_CALLS_PER_RUN = 5  # 通常モード: 1回5件
 
-AI_CALL_SLEEP_SECONDS = 15  # 【RPM制限回避】15秒間隔で4回/分に抑制（5RPM制限を確実回避）
+# 【RPM制限回避】固定の待機は廃止し、rate_limiter のトークンバケットで必要な分だけ待つ
+# （data/rate-limit.json を手動投稿・編集部ピックアップと共有）
 # 【重要】完全直列処理 - 並列処理禁止、1件ずつ順番にAI要約を実行
 
 # AI呼び出しカウンター（リトライ+新規の合計）
+# 実際に枠を確保した呼び出しだけを数える（acquire_ai_call）
 TOTAL_AI_CALLS_THIS_RUN = 0
+DAILY_QUOTA_EXHAUSTED = False  # 本日の枠がない（以降のAI呼び出しは試さない）
+
+
+def acquire_ai_call(label: str = "") -> bool:
+    """
+    【レート制限】AI呼び出し1回分の枠を確保し、今回の実行の呼び出し数に数える
+    Returns:
+        False: 本日（17:00 JSTまで）の枠がない（呼び出さない。以降の呼び出しも試さない）
+    """
+    global TOTAL_AI_CALLS_THIS_RUN, DAILY_QUOTA_EXHAUSTED
+    if DAILY_QUOTA_EXHAUSTED or not rate_limiter.acquire(label):
+        DAILY_QUOTA_EXHAUSTED = True
+        return False
+    TOTAL_AI_CALLS_THIS_RUN += 1
+    return True
 
 # 既存記事のタイトル（重複チェック用）
 EXISTING_TITLES: Set[str] = set()
 
-# 既存記事のURL（重複チェック用）
-EXISTING_URLS: Set[str] = set()
+# 既存記事のURL（重複チェック用・正規化したURLで照合）
+EXISTING_URLS = url_canon.UrlIndex()
 
-# 除外URL（ブラックリスト）
-EXCLUDED_URLS: Set[str] = set()
+# 除外URL（ブラックリスト・正規化したURLで照合）
+EXCLUDED_URLS = url_canon.UrlIndex()
 
 # 既存記事リスト（追記保存用）
 EXISTING_ARTICLES: list = []
 
+# 【AI除外キャッシュ】AIがSKIP判定した記事（data/ai-rejected.json）
+# 一度SKIPされた記事は再びキーワードフィルタを通過してもAIに送らない
+AI_REJECTED_FILE = "ai-rejected.json"
+AI_REJECTED_TTL_DAYS = 180  # 有効期限（None で無期限）
+AI_REJECTED: dict = {}  # {URL: {"title", "titleHash", "rejectedAt", "model", "expiresAt"}}
+AI_REJECTED_TITLES: Set[str] = set()  # タイトル指紋（表記ゆれ・URL違いの同一記事対策）
+AI_REJECTED_URLS = url_canon.UrlIndex()  # 正規化したURL（トラッキング用パラメータ違いの同一記事対策）
+
+# 【近似重複】同じ話題の別配信を検出する索引（data/near-duplicate-index.json）
+NEAR_DUP_INDEX: Optional[near_duplicate.NearDuplicateIndex] = None
+STORIES_BY_ID: dict = {}  # {記事ID: 記事・候補}（他ソースの配信を extraSources に追加するため）
+RUN_STORY_IDS: set = set()  # 今回の実行で索引に登録した候補（保存されなかったものは保存前に除く）
+
 # 最大保持記事数（2年分を想定）
 MAX_ARTICLES_RETENTION = 4000
 
@@ -303,50 +365,13 @@ ARTICLE_RETENTION_DAYS = 730
 # ========================================
 # 理念に基づくキーワードフィルタリング（厳格版）
 # ========================================
-
-# 【コア理念キーワード】これらのいずれかを含む記事のみを採用
-# インクルーシブ教育・特別支援教育・神経多様性に特化
-CORE_KEYWORDS = [
-    # インクルーシブ教育・特別支援教育
-    "インクルーシブ", "インクルーシブ教育", "特別支援", "特別支援教育",
-    "支援学級", "支援学校", "通級", "通級指導",
-    # 発達障害・神経多様性
-    "発達障害", "神経多様性", "ニューロダイバーシティ", "脳機能",
-    "学習障害", "LD", "ディスレクシア", "読み書き困難",
-    "ADHD", "注意欠如", "多動性",
-    "自閉症", "自閉スペクトラム", "ASD", "アスペルガー",
-    # ギフテッド・2e
-    "ギフテッド", "特異な才能", "2e", "二重の特別", "高IQ", "過度激動", "OE",
-    # 合理的配慮・支援
-    "合理的配慮", "個別支援", "個別の教育支援計画", "IEP",
-    "ユニバーサルデザイン", "UDL", "医療的ケア", "療育",
-    # 不登校・多様な学び
-    "不登校", "不登校支援", "フリースクール", "多様な学び", "オルタナティブ教育",
-    # 障害全般（教育文脈）
-    "障害児", "障がい児", "障害のある子", "障がいのある子",
-]
-
-# ========================================
-# 【理念スコアリング】記事の優先順位付け
-# ========================================
-
-# 高優先度キーワード（+20点）：サイトの核心テーマ
-HIGH_PRIORITY_KEYWORDS = [
-    "インクルーシブ", "インクルーシブ教育",
-    "特別支援", "特別支援教育",
-    "発達障害", "神経多様性", "ニューロダイバーシティ",
-    "ギフテッド", "2e", "特異な才能",
-    "不登校", "合理的配慮",
-]
-
-# 中優先度キーワード（+10点）：関連テーマ
-MEDIUM_PRIORITY_KEYWORDS = [
-    "支援学級", "支援学校", "通級",
-    "学習障害", "LD", "ディスレクシア",
-    "ADHD", "自閉症", "ASD",
-    "個別支援", "IEP", "療育",
-    "フリースクール", "多様な学び",
-]
+# キーワードリストと除外ルールは filter_rules.py に集約（収集・再フィルタ・浄化スクリプトで共通）
+# ソース固有の strict_keywords はエンジン作成時に登録する
+FILTER_ENGINE = FilterEngine(strict_keywords={
+    source['name']: source['strict_keywords']
+    for source in RSS_FEEDS + RESEARCH_INSTITUTIONS
+    if source.get('strict_keywords')
+})
 
 
 def calculate_relevance_score(title: str, summary: str) -> int:
@@ -356,25 +381,7 @@ def calculate_relevance_score(title: str, summary: str) -> int:
     - 中優先度キーワード: +10点
     - その他のCORE_KEYWORDS: +5点
     """
-    text = f"{title} {summary}".lower()
-    score = 0
-
-    # 高優先度キーワード
-    for kw in HIGH_PRIORITY_KEYWORDS:
-        if kw.lower() in text:
-            score += 20
-
-    # 中優先度キーワード（高優先度と重複しないもののみ）
-    for kw in MEDIUM_PRIORITY_KEYWORDS:
-        if kw.lower() in text and kw not in HIGH_PRIORITY_KEYWORDS:
-            score += 10
-
-    # その他のCORE_KEYWORDS
-    for kw in CORE_KEYWORDS:
-        if kw.lower() in text and kw not in HIGH_PRIORITY_KEYWORDS and kw not in MEDIUM_PRIORITY_KEYWORDS:
-            score += 5
-
-    return score
+    return FILTER_ENGINE.score(title, summary)
 
 
 def apply_category_diversity(articles: list, max_category_ratio: float = 0.5) -> list:
@@ -409,144 +416,6 @@ def apply_category_diversity(articles: list, max_category_ratio: float = 0.5) ->
     return result
 
 
-# 【強力な除外キーワード】これらを含む記事は即座に破棄（理念と無関係）
-STRONG_EXCLUDE_KEYWORDS = [
-    # 政治・情勢（サイト理念と無関係）
-    "首相", "大統領", "会談", "総選挙", "政党", "過半数", "解雇", "辞任",
-    "国会", "与党", "野党", "閣僚", "大臣", "衆議院", "参議院",
-    "ゼレンスキー", "トランプ", "バイデン", "習近平", "総理",
-    # 一般受験・倍率（競争教育）- 「入試」を単独で除外
-    "入試", "高校受験", "大学受験", "中学受験", "入試倍率", "出願状況",
-    "解答速報", "合格判定", "偏差値", "共通テスト", "センター試験",
-    "志願倍率", "確定志願", "志願状況", "募集人員", "志望校",
-    "推薦選抜", "一般選抜", "特色選抜", "公立高", "県立高", "都立高",
-    # 資格試験（教育ではなく資格取得）
-    "司法試験", "予備試験", "行政書士", "司法書士", "公認会計士",
-    "税理士試験", "弁理士試験", "社労士", "宅建", "資格試験",
-    # 塾・予備校（競争教育サービス）
-    "塾", "予備校", "進学塾", "学習塾",
-    # 一般医療・警報（教育・発達に直接関係ないもの）
-    "インフルエンザ", "警報発令", "警報再発令", "感染警報",
-    "コロナ", "ワクチン", "予防接種",
-    # 経済・株価ニュース（サイト理念と無関係）
-    "事業譲渡", "株価", "為替", "経済指標", "決算",
-    "NYダウ", "ダウ平均", "日経平均", "円相場", "ドル円", "値上がり", "値下がり",
-    "株式市場", "東証", "NASDAQ", "S&P", "日銀", "金融政策",
-    # 国際情勢・軍事（サイト理念と無関係）
-    "NATO", "ウクライナ", "ガザ", "パレスチナ", "停戦", "侵攻", "空爆",
-    "無人機", "輸出拠点", "ドローン攻撃", "ミサイル", "軍事",
-    "外務省", "外交", "領土", "紛争", "テロ", "軍",
-    # スポーツ・芸能
-    "甲子園", "高校野球", "プロ野球", "サッカー", "五輪", "オリンピック",
-    "芸能", "アイドル", "ドラマ", "映画", "俳優",
-    "ホワイトソックス", "移籍", "自主トレ", "野球", "MLB", "NPB",
-    # エンタメ・ゲーム・刺激重視コンテンツ（インクルーシブ教育の理念にそぐわない）
-    "Roblox", "ロブロックス", "ブレインロット", "Brain Rot", "brainrot",
-    "Fortnite", "フォートナイト", "Minecraft", "マインクラフト", "マイクラ",
-    "TikTok", "ティックトック", "YouTube", "ユーチューブ", "YouTuber",
-    "ゲーム実況", "eスポーツ", "バズる", "炎上", "インフルエンサー",
-]
-
-# 除外キーワード（広告・PR記事・商業記事をスキップ）
-EXCLUDE_KEYWORDS = [
-    "PR", "広告", "プレゼント", "キャンペーン", "セミナー申込",
-    "応募締切", "抽選で", "モニター募集", "スポンサー",
-    "[PR]", "【PR】", "【広告】", "[AD]",
-    # 商業・セール記事（教育と無関係）
-    "セール", "割引", "OFF", "％OFF", "%OFF", "クーポン", "お買い得",
-    "Kindle本", "タイトルセール", "ポイント還元"
-]
-
-# 有料記事URLパターン（AI判定前に弾く）
-PAID_URL_PATTERNS = [
-    "/paid/", "/member/", "/premium/", "/subscription/",
-    "/login", "?login", "/register", "/subscribe",
-    "membership", "shimbun.com", "nikkei.com/article",
-    "toyokeizai.net/articles/-/", "premium.toyokeizai"
-]
-
-# 除外ドメイン（ログイン制限等で閲覧不可）
-EXCLUDED_DOMAINS = [
-    "kyoiku.sho.jp",  # みんなの教育技術（ログイン必須）
-]
-
-# 【塾・予備校広告の事前除外キーワード】AI判定前に弾く（タイトル・要約）
-CRAM_SCHOOL_KEYWORDS = [
-    # 塾（単体キーワード）
-    "塾",
-    # 塾名・予備校名・塾関連サービス
-    "フリーステップ", "TOMAS", "トーマス", "サピックス", "SAPIX",
-    "早稲田アカデミー", "早稲アカ", "日能研", "四谷大塚", "栄光ゼミナール",
-    "河合塾", "駿台", "東進", "代ゼミ", "Z会", "進研ゼミ",
-    "明光義塾", "個別指導", "家庭教師", "スクールIE",
-    "塾探し", "塾選び", "塾比較", "塾ナビ", "学習塾", "進学塾", "予備校",
-    # 英才教育・競争系キーワード
-    "合格戦略", "合格実績", "偏差値アップ", "点数up", "点数UP",
-    "最難関", "難関突破", "志望校合格", "合格率", "合格者数",
-    "先取り学習", "飛び級", "英才教育",
-    # 講習・模試
-    "夏期講習", "冬期講習", "春期講習", "季節講習",
-    "模試申込", "模試のお知らせ", "テスト対策",
-    # 入試情報（一般）
-    "出願状況", "志願状況", "確定志願", "競争率", "実質倍率",
-    # 私立学校経営ニュース（インクルーシブ教育と無関係）
-    "事業譲渡", "学校法人", "校名変更", "統合", "合併", "経営",
-    "ヴィアトール", "洛星", "ノートルダム"
-]
-
-# 塾広告の例外キーワード（これらがあれば塾広告でも除外しない）
-CRAM_SCHOOL_EXCEPTION_KEYWORDS = [
-    "不登校", "特別支援", "発達障害", "学習障害", "ギフテッド",
-    "合理的配慮", "インクルーシブ", "通信制", "フリースクール"
-]
-
-# 細かすぎる実践情報の除外キーワード（教員向けテクニック）
-PRACTICE_EXCLUDE_KEYWORDS = [
-    "板書", "指導案", "学級開き", "学級づくり", "授業開き",
-    "ワークシート", "プリント", "時短学習", "京女式",
-    "〇年国語", "〇年算数", "小１国語", "小２国語", "小３国語",
-    "小４国語", "小５国語", "小６国語", "小1国語", "小2国語",
-    "小3国語", "小4国語", "小5国語", "小6国語",
-    "教員採用試験", "教採", "採用試験対策", "面接対策"
-]
-
-# マニアックな技術解説記事の除外キーワード
-TECH_EXCLUDE_KEYWORDS = [
-    "Scratch", "スクラッチ", "プログラミング解説", "共通テスト解説",
-    "共テ", "Vol.", "Vol.1", "Vol.2", "Vol.3", "Vol.4", "Vol.5",
-    "コーディング入門", "Python入門", "JavaScript入門"
-]
-
-# 【緩和済み】受験関連は機械的フィルタから除外し、AIによる文脈判断に委ねる
-# 明らかに理念と無関係なものだけを機械的に除外
-EXAM_EXCLUDE_KEYWORDS = [
-    "出願状況", "確定志願者", "志願状況", "募集人員",
-    "大学ランキング", "就職率ランキング", "人気ランキング",
-    "合格者数", "合格実績", "進学実績"
-]
-
-# 受験情報の例外キーワード（これらがあれば除外しない）- AI判定に移行のため縮小
-EXAM_EXCEPTION_KEYWORDS = [
-    "特別支援", "合理的配慮", "インクルーシブ", "不登校",
-    "障害", "障がい", "支援学校", "支援学級"
-]
-
-# 小規模イベント検出キーワード
-EVENT_KEYWORDS = [
-    "セミナー", "研修", "講座", "開催", "募集", "ワークショップ",
-    "オンライン講座", "参加者募集", "申込", "フォーラム"
-]
-
-# 公的機関キーワード（イベント記事の例外許可）
-PUBLIC_INSTITUTION_KEYWORDS = [
-    "文部科学省", "文科省", "OECD", "ユネスコ", "UNESCO",
-    "教育委員会", "内閣府", "厚生労働省", "総務省",
-    "国立", "都道府県", "市区町村", "自治体",
-    "東京大学", "京都大学", "大阪大学", "名古屋大学",
-    "東北大学", "九州大学", "北海道大学", "筑波大学",
-    "早稲田大学", "慶應義塾大学", "上智大学"
-]
-
 # 【新カテゴリー定義】AI判定用（8カテゴリー）
 CATEGORIES = {
     "支援・合理的配慮": "学校や現場での具体的な支援方法、個別の配慮事例、発達障害・学習障害への対応、ギフテッド・2eへの合理的配慮など",
@@ -566,7 +435,6 @@ FAILED_SUMMARIES = []  # AI要約に失敗した記事をトラッキング
 # 【ステータス追跡】API使用状況
 API_CALL_COUNT = 0  # 今回の実行でのAPI呼び出し回数
 API_ERRORS = []  # エラー情報
-DAILY_API_LIMIT = 20  # 1日あたりのAPI上限（Gemini無料枠: モデルあたり20リクエスト/日）
 
 def is_ai_generated_summary(summary: str) -> bool:
     """要約がAI生成かどうかを判定（です・ます調で終わっているか）"""
@@ -589,18 +457,19 @@ def is_ai_generated_summary(summary: str) -> bool:
     return False
 
 def load_summary_cache():
-    """既存のarticles.jsonからAI要約済みの要約をキャッシュに読み込む"""
+    """既存記事（load_existing_articles で読み込み済み）からAI要約済みの要約をキャッシュに読み込む"""
     global SUMMARY_CACHE
     try:
-        if os.path.exists(OUTPUT_FILE):
-            with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for article in data.get('articles', []):
-                    url = article.get('url', '')
-                    summary = article.get('summary', '')
-                    # 有効なAI要約（80文字以上かつAI生成の特徴を持つ）のみキャッシュ
-                    if url and summary and len(summary) > 60 and is_ai_generated_summary(summary):
-                        SUMMARY_CACHE[url] = summary
+        if EXISTING_ARTICLES:
+            for article in EXISTING_ARTICLES:
+                url = article.get('url', '')
+                summary = article.get('summary', '')
+                # 有効なAI要約（80文字以上かつAI生成の特徴を持つ）のみキャッシュ
+                # 【ローカル要約】です・ます調でもAI要約ではないため除外（AI作業キューで置き換える）
+                if article.get('summarySource') == local_summarizer.SUMMARY_SOURCE:
+                    continue
+                if url and summary and len(summary) > 60 and is_ai_generated_summary(summary):
+                    SUMMARY_CACHE[url] = summary
             print(f"✓ キャッシュ読み込み: {len(SUMMARY_CACHE)}件の既存AI要約を再利用可能")
     except Exception as e:
         print(f"警告: キャッシュ読み込みエラー - {e}")
@@ -617,12 +486,12 @@ def load_excluded_urls():
         if os.path.exists(excluded_file):
             with open(excluded_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                EXCLUDED_URLS = set(data.get('excludedUrls', []))
+                EXCLUDED_URLS = url_canon.UrlIndex(data.get('excludedUrls', []))
             if EXCLUDED_URLS:
                 print(f"✓ ブラックリスト読み込み: {len(EXCLUDED_URLS)}件")
     except Exception as e:
         print(f"警告: ブラックリスト読み込みエラー - {e}")
-        EXCLUDED_URLS = set()
+        EXCLUDED_URLS = url_canon.UrlIndex()
 
 
 def load_existing_articles():
@@ -633,17 +502,16 @@ def load_existing_articles():
     """
     global EXISTING_TITLES, EXISTING_URLS, EXISTING_ARTICLES
     try:
-        if os.path.exists(OUTPUT_FILE):
-            with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                EXISTING_ARTICLES = data.get('articles', [])
-                for article in EXISTING_ARTICLES:
-                    title = article.get('title', '').strip()
-                    url = article.get('url', '').strip()
-                    if title:
-                        EXISTING_TITLES.add(title)
-                    if url:
-                        EXISTING_URLS.add(url)
+        # 【記事ストア】articles.json の解析は記事ストア側で必要な時だけ行う
+        EXISTING_ARTICLES = article_store.get_articles()
+        if EXISTING_ARTICLES:
+            for article in EXISTING_ARTICLES:
+                title = article.get('title', '').strip()
+                url = article.get('url', '').strip()
+                if title:
+                    EXISTING_TITLES.add(title)
+                if url:
+                    EXISTING_URLS.add(url)
             print(f"✓ 既存記事読み込み: {len(EXISTING_ARTICLES)}件")
             print(f"  - タイトル: {len(EXISTING_TITLES)}件")
             print(f"  - URL: {len(EXISTING_URLS)}件")
@@ -652,15 +520,69 @@ def load_existing_articles():
         EXISTING_ARTICLES = []
 
 
+def get_title_fingerprint(title: str) -> str:
+    """
+    タイトルの指紋（全角半角・大文字小文字・空白・記号の違いを無視）
+    配信元がURLを変えて再配信した同じ記事も同一とみなすため
+    """
+    normalized = unicodedata.normalize('NFKC', title).lower()
+    normalized = re.sub(r'[\s\W_]+', '', normalized)
+    return hashlib.md5(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def load_ai_rejected():
+    """【AI除外キャッシュ】AIがSKIP判定した記事を読み込む（期限切れは破棄）"""
+    global AI_REJECTED, AI_REJECTED_TITLES, AI_REJECTED_URLS
+    entries = load_state(AI_REJECTED_FILE, {}) or {}
+    now = datetime.now().isoformat()
+    AI_REJECTED = {
+        url: entry for url, entry in entries.items()
+        if not entry.get('expiresAt') or entry['expiresAt'] > now
+    }
+    AI_REJECTED_TITLES = {entry['titleHash'] for entry in AI_REJECTED.values() if entry.get('titleHash')}
+    AI_REJECTED_URLS = url_canon.UrlIndex(AI_REJECTED)
+    if AI_REJECTED:
+        expired = len(entries) - len(AI_REJECTED)
+        print(f"✓ AI除外キャッシュ読み込み: {len(AI_REJECTED)}件" + (f"（期限切れ{expired}件を破棄）" if expired else ""))
+
+
+def save_ai_rejected():
+    """【AI除外キャッシュ】保存"""
+    save_state(AI_REJECTED_FILE, AI_REJECTED)
+
+
+def record_ai_rejection(title: str, url: str) -> None:
+    """【AI除外キャッシュ】AIがSKIP判定した記事を記録"""
+    now = datetime.now()
+    title_hash = get_title_fingerprint(title)
+    AI_REJECTED[url.strip()] = {
+        "title": title.strip(),
+        "titleHash": title_hash,
+        "rejectedAt": now.isoformat(),
+        "model": GEMINI_MODEL,
+        "expiresAt": (now + timedelta(days=AI_REJECTED_TTL_DAYS)).isoformat() if AI_REJECTED_TTL_DAYS else None,
+    }
+    AI_REJECTED_TITLES.add(title_hash)
+    AI_REJECTED_URLS.add(url)
+
+
+def is_ai_rejected(title: str, url: str) -> bool:
+    """【AI除外キャッシュ】過去にAIがSKIP判定した記事か（URLまたはタイトル指紋で照合）"""
+    if url in AI_REJECTED_URLS:
+        return True
+    return bool(AI_REJECTED_TITLES) and get_title_fingerprint(title) in AI_REJECTED_TITLES
+
+
 def is_excluded_url(url: str) -> bool:
-    """URLがブラックリストに含まれているかチェック"""
-    return url.strip() in EXCLUDED_URLS
+    """URLがブラックリストに含まれているかチェック（正規化したURLで照合）"""
+    return url in EXCLUDED_URLS
 
 
 def is_duplicate_article(title: str, url: str) -> bool:
     """
     【重複チェック】タイトルまたはURLが既存記事と重複しているか、
-    またはブラックリストに含まれているかチェック
+    ブラックリストに含まれているか、過去にAIがSKIP判定したかをチェック
+    URLは正規化して照合（トラッキング用パラメータ・http/https・www.・AMP版の違いは同じ記事）
     該当する場合、AI要約を含む全処理をスキップ
     """
     title_clean = title.strip()
@@ -668,7 +590,69 @@ def is_duplicate_article(title: str, url: str) -> bool:
     # ブラックリストチェックも追加
     if url_clean in EXCLUDED_URLS:
         return True
-    return title_clean in EXISTING_TITLES or url_clean in EXISTING_URLS
+    if title_clean in EXISTING_TITLES or url_clean in EXISTING_URLS:
+        return True
+    # 【AI除外キャッシュ】SKIP済みの記事はページ取得・AI呼び出しの前に弾く
+    return is_ai_rejected(title_clean, url_clean)
+
+
+def load_near_duplicate_index() -> None:
+    """【近似重複】索引を読み込み、索引にない既存記事を追加（既存記事はタイトルのみで登録）"""
+    global NEAR_DUP_INDEX
+    NEAR_DUP_INDEX = near_duplicate.NearDuplicateIndex.load()
+    added = 0
+    for article in EXISTING_ARTICLES:
+        STORIES_BY_ID[article['id']] = article
+        if article['id'] not in NEAR_DUP_INDEX:
+            NEAR_DUP_INDEX.add(article['id'], article.get('title', ''), "", article.get('url', ''), article.get('source', ''))
+            added += 1
+    print(f"✓ 近似重複の索引読み込み: {len(NEAR_DUP_INDEX)}件" + (f"（既存記事{added}件を追加）" if added else ""))
+
+
+def find_same_story(title: str, description: str, url: str, source: str) -> bool:
+    """
+    【近似重複】同じ話題の記事が既にあるか（ページ取得・AI判定の前に照合）
+    別ソースの配信であれば既存の記事の extraSources に追加する
+    """
+    if NEAR_DUP_INDEX is None:
+        return False
+    # 既存記事はタイトルのみで登録しているため、タイトルだけでも照合する
+    # 同じソースの記事は索引側で厳しい閾値（SAME_SOURCE_THRESHOLD）を適用済み
+    match = NEAR_DUP_INDEX.find(title, description, source) or (description and NEAR_DUP_INDEX.find(title, "", source))
+    if not match:
+        return False
+    story_id, score = match
+    story = STORIES_BY_ID.get(story_id)
+    if (story or NEAR_DUP_INDEX.entries[story_id]).get('source') != source:
+        # 記事として残っていない話題（保存期間切れで削除済みなど）では、別ソースの配信を落とさない
+        if story is None:
+            return False
+        extra_sources = story.setdefault('extraSources', [])
+        if all(extra['url'] != url for extra in extra_sources):
+            extra_sources.append({"source": source, "url": url})
+            print(f"    [同じ話題] {title[:40]}... → {story.get('title', '')[:30]}...（類似度{score:.2f}）")
+    return True
+
+
+def register_story(candidate: dict) -> None:
+    """
+    【近似重複】新しい候補を索引に登録（同じ実行の後のソースとも照合できるように）
+    記事として保存されなかった候補は keep_saved_stories() で保存前に除く
+    """
+    STORIES_BY_ID[candidate['id']] = candidate
+    if NEAR_DUP_INDEX is not None and candidate['id'] not in NEAR_DUP_INDEX:
+        NEAR_DUP_INDEX.add(candidate['id'], candidate['title'], candidate.get('originalSummary', ''), candidate['url'], candidate['source'])
+        RUN_STORY_IDS.add(candidate['id'])
+
+
+def keep_saved_stories(articles: list) -> None:
+    """【近似重複】今回登録した候補のうち、記事にならなかったもの（SKIP・持ち越し・上限超過）を索引から除く"""
+    saved_ids = {article['id'] for article in articles}
+    unsaved = RUN_STORY_IDS - saved_ids
+    for candidate_id in unsaved:
+        NEAR_DUP_INDEX.remove(candidate_id)
+    if unsaved:
+        print(f"  近似重複の索引: 保存されなかった候補{len(unsaved)}件を除外")
 
 
 def is_duplicate_title(title: str) -> bool:
@@ -722,6 +706,22 @@ def cleanup_old_articles(articles: list) -> list:
     return retained
 
 
+# 【差分再フィルタ】理念ルールのハッシュと、そのルールで通過済みの記事ID
+REFILTER_STATE_FILE = "refilter-state.json"
+REFILTER_STATE: dict = {}  # {"rulesetHash", "checkedIds": set}
+
+
+def save_refilter_state(articles: list) -> None:
+    """【差分再フィルタ】判定済みの記事IDを保存（保存した記事に含まれるものだけ残す）"""
+    if not REFILTER_STATE:
+        return
+    saved_ids = {article.get('id') for article in articles}
+    save_state(REFILTER_STATE_FILE, {
+        "rulesetHash": REFILTER_STATE["rulesetHash"],
+        "checkedIds": sorted(REFILTER_STATE["checkedIds"] & saved_ids),
+    })
+
+
 def refilter_existing_articles(articles: list) -> list:
     """
     既存記事に対してSTRONG_EXCLUDE_KEYWORDSとCORE_KEYWORDSで再フィルタリング
@@ -730,6 +730,9 @@ def refilter_existing_articles(articles: list) -> list:
     - 強力除外キーワードを含む記事は削除
     - ただし、コア理念キーワードを同時に含む場合は例外的に採用（理念優先ルール）
     - コア理念キーワードを含まない記事も削除（信頼ソース以外）
+    - 現在のルールのハッシュと通過した記事IDを data/refilter-state.json に記録し、次回以降は判定を省略
+      （記事には書き込まない。ルール変更で全記事の内容が変わり、記事別ファイル・差分フィードが
+       すべて「変更」扱いになるのを避けるため）
 
     Returns:
         フィルタリング後の記事リスト
@@ -741,49 +744,41 @@ def refilter_existing_articles(articles: list) -> list:
     # 全ソースにCORE_KEYWORDSチェックを適用する厳格化を実施
     # TRUSTED_EDUCATION_SOURCES = ["リセマム", "EdTechZine", "こどもとIT"]
 
-    retained = []
+    # 【差分再フィルタ】現在と同じルールで通過済みの記事は判定済み
+    # キーワード・ルールを変更した直後の1回だけ全件を判定し直す
+    global REFILTER_STATE
+    current_hash = FILTER_ENGINE.ruleset_hash(RULESET_BASIC)
+    state = load_state(REFILTER_STATE_FILE, {}) or {}
+    checked_ids = set(state.get('checkedIds', [])) if state.get('rulesetHash') == current_hash else set()
+    pending = [article for article in articles if article.get('id') not in checked_ids]
+    REFILTER_STATE = {"rulesetHash": current_hash, "checkedIds": checked_ids}
+    if not pending:
+        print(f"  → ルール変更なし（{current_hash}）: 再フィルタ不要")
+        return articles
+    print(f"  → 判定対象: {len(pending)}件 / {len(articles)}件（ルール: {current_hash}）")
+
     removed_strong = 0
     removed_no_core = 0
+    removed_ids = set()
 
-    for article in articles:
-        title = article.get('title', '')
-        summary = article.get('summary', '')
-        source = article.get('source', '')
-        is_manual = article.get('isManual', False)
-        text = f"{title} {summary}"
+    # 【ルールエンジン】収集時と同じ理念ルール（強力除外→探究学習→コア理念）でまとめて判定
+    # 手動投稿記事は常に保持（削除しない）
+    verdicts = FILTER_ENGINE.evaluate_batch(pending, RULESET_BASIC)
 
-        # 手動投稿記事は常に保持（削除しない）
-        if is_manual:
-            retained.append(article)
+    for article, verdict in zip(pending, verdicts):
+        if verdict.accepted:
+            checked_ids.add(article.get('id'))
             continue
 
-        # コア理念キーワードを含むかチェック
-        has_core_keyword = any(kw in text for kw in CORE_KEYWORDS)
-
-        # 1. 強力除外キーワードチェック（理念優先ルール適用）
-        has_strong_exclude = any(kw in text for kw in STRONG_EXCLUDE_KEYWORDS)
-        if has_strong_exclude and not has_core_keyword:
-            # 除外キーワードあり かつ 理念キーワードなし → 除外
-            removed_strong += 1
-            print(f"    [再フィルタ除外] 理念外: {title[:40]}...")
-            continue
-
-        # 1.5. 探究学習フィルタ（支援キーワードなしの場合のみ除外）
-        # 「探究学習」単独の記事はインクルーシブ教育と無関係なことが多い
-        has_tankyu = "探究学習" in text or "探究型学習" in text or "探究活動" in text
-        if has_tankyu and not has_core_keyword:
-            removed_strong += 1
-            print(f"    [再フィルタ除外] 探究学習（理念なし）: {title[:40]}...")
-            continue
-
-        # 2. コア理念キーワードチェック（全ソース共通）
-        # 【厳格化】信頼ソースも理念キーワードを必須とする
-        if not has_core_keyword:
+        removed_ids.add(id(article))
+        title = article.get('title', '')
+        print(f"    [再フィルタ除外] {verdict.label}: {title[:40]}...")
+        if verdict.rule == "core":
             removed_no_core += 1
-            print(f"    [再フィルタ除外] コア理念不足: {title[:40]}...")
-            continue
+        else:
+            removed_strong += 1
 
-        retained.append(article)
+    retained = [article for article in articles if id(article) not in removed_ids]
 
     total_removed = removed_strong + removed_no_core
     if total_removed > 0:
@@ -877,7 +872,7 @@ def retry_incomplete_summaries():
     - 最大 MAX_SUMMARY_RETRY 件まで
     - API制限を考慮して制限付きで実行
     """
-    global EXISTING_ARTICLES, TOTAL_AI_CALLS_THIS_RUN
+    global EXISTING_ARTICLES
 
     if IS_DEV_MODE:
         print("  [開発モード] 要約リトライをスキップ")
@@ -915,7 +910,7 @@ def retry_incomplete_summaries():
     edtech_updated = []  # EdTechZine更新記録
     for idx, article in retry_targets:
         # グローバルAI呼び出し上限チェック
-        if TOTAL_AI_CALLS_THIS_RUN >= MAX_AI_CALLS_PER_RUN:
+        if TOTAL_AI_CALLS_THIS_RUN >= MAX_AI_CALLS_PER_RUN or DAILY_QUOTA_EXHAUSTED:
             print(f"    [省エネ] AI呼び出し上限({MAX_AI_CALLS_PER_RUN}件)に達したため終了")
             break
 
@@ -926,7 +921,6 @@ def retry_incomplete_summaries():
         is_edtech = source == 'EdTechZine'
 
         print(f"    リトライ中: {title[:40]}...")
-        TOTAL_AI_CALLS_THIS_RUN += 1
 
         try:
             # AI要約を再実行
@@ -949,6 +943,7 @@ def retry_incomplete_summaries():
                 EXISTING_ARTICLES[idx]['summary'] = new_summary
                 if new_category:
                     EXISTING_ARTICLES[idx]['category'] = normalize_category(new_category)
+                    EXISTING_ARTICLES[idx]['categorySource'] = result.get('categorySource', "ai")
                 retry_success += 1
                 print(f"      → 成功: {new_summary[:30]}...")
 
@@ -979,6 +974,114 @@ def retry_incomplete_summaries():
             print(f"    ✓ EdTechZineの要約を更新しました: {title[:50]}")
 
 
+def enqueue_existing_ai_work() -> None:
+    """
+    【AI作業キュー】保存済み記事のうち、AIの作業が残っている記事を登録
+    - 【要約準備中】・ローカル要約のまま保存された記事 → retry
+    - 現在のカテゴリー定義にない記事 → recategorize
+    再挑戦の上限・有効期限に達した記事は ai_queue.push が登録しない（打ち切りの記録を優先）
+    """
+    for article in EXISTING_ARTICLES:
+        url = article.get('url', '')
+        if not url:
+            continue
+        if "【要約準備中】" in article.get('summary', '') or article.get('summarySource') == local_summarizer.SUMMARY_SOURCE:
+            kind = "retry"
+        elif article.get('category') not in CATEGORIES:
+            kind = "recategorize"
+        else:
+            continue
+        score = calculate_relevance_score(article.get('title', ''), "")
+        ai_queue.push(kind, url, score, {"title": article.get('title', ''), "source": article.get('source', '')})
+
+
+def process_ai_queue() -> None:
+    """
+    【AI作業キュー】残りのAI枠で、保存済み記事の作業（要約リトライ・カテゴリー再判定）を優先度順に処理
+    朝刊・夕刊では新規記事の後、要約専用モードでは新規記事より先に実行する
+    """
+    if IS_DEV_MODE or not gemini_client:
+        print("  [開発モード] AI作業キューの処理をスキップ")
+        return
+
+    enqueue_existing_ai_work()
+
+    slots = max(0, MAX_AI_CALLS_PER_RUN - TOTAL_AI_CALLS_THIS_RUN) * AI_BATCH_SIZE
+    if slots <= 0:
+        print("  [省エネ] AI呼び出し上限に達しているため次回に持ち越し")
+        return
+
+    articles_by_url = url_canon.UrlIndex()
+    for article in EXISTING_ARTICLES:
+        articles_by_url.add(article.get('url'), article)
+    targets = []  # [(作業, 記事)]
+    local_count = 0
+    for item in ai_queue.pop_best(slots, kinds={"retry", "recategorize"}):
+        article = articles_by_url.get(item['key'])
+        if article is None:  # 削除済みの記事の作業は破棄
+            continue
+        if item['kind'] == "recategorize":
+            # 【ローカル分類器】確信度が高ければAPIを使わずに再判定
+            category, _ = category_classifier.classify(article.get('title', ''), article.get('summary', ''))
+            if category:
+                article['category'], article['categorySource'] = resolve_category(
+                    article.get('title', ''), article.get('summary', ''), category, "local")
+                local_count += 1
+                continue
+        targets.append((item, article))
+
+    if local_count:
+        print(f"  → ローカル分類器でカテゴリー再判定: {local_count}件")
+    if not targets:
+        print("  → 処理待ちの作業: 0件")
+        return
+
+    print(f"  → 処理対象: {len(targets)}件（残りAI枠 {slots}件分）")
+    candidates = []
+    for item, article in targets:
+        summary = article.get('summary', '')
+        candidates.append({
+            "title": article.get('title', ''),
+            # リトライは取得時のページ要約を使う（【要約準備中】はAIに送らない）
+            "originalSummary": item['payload'].get('originalSummary', '') if item['kind'] == "retry" else summary,
+            "url": article['url'],
+            "source": article.get('source', ''),
+        })
+
+    success = 0
+    for (item, article), result in zip(targets, generate_ai_summaries_batch(candidates)):
+        if result.get('skip'):
+            # 次回以降は再登録しない（同じ記事で毎回AI枠を使わないように）
+            ai_queue.give_up(item)
+            print(f"    → SKIP判定（そのまま維持）: {article.get('title', '')[:30]}...")
+            continue
+
+        new_summary = result.get('summary', '')
+        new_category = result.get('category', '')
+        if result.get('needs_retry') or (item['kind'] == "retry" and not is_valid_summary(new_summary)):
+            # 【ローカル要約】プレースホルダーのままなら取得時の要約から暫定の要約を作成
+            if "【要約準備中】" in article.get('summary', ''):
+                local_summary = local_summarizer.summarize(article.get('title', ''), item['payload'].get('originalSummary', ''))
+                if local_summary:
+                    article['summary'] = local_summary
+                    article['summarySource'] = local_summarizer.SUMMARY_SOURCE
+            if not ai_queue.requeue(item):
+                print(f"    → {ai_queue.MAX_ATTEMPTS}回失敗のため破棄: {article.get('title', '')[:30]}...")
+            continue
+
+        if item['kind'] == "retry":
+            article['summary'] = truncate_text(new_summary)
+            article['summarySource'] = "ai"
+        if new_category:
+            article['category'], article['categorySource'] = resolve_category(
+                article.get('title', ''), article.get('summary', ''), normalize_category(new_category),
+                result.get('categorySource', "ai"))
+        success += 1
+        print(f"    ✓ {item['kind']}: {article.get('title', '')[:30]}... → {article.get('category')}")
+
+    print(f"  → 完了: {success}/{len(targets)}件")
+
+
 # ========================================
 # フォールバック画像（Unsplash - 教育関連）
 # 【鉄壁ルール】画像が取得できない場合は必ずこれを使用
@@ -1128,38 +1231,15 @@ def fetch_page_metadata(url: str, timeout: int = 15) -> dict:
     記事ページからOGP画像と要約を取得
     【鉄壁ルール】相対パスは絶対URLに変換
     【朝日新聞対策】特殊なヘッダー設定で確実に取得
+    本文（text）はローカル要約用（AIには送らない）
     """
-    result = {'image': None, 'description': None}
+    result = {'image': None, 'description': None, 'text': ''}
     base_url = get_base_url(url)
     domain = get_domain(url)
 
     try:
-        # 【朝日新聞対策】より本格的なブラウザを模倣
-        if 'asahi.com' in domain:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                'Accept-Language': 'ja-JP,ja;q=0.9,en-US;q=0.8,en;q=0.7',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache',
-                'Sec-Ch-Ua': '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
-                'Sec-Ch-Ua-Mobile': '?0',
-                'Sec-Ch-Ua-Platform': '"Windows"',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1',
-                'Upgrade-Insecure-Requests': '1',
-            }
-        else:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'ja,en-US;q=0.7,en;q=0.3',
-            }
-
-        response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+        # 【朝日新聞対策】asahi.com はブラウザ模倣ヘッダー（http_client.DOMAIN_PROFILES）で取得
+        response = http_client.get(url, timeout=timeout, profile="page")
         response.raise_for_status()
 
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -1247,6 +1327,11 @@ def fetch_page_metadata(url: str, timeout: int = 15) -> dict:
                 if len(desc) > 10:
                     result['description'] = desc
 
+        # 本文の段落（【ローカル要約】AIが使えないときの暫定要約用）
+        body_area = soup.find('article') or soup.find('main') or soup
+        paragraphs = [p.get_text(strip=True) for p in body_area.find_all('p')]
+        result['text'] = ' '.join(p for p in paragraphs if len(p) >= 20)[:3000]
+
     except Exception as e:
         print(f"        [メタデータ取得エラー] {e}")
 
@@ -1319,6 +1404,137 @@ def normalize_category(category: str) -> str:
     return "支援・合理的配慮"
 
 
+def extract_json_text(ai_response: str, opener: str = "{", closer: str = "}") -> str:
+    """AIの応答からJSON部分を取り出す（コードブロック・前後の説明文に対応）"""
+    if "```json" in ai_response:
+        return ai_response.split("```json")[1].split("```")[0].strip()
+    if "```" in ai_response:
+        return ai_response.split("```")[1].split("```")[0].strip()
+    if opener in ai_response and closer in ai_response:
+        # JSON部分を抽出
+        start = ai_response.index(opener)
+        end = ai_response.rindex(closer) + 1
+        return ai_response[start:end]
+    return ai_response
+
+
+def is_valid_summary(s: str) -> bool:
+    """【品質チェック】不完全な要約を拒否（著作権リスク回避）"""
+    if not s or len(s) < 20:
+        return False
+    # 不完全な文末パターンを拒否
+    invalid_endings = ['...', '・・・', '…', '──', '－－', '、', 'の']
+    for ending in invalid_endings:
+        if s.rstrip().endswith(ending):
+            return False
+    # 150文字超過を拒否
+    if len(s) > 150:
+        return False
+    return True
+
+
+def override_category_by_keywords(title: str, summary: str, category: str, verbose: bool = True) -> str:
+    """
+    【キーワードベースのカテゴリ上書き】AIの判定を補完
+    verbose=False はAI判定前のカテゴリ推定用（ログを出さない）
+    """
+    text_for_category = f"{title} {summary}".lower()
+    research_keywords = ['脳機能', '脳科学', '神経科学', '認知科学', '理化学研究所', 'riken', '研究成果', '論文', '脳神経']
+    diverse_learning_keywords = [
+        '不登校', 'フリースクール', 'オルタナティブ', 'オルティナブル',
+        '通信制高校', 'ホームスクール', 'ホームエデュケーション',
+        '多様な学び', '学校外', 'サポート校', 'nijin', 'ニジン'
+    ]
+    ict_keywords = ['ict', 'edtech', 'タブレット', 'デジタル教科書', 'アプリ', 'ai活用', '生成ai']
+    policy_keywords = ['文部科学省', '文科省', '法改正', '通知', 'ガイドライン', '実証事業']
+
+    # 研究カテゴリを最優先でチェック
+    for kw in research_keywords:
+        if kw in text_for_category:
+            if verbose:
+                print(f"        → カテゴリ上書き: 研究（キーワード: {kw}）")
+            return "研究"
+    for kw in diverse_learning_keywords:
+        if kw in text_for_category:
+            if verbose:
+                print(f"        → カテゴリ上書き: 多様な学び（キーワード: {kw}）")
+            return "多様な学び"
+    for kw in ict_keywords:
+        if kw in text_for_category:
+            return "ICT・教材"
+    for kw in policy_keywords:
+        if kw in text_for_category:
+            return "制度・行政"
+    return category
+
+
+def resolve_category(title: str, summary: str, category: str, category_source: str) -> tuple:
+    """
+    キーワードによる上書きを適用し、カテゴリーとその判定元（categorySource）を返す
+    - ai: Geminiの判定 / local: ローカル分類器の判定 / keyword: キーワードによる推定・上書き
+    ローカル分類器の教師データは ai のみ（自分の判定を学習し直さないように）
+    """
+    overridden = override_category_by_keywords(title, summary, category)
+    return overridden, (category_source if overridden == category else "keyword")
+
+
+def classify_cached_summary(title: str, url: str):
+    """
+    【ローカル分類器】既存の要約がある記事のカテゴリーをGeminiを使わずに判定
+    Returns:
+        generate_ai_summary_and_category と同じ形式の結果。確信度が低ければ None（Geminiで判定）
+    """
+    cached_summary = SUMMARY_CACHE.get(url) if url else None
+    if not cached_summary:
+        return None
+    category, confidence = category_classifier.classify(title, cached_summary)
+    if not category:
+        return None
+    print(f"        → ローカル分類器でカテゴリー判定: {category}（確信度 {confidence:.0%}、API呼び出しなし）")
+    return {"summary": cached_summary, "category": category, "mainKeyword": "", "skip": False, "categorySource": "local"}
+
+
+def backfill_category_sources(articles: list) -> int:
+    """
+    【移行】summarySource・categorySource の記録前の記事に判定元を補う（記録した記事は次回から対象外）
+    AI要約の記事で、カテゴリーがキーワードによる上書きでも変わらないものは Gemini の判定とみなす
+    Returns:
+        補った記事数
+    """
+    backfilled = 0
+    for article in articles:
+        if 'categorySource' in article or article.get('summarySource') not in (None, "ai"):
+            continue
+        title = article.get('title', '')
+        summary = article.get('summary', '')
+        category = normalize_category(article.get('category', ''))
+        if (category in CATEGORIES and is_ai_generated_summary(summary)
+                and override_category_by_keywords(title, summary, category, verbose=False) == category):
+            article['summarySource'] = "ai"
+            article['categorySource'] = "ai"
+            backfilled += 1
+    if backfilled:
+        print(f"  → カテゴリーの判定元を補完: {backfilled}件（既存のAI要約・Geminiの判定）")
+    return backfilled
+
+
+def load_category_classifier() -> None:
+    """
+    【ローカル分類器】AI要約・Geminiのカテゴリー判定の既存記事を教師データにして準備
+    ローカル要約・ローカル分類器・キーワードで決めたカテゴリーは使わない（判定の誤りを学習し直さないように）
+    """
+    backfill_category_sources(EXISTING_ARTICLES)
+    samples = []
+    for article in EXISTING_ARTICLES:
+        if article.get('summarySource') != "ai" or article.get('categorySource') != "ai":
+            continue
+        summary = article.get('summary', '')
+        category = normalize_category(article.get('category', ''))
+        if category in CATEGORIES and is_ai_generated_summary(summary):
+            samples.append((article.get('title', ''), summary, category))
+    category_classifier.prepare(samples)
+
+
 def generate_ai_summary_and_category(title: str, original_summary: str, source: str, url: str = "", retry_count: int = 0) -> dict:
     """
     【AI要約 + カテゴリー判定】Gemini APIを使用
@@ -1346,7 +1562,7 @@ def generate_ai_summary_and_category(title: str, original_summary: str, source:
             category = "ICT・教材"
         elif any(kw in text for kw in ['文部科学省', '文科省', '法改正', '通知']):
             category = "制度・行政"
-        return {"summary": original_summary[:150], "category": category, "mainKeyword": "", "skip": False}
+        return {"summary": original_summary[:150], "category": category, "mainKeyword": "", "skip": False, "categorySource": "keyword"}
 
     # 【軽量化】入力テキストを100文字に制限
     short_summary = original_summary[:100] if original_summary else ""
@@ -1360,10 +1576,40 @@ def generate_ai_summary_and_category(title: str, original_summary: str, source:
         cached_summary = SUMMARY_CACHE[url]
         print(f"        → キャッシュから要約を再利用（カテゴリーは再判定）")
 
+        # 【ローカル分類器】確信度が高ければカテゴリーのみの判定にAPIを使わない
+        local_result = classify_cached_summary(title, url)
+        if local_result:
+            return local_result
+
+    # 【AI応答キャッシュ】同じ入力への過去の応答があればAPIを使わない（浄化・再判定後の再処理も0回）
+    if cached_summary:
+        template_version = PROMPT_VERSION_CATEGORY
+        cache_key = ai_cache.make_key(GEMINI_MODEL, template_version, title)
+    else:
+        template_version = PROMPT_VERSION_SUMMARY
+        cache_key = ai_cache.make_key(GEMINI_MODEL, template_version, title, short_summary)
+    cached_response = ai_cache.get(cache_key)
+    if cached_response and cached_response.get("result"):
+        print(f"        → AI応答キャッシュを再利用（API呼び出しなし）")
+        result = dict(cached_response["result"])
+        if cached_summary and not result.get("skip"):
+            result["summary"] = cached_summary
+        return result
+
+    def remember(result: dict) -> dict:
+        """確定した結果を応答キャッシュに保存（リトライが必要な結果は保存しない）"""
+        ai_cache.put(cache_key, ai_response, result, GEMINI_MODEL, template_version)
+        return result
+
     if not gemini_client:
         # 【著作権保護】原文は使わない。要約準備中として後でリトライ
         return {"summary": "", "category": "支援・合理的配慮", "mainKeyword": "", "skip": False, "needs_retry": True}
 
+    # 【レート制限】RPMの枠が空くまで待つ。本日の枠がなければ後でリトライ
+    if not acquire_ai_call(title[:20]):
+        API_ERRORS.append({"type": "quota_exceeded", "message": "daily rate limit reached", "timestamp": datetime.now().isoformat()})
+        return {"summary": "", "category": "支援・合理的配慮", "mainKeyword": "", "skip": False, "needs_retry": True}
+
     try:
         if cached_summary:
             # キャッシュがある場合はカテゴリー判定のみ（短縮プロンプト）
@@ -1397,7 +1643,7 @@ JSON形式で回答: {{"summary":"解説文（150字以内、文末は。）","c
 または SKIP"""
 
         response = gemini_client.models.generate_content(
-            model="gemini-2.5-flash",
+            model=GEMINI_MODEL,
             contents=prompt
         )
 
@@ -1406,37 +1652,22 @@ JSON形式で回答: {{"summary":"解説文（150字以内、文末は。）","c
 
         ai_response = response.text.strip()
 
-        # 【RPM制限回避】15秒待機で4回/分に抑制（15RPM制限を確実回避）
-        time.sleep(AI_CALL_SLEEP_SECONDS)
-
         # SKIPの場合
         if ai_response.upper() == 'SKIP' or 'SKIP' in ai_response.upper()[:10]:
             print(f"        → AI判定: 理念に合致しないためSKIP")
-            return {"skip": True}
+            return remember({"skip": True})
 
         # キャッシュがある場合（カテゴリーのみ返ってくる）
         if cached_summary:
             # カテゴリー名を抽出
             category = ai_response.strip().replace('「', '').replace('」', '')
             if category in CATEGORIES:
-                return {"summary": cached_summary, "category": category, "mainKeyword": "", "skip": False}
+                return remember({"summary": cached_summary, "category": category, "mainKeyword": "", "skip": False})
             else:
-                return {"summary": cached_summary, "category": "支援・合理的配慮", "mainKeyword": "", "skip": False}
+                return remember({"summary": cached_summary, "category": "支援・合理的配慮", "mainKeyword": "", "skip": False})
 
         # JSONを抽出してパース
-        if "```json" in ai_response:
-            json_str = ai_response.split("```json")[1].split("```")[0].strip()
-        elif "```" in ai_response:
-            json_str = ai_response.split("```")[1].split("```")[0].strip()
-        elif "{" in ai_response:
-            # JSON部分を抽出
-            start = ai_response.index("{")
-            end = ai_response.rindex("}") + 1
-            json_str = ai_response[start:end]
-        else:
-            json_str = ai_response
-
-        result = json.loads(json_str)
+        result = json.loads(extract_json_text(ai_response))
         summary = result.get("summary", "")
         category = result.get("category", "支援・合理的配慮")
         main_keyword = result.get("mainKeyword", "")
@@ -1446,21 +1677,8 @@ JSON形式で回答: {{"summary":"解説文（150字以内、文末は。）","c
             category = "支援・合理的配慮"
 
         # 【品質チェック】不完全な要約を拒否（著作権リスク回避）
-        def is_valid_summary(s: str) -> bool:
-            if not s or len(s) < 20:
-                return False
-            # 不完全な文末パターンを拒否
-            invalid_endings = ['...', '・・・', '…', '──', '－－', '、', 'の']
-            for ending in invalid_endings:
-                if s.rstrip().endswith(ending):
-                    return False
-            # 150文字超過を拒否
-            if len(s) > 150:
-                return False
-            return True
-
         if is_valid_summary(summary):
-            return {"summary": summary, "category": category, "mainKeyword": main_keyword, "skip": False}
+            return remember({"summary": summary, "category": category, "mainKeyword": main_keyword, "skip": False})
         else:
             FAILED_SUMMARIES.append({"title": title, "url": url, "reason": "要約が不完全または長すぎる"})
             # 【著作権保護】原文を使わず、リトライフラグを立てる
@@ -1480,7 +1698,7 @@ JSON形式で回答: {{"summary":"解説文（150字以内、文末は。）","c
             if retry_count < MAX_RETRY:
                 wait_time = BASE_WAIT * (2 ** retry_count)  # 指数バックオフ: 10秒, 20秒, 40秒
                 print(f"        [429対策] {wait_time}秒待機後にリトライ ({retry_count + 1}/{MAX_RETRY})")
-                time.sleep(wait_time)
+                rate_limiter.backoff(wait_time)  # 他のプロセスの呼び出しも止める
                 return generate_ai_summary_and_category(title, original_summary, source, url, retry_count + 1)
             else:
                 print(f"        [429対策] リトライ上限に達しました。後で再試行が必要です。")
@@ -1493,190 +1711,375 @@ JSON形式で回答: {{"summary":"解説文（150字以内、文末は。）","c
         return {"summary": "", "category": "支援・合理的配慮", "mainKeyword": "", "skip": False, "needs_retry": True}
 
 
-def contains_core_keyword(title: str, summary: str) -> bool:
-    """
-    【理念フィルタ】理念キーワードを含むかチェック
-    タイトルまたは要約にCORE_KEYWORDSのいずれかを含む場合True
-    """
-    text = f"{title} {summary}".lower()
-    return any(keyword.lower() in text for keyword in CORE_KEYWORDS)
+# ========================================
+# 【一括AI判定】複数記事を1リクエストで判定
+# ========================================
+# 無料枠（20RPD）は「リクエスト数」で数えられるため、候補をまとめて送ると
+# 1日に要約できる記事数がそのまま増える
+# 各記事の結果は個別に検証し、失敗した記事だけを1件ずつの判定で補う
+AI_BATCH_SIZE = 5  # 1リクエストにまとめる最大記事数
 
 
-def contains_exclude_keyword(title: str, summary: str) -> bool:
+def request_ai_summaries_batch(candidates: list, retry_count: int = 0) -> dict:
     """
-    【除外フィルタ】広告・PR記事をスキップ
+    候補リストを1リクエストで判定
+    Returns:
+        {番号(1始まり): AIの回答1件} 失敗時は空dict
     """
-    text = f"{title} {summary}"
-    return any(keyword in text for keyword in EXCLUDE_KEYWORDS)
+    global API_CALL_COUNT, API_ERRORS
 
+    MAX_RETRY = 3  # 最大リトライ回数
+    BASE_WAIT = 10  # 基本待機時間（秒）
 
-def contains_strong_exclude_keyword(title: str, summary: str) -> bool:
-    """
-    【強力除外フィルタ】サイト理念と完全に無関係な記事を即座に破棄
-    政治・一般受験・資格試験・経済ニュース・国際情勢・スポーツ・芸能など
+    article_lines = []
+    for n, candidate in enumerate(candidates, start=1):
+        # 【軽量化】タイトル+冒頭100文字のみを送信
+        article_lines.append(f"[{n}] タイトル: {candidate['title']}\n    概要: {candidate['originalSummary'][:100]}")
+    articles_text = "\n".join(article_lines)
 
-    【理念優先ルール】
-    除外キーワードを含んでいても、コア理念キーワード（合理的配慮、発達障害、
-    特別支援、インクルーシブなど）を同時に含む場合は例外的に採用する
-    """
-    text = f"{title} {summary}"
+    prompt = f"""インクルーシブ教育メディア記事判定（{len(candidates)}件）。塾広告・受験競争系は skip を true。
+カテゴリ: 支援・合理的配慮 / 多様な学び / 研究 / 制度・行政 / ICT・教材 / イベント・研修 / 実践・事例 / 書籍
 
-    # 除外キーワードを含むかチェック
-    has_exclude = any(keyword in text for keyword in STRONG_EXCLUDE_KEYWORDS)
-    if not has_exclude:
-        return False  # 除外キーワードなし → 採用
+{articles_text}
 
-    # 除外キーワードを含むが、コア理念キーワードも含む場合は例外的に採用
-    has_core = any(keyword in text for keyword in CORE_KEYWORDS)
-    if has_core:
-        return False  # 理念キーワードあり → 例外採用
+【執筆指示】（記事ごとに）
+元の文章を抜き出すのではなく、中学生でも理解できる平易な言葉で、ゼロから解説文を再構築してください。
+「何が起きたのか」「なぜ重要なのか」の2点に焦点を当てて構成してください。
 
-    # 除外キーワードのみ → 除外
-    return True
+【厳禁事項】
+- 元の文章の冒頭（リード文）をそのままコピーすることは厳禁
+- タイトル・導入文・出典・記事の引用は一切含めない
+- 「...」「・・・」や途中で切れた文は禁止
 
+【文体】
+- です・ます調を維持し、客観的なニュース解説としてのトーンで記述
+- 専門用語は可能な限り一般的な言葉に置き換えるか、補足説明を加える
+- 150文字以内の完結した日本語文で、文末は必ず「。」で終わらせる
 
-def is_tankyu_without_support(title: str, summary: str) -> bool:
-    """
-    【探究学習フィルタ】探究学習記事で支援キーワードがない場合に除外
+記事ごとに1要素のJSON配列で回答:
+[{{"id":番号,"skip":false,"summary":"解説文（150字以内、文末は。）","category":"カテゴリ名","mainKeyword":"キーワード1つ"}}]
+理念に合致しない記事は {{"id":番号,"skip":true}}"""
 
-    「探究学習」単独の記事はインクルーシブ教育と無関係なことが多い
-    ただし、コア理念キーワード（特別支援、発達障害、合理的配慮等）を
-    含む場合は例外的に採用する
-    """
-    text = f"{title} {summary}"
+    # 【レート制限】RPMの枠が空くまで待つ。本日の枠がなければ個別判定も行わない
+    if not acquire_ai_call(f"一括{len(candidates)}件"):
+        return {}
 
-    # 探究学習キーワードを含むかチェック
-    has_tankyu = "探究学習" in text or "探究型学習" in text or "探究活動" in text
-    if not has_tankyu:
-        return False  # 探究学習記事ではない → 採用
+    try:
+        response = gemini_client.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=prompt,
+            config={"response_mime_type": "application/json"}
+        )
 
-    # 探究学習記事だが、コア理念キーワードも含む場合は例外的に採用
-    has_core = any(keyword in text for keyword in CORE_KEYWORDS)
-    if has_core:
-        return False  # 理念キーワードあり → 例外採用
+        # API呼び出しカウント
+        API_CALL_COUNT += 1
 
-    # 探究学習のみ（支援なし） → 除外
-    return True
+        ai_response = response.text.strip()
 
+        items = json.loads(extract_json_text(ai_response, "[", "]"))
+        if isinstance(items, dict):
+            items = items.get("items") or items.get("articles") or [items]
 
-def contains_practice_exclude_keyword(title: str, summary: str) -> bool:
-    """
-    【除外フィルタ】細かすぎる実践情報をスキップ
-    板書、指導案、学級開き等の教員向けテクニック記事を除外
-    """
-    text = f"{title} {summary}"
-    return any(keyword in text for keyword in PRACTICE_EXCLUDE_KEYWORDS)
+        answers = {}
+        for item in items:
+            try:
+                answers[int(item.get("id"))] = item
+            except (TypeError, ValueError, AttributeError):
+                continue
+        return answers
+
+    except json.JSONDecodeError as e:
+        print(f"        [一括判定JSONパースエラー] {e}")
+        return {}
+    except Exception as e:
+        error_str = str(e)
+        print(f"        [一括判定エラー] {e}")
+
+        # API制限エラー（429）を検出した場合は指数バックオフでリトライ
+        if "429" in error_str or "quota" in error_str.lower() or "rate" in error_str.lower() or "resource_exhausted" in error_str.lower():
+            if retry_count < MAX_RETRY:
+                wait_time = BASE_WAIT * (2 ** retry_count)  # 指数バックオフ: 10秒, 20秒, 40秒
+                print(f"        [429対策] {wait_time}秒待機後にリトライ ({retry_count + 1}/{MAX_RETRY})")
+                rate_limiter.backoff(wait_time)  # 他のプロセスの呼び出しも止める
+                return request_ai_summaries_batch(candidates, retry_count + 1)
+            API_ERRORS.append({"type": "quota_exceeded", "message": error_str[:100], "timestamp": datetime.now().isoformat()})
+        return {}
 
 
-def is_small_event_article(title: str, summary: str) -> bool:
+def generate_ai_summaries_batch(candidates: list) -> list:
     """
-    【イベントフィルタ】小規模な研修・イベント記事かどうかを判定
-    公的機関が絡むもの以外はTrueを返す（除外対象）
+    【一括AI判定】候補をまとめて要約・カテゴリー・mainKeyword・SKIPを判定
+    ソースをまたいだ候補を1リクエストにまとめられる
+
+    Args:
+        candidates: [{"title", "originalSummary", "url", "source", ...}]
+    Returns:
+        candidates と同じ順の結果リスト（generate_ai_summary_and_category と同じ形式）
     """
-    text = f"{title} {summary}"
+    results = [None] * len(candidates)
+    batch_targets = []  # [(位置, キャッシュキー)]
+
+    for i, candidate in enumerate(candidates):
+        # 【AI応答キャッシュ】1件ずつの判定と同じキーで共有
+        cache_key = ai_cache.make_key(GEMINI_MODEL, PROMPT_VERSION_SUMMARY, candidate['title'], candidate['originalSummary'][:100])
+        cached_response = ai_cache.get(cache_key)
+        if cached_response and cached_response.get("result"):
+            print(f"        → AI応答キャッシュを再利用: {candidate['title'][:30]}...")
+            results[i] = dict(cached_response["result"])
+        elif candidate['url'] in SUMMARY_CACHE:
+            # 【ローカル分類器】既存の要約がある記事はカテゴリーのみ判定（確信度が低ければ1件ずつGeminiへ）
+            results[i] = classify_cached_summary(candidate['title'], candidate['url'])
+        else:
+            # 要約・カテゴリーをまとめて判定（既存の要約がある記事は1件ずつのカテゴリー判定に回す）
+            batch_targets.append((i, cache_key))
+
+    if gemini_client:
+        for start in range(0, len(batch_targets), AI_BATCH_SIZE):
+            chunk = batch_targets[start:start + AI_BATCH_SIZE]
+            if len(chunk) < 2:
+                break  # 1件だけなら通常の判定で十分
+            if TOTAL_AI_CALLS_THIS_RUN >= MAX_AI_CALLS_PER_RUN:
+                print(f"    [省エネ] AI呼び出し上限({MAX_AI_CALLS_PER_RUN}件)に達したため一括判定を中止")
+                break
 
-    # イベント系キーワードを含むかチェック
-    is_event = any(keyword in text for keyword in EVENT_KEYWORDS)
-    if not is_event:
-        return False  # イベント記事ではない
+            answers = request_ai_summaries_batch([candidates[i] for i, _ in chunk])
+            if DAILY_QUOTA_EXHAUSTED:
+                break
 
-    # 公的機関キーワードを含むかチェック
-    has_public_institution = any(keyword in text for keyword in PUBLIC_INSTITUTION_KEYWORDS)
-    if has_public_institution:
-        return False  # 公的機関のイベントなので除外しない
+            for n, (i, cache_key) in enumerate(chunk, start=1):
+                answer = answers.get(n)
+                if not answer:
+                    continue  # 回答なし → 1件ずつの判定で補う
 
-    # 小規模イベント（個人の教育実践家など）と判定
-    return True
+                if answer.get("skip") is True or str(answer.get("skip")).lower() == "true":
+                    result = {"skip": True}
+                else:
+                    summary = answer.get("summary", "")
+                    category = answer.get("category", "支援・合理的配慮")
+                    if category not in CATEGORIES:
+                        category = "支援・合理的配慮"
+                    # 【品質チェック】1件ずつ検証し、不合格なら個別判定で補う
+                    if not is_valid_summary(summary):
+                        continue
+                    result = {"summary": summary, "category": category, "mainKeyword": answer.get("mainKeyword", ""), "skip": False}
 
+                ai_cache.put(cache_key, json.dumps(answer, ensure_ascii=False), result, GEMINI_MODEL, PROMPT_VERSION_SUMMARY)
+                results[i] = result
 
-def contains_tech_exclude_keyword(title: str, summary: str) -> bool:
-    """
-    【除外フィルタ】マニアックな技術解説記事をスキップ
-    Scratch、プログラミング解説、共テ解説等
-    """
-    text = f"{title} {summary}"
-    return any(keyword in text for keyword in TECH_EXCLUDE_KEYWORDS)
+    # 【フォールバック】一括判定で結果が得られなかった記事のみ1件ずつ判定
+    fallback_count = 0
+    for i, candidate in enumerate(candidates):
+        if results[i] is not None:
+            continue
+        if TOTAL_AI_CALLS_THIS_RUN >= MAX_AI_CALLS_PER_RUN or DAILY_QUOTA_EXHAUSTED:
+            reason = "本日のAPI枠がない" if DAILY_QUOTA_EXHAUSTED else f"AI呼び出し上限({MAX_AI_CALLS_PER_RUN}件)"
+            print(f"    [省エネ] {reason}ため判定保留: {candidate['title'][:30]}...")
+            results[i] = {"summary": "", "category": "支援・合理的配慮", "mainKeyword": "", "skip": False, "needs_retry": True}
+            continue
+        fallback_count += 1
+        results[i] = generate_ai_summary_and_category(candidate['title'], candidate['originalSummary'], candidate['source'], candidate['url'])
+
+    if fallback_count:
+        print(f"        → 個別判定: {fallback_count}件")
+
+    return results
 
 
-def is_general_exam_article(title: str, summary: str) -> bool:
+# ========================================
+# 【並列取得エンジン】フィード・一覧ページを同時に取得
+# ========================================
+# 取得（ネットワーク待ち）だけを並列化し、解析・フィルタは
+# 従来通り RSS_FEEDS の順番で直列に行う（ログ・結果の順序は毎回同じ）
+# AI判定は全ソースの候補を順位付けした後に上位だけ行う（main の【3.8】）
+# 取得は http_client 経由（接続プール・条件付き取得・通信量の計測）
+
+def build_fetch_sources() -> list:
+    """並列取得の対象一覧を作成（RSSフィード + スクレイピング対象の一覧ページ）"""
+    sources = [{"name": feed["name"], "url": feed["url"], "timeout": 30} for feed in RSS_FEEDS]
+    sources.append({"name": "文部科学省 プレスリリース", "url": MEXT_PRESS_URL, "timeout": 15})
+    sources.append({"name": "筑波大学 人間系", "url": TSUKUBA_HUMAN_NEWS_URL, "timeout": 15})
+    sources.append({"name": "こどもとIT", "url": KODOMO_IT_URL, "timeout": 15})
+    return sources
+
+
+def fetch_source(source: dict, host_limits: dict):
+    """1ソースを取得（同一ホストの同時接続数はセマフォで制限）"""
+    with host_limits[get_domain(source['url'])]:
+        started = time.time()
+        response = http_client.get(source['url'], timeout=source['timeout'], profile="feed", conditional=not FORCE_FETCH)
+        response.raise_for_status()
+        return response, time.time() - started
+
+
+def prefetch_sources(sources: list) -> dict:
     """
-    【除外フィルタ】一般の受験情報をスキップ
-    特別支援・合理的配慮がセットでない入試情報は除外
+    【並列取得エンジン】全ソースを並列に取得
+    - 全体の同時接続数: FETCH_MAX_WORKERS
+    - 同一ホストへの同時接続数: FETCH_PER_HOST_LIMIT
+
+    Returns:
+        {URL: レスポンス または 取得時の例外}
     """
-    text = f"{title} {summary}"
+    results = {}
+    if not sources:
+        return results
 
-    # 受験情報キーワードを含むかチェック
-    has_exam_keyword = any(keyword in text for keyword in EXAM_EXCLUDE_KEYWORDS)
-    if not has_exam_keyword:
-        return False  # 受験情報ではない
+    host_limits = {
+        get_domain(source['url']): threading.BoundedSemaphore(FETCH_PER_HOST_LIMIT)
+        for source in sources
+    }
 
-    # 例外キーワード（特別支援・合理的配慮等）を含むかチェック
-    has_exception = any(keyword in text for keyword in EXAM_EXCEPTION_KEYWORDS)
-    if has_exception:
-        return False  # 特別支援関連の受験情報なので除外しない
+    started = time.time()
+    slowest = 0.0
+    failed = 0
+    not_modified = 0
+    with ThreadPoolExecutor(max_workers=min(FETCH_MAX_WORKERS, len(sources))) as executor:
+        futures = {executor.submit(fetch_source, source, host_limits): source for source in sources}
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                response, elapsed = future.result()
+                results[source['url']] = response
+                slowest = max(slowest, elapsed)
+                if http_client.is_not_modified(response):
+                    not_modified += 1
+            except Exception as e:
+                results[source['url']] = e
+                failed += 1
 
-    # 一般の受験情報と判定（除外対象）
-    return True
+    print(f"  並列取得完了: {len(sources)}ソース / 変更なし(304){not_modified}件 / 失敗{failed}件")
+    print(f"  所要時間: {time.time() - started:.1f}秒（最遅ソース {slowest:.1f}秒）")
+    return results
 
 
-def is_paid_article_url(url: str) -> bool:
+def get_source_response(url: str, prefetched: Optional[dict], timeout: int):
     """
-    【除外フィルタ】有料記事URLパターンをスキップ
-    AI判定前に弾くことで処理を高速化
+    並列取得済みのレスポンスを取り出す
+    未取得（単体呼び出し時）はその場で取得する。取得失敗時は例外を再送出
     """
-    url_lower = url.lower()
-    return any(pattern in url_lower for pattern in PAID_URL_PATTERNS)
+    if prefetched is not None and url in prefetched:
+        result = prefetched[url]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
+    response = http_client.get(url, timeout=timeout, profile="feed", conditional=not FORCE_FETCH)
+    response.raise_for_status()
+    return response
 
-def is_excluded_domain(url: str) -> bool:
-    """
-    【除外フィルタ】除外ドメインをスキップ
-    ログイン制限等で閲覧不可のサイト
-    """
-    domain = get_domain(url)
-    return any(excluded in domain for excluded in EXCLUDED_DOMAINS)
 
+# ========================================
+# 【既読ウォーターマーク】フィードごとの確認済み位置
+# ========================================
+# 前回までに確認したエントリはキーワードフィルタに通す前にO(1)でスキップする
+# - latestPublished: 確認済みエントリの最新公開時刻（UNIX秒）
+# - latestId: その時点の最新エントリのキー
+# - seen: 確認済みエントリのキー（新しい順、WATERMARK_SEEN_LIMIT件まで）
+FEED_WATERMARK_FILE = "feed-watermarks.json"
+FEED_WATERMARKS = {}
+WATERMARK_SEEN_LIMIT = 300
+CATCHUP_MAX_CHECK = 50  # ウォーターマークに届くまで確認する最大エントリ数
+
+
+def load_feed_watermarks():
+    """フィードごとのウォーターマークを読み込む"""
+    global FEED_WATERMARKS
+    FEED_WATERMARKS = load_state(FEED_WATERMARK_FILE, {}) or {}
+    # 確認済みキーは検索用にsetへ変換
+    for watermark in FEED_WATERMARKS.values():
+        watermark['seenSet'] = set(watermark.get('seen', []))
+    if FEED_WATERMARKS:
+        print(f"✓ フィードウォーターマーク読み込み: {len(FEED_WATERMARKS)}フィード")
+
+
+def save_feed_watermarks():
+    """フィードごとのウォーターマークを保存"""
+    data = {
+        url: {k: v for k, v in watermark.items() if k != 'seenSet'}
+        for url, watermark in FEED_WATERMARKS.items()
+    }
+    save_state(FEED_WATERMARK_FILE, data)
 
-def is_cram_school_ad(title: str, summary: str) -> bool:
-    """
-    【除外フィルタ】塾・予備校広告をスキップ
-    AI判定前にキーワードベースで弾く
-    「困り感に寄り添う支援」ではなく「競争に勝つための教育サービス」を除外
-    """
-    text = f"{title} {summary}"
 
-    # 塾広告キーワードを含むかチェック
-    has_cram_keyword = any(keyword in text for keyword in CRAM_SCHOOL_KEYWORDS)
-    if not has_cram_keyword:
-        return False  # 塾広告ではない
+def get_entry_key(entry) -> str:
+    """エントリの識別キー（GUID、なければリンク）の短縮ハッシュ"""
+    raw = (entry.get('id') or entry.get('link') or entry.get('title') or '').strip()
+    return hashlib.md5(raw.encode()).hexdigest()[:16]
 
-    # 例外キーワード（不登校支援・特別支援等）を含むかチェック
-    has_exception = any(keyword in text for keyword in CRAM_SCHOOL_EXCEPTION_KEYWORDS)
-    if has_exception:
-        return False  # 不登校支援等の文脈なので除外しない
 
-    # 塾広告と判定（除外対象）
-    return True
+def get_entry_timestamp(entry) -> Optional[int]:
+    """エントリの公開（更新）時刻をUNIX秒で取得（不明ならNone）"""
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if not parsed:
+        return None
+    try:
+        return calendar.timegm(parsed)
+    except Exception:
+        return None
 
 
-def fetch_rss_feed(feed_info: dict) -> list:
-    """RSSフィードから記事を取得"""
+def is_below_watermark(watermark: dict, key: str, timestamp: Optional[int]) -> bool:
+    """確認済みエントリかどうか（キー一致、またはウォーターマークより古い）"""
+    if not watermark:
+        return False
+    if key in watermark.get('seenSet', ()):
+        return True
+    latest = watermark.get('latestPublished')
+    return bool(timestamp and latest and timestamp < latest)
+
+
+def update_feed_watermark(feed_url: str, checked: list, completed: bool) -> None:
+    """
+    今回確認したエントリでウォーターマークを更新
+
+    Args:
+        checked: 確認済みエントリの [(キー, 公開時刻)]（フィード順）
+        completed: 上限で打ち切らずに確認を終えたか。
+                   打ち切った場合は最新時刻を進めない（未確認の古いエントリを取りこぼさないため）
+    """
+    if not checked:
+        return
+
+    watermark = FEED_WATERMARKS.setdefault(feed_url, {"seen": [], "seenSet": set()})
+    new_keys = [key for key, _ in checked if key not in watermark['seenSet']]
+    watermark['seen'] = (new_keys + watermark.get('seen', []))[:WATERMARK_SEEN_LIMIT]
+    watermark['seenSet'] = set(watermark['seen'])
+
+    if completed:
+        timestamps = [(ts, key) for key, ts in checked if ts]
+        if timestamps:
+            latest_ts, latest_key = max(timestamps)
+            if latest_ts >= (watermark.get('latestPublished') or 0):
+                watermark['latestPublished'] = latest_ts
+                watermark['latestId'] = latest_key
+        elif not watermark.get('latestPublished'):
+            # 公開時刻のないフィードは先頭エントリを最新とみなす
+            watermark['latestId'] = checked[0][0]
+    watermark['updatedAt'] = datetime.now().isoformat()
+
+
+def fetch_rss_feed(feed_info: dict, prefetched: Optional[dict] = None) -> list:
+    """
+    RSSフィードから記事候補を取得（AI判定前）
+    ページ解析・AI判定は全ソースの候補を順位付けした後に build_articles_from_candidates で行う
+    """
     articles = []
     feed_name = feed_info['name']
     feed_url = feed_info['url']
     skip_core_filter = feed_info.get('skip_core_filter', False)
     duplicate_count = 0  # 重複スキップのカウンター
+    same_story_count = 0  # 近似重複（同じ話題の別配信）のカウンター
 
     try:
         print(f"  ■ {feed_name}")
         print(f"    URL: {feed_url}")
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        response = get_source_response(feed_url, prefetched, timeout=30)
 
-        response = requests.get(feed_url, headers=headers, timeout=30)
-        response.raise_for_status()
+        # 【条件付き取得】前回から変更がなければ解析・フィルタを丸ごとスキップ
+        if http_client.is_not_modified(response):
+            print(f"    → 変更なし（304）: スキップ")
+            return articles
 
         feed = feedparser.parse(response.content)
 
@@ -1687,12 +2090,33 @@ def fetch_rss_feed(feed_info: dict) -> list:
         print(f"    {len(feed.entries)}件のエントリを取得")
 
         processed = 0
+        # 確認件数の上限（max_check）で打ち切った場合はFalse（次回304・ウォーターマークで残りを取りこぼさないため）
+        # 候補数の上限を超えた分はAI作業キューに回すので、打ち切りにはならない
+        completed = True
         max_check = 10 if LIGHT_MODE else 30  # 軽量化モードでは10件までチェック
+
+        # 【既読ウォーターマーク】確認済みエントリはフィルタ前にスキップ
+        watermark = FEED_WATERMARKS.get(feed_url)
+        checked_entries = []  # 今回確認したエントリ [(キー, 公開時刻)]
+        watermark_skipped = 0
+        if watermark or ARGS.catch_up:
+            # 【キャッチアップ】前回の確認位置に届くまで深く確認（実行の取りこぼし・更新集中対策）
+            max_check = max(max_check, CATCHUP_MAX_CHECK)
+
+        # 【軽量化モード】1ソースから今回の候補にする最大件数（超えた分はAI作業キューへ）
+        source_limit = min(MAX_ARTICLES_PER_SOURCE, MAX_NEW_ARTICLES_PER_RUN) if LIGHT_MODE else MAX_NEW_ARTICLES_PER_RUN
+        queued_count = 0
+
         for entry in feed.entries[:max_check]:
-            # 【軽量化モード】記事数上限チェック
-            if LIGHT_MODE and len(articles) >= MAX_ARTICLES_PER_SOURCE:
-                print(f"    [軽量化] {MAX_ARTICLES_PER_SOURCE}件に達したため次のソースへ")
+            entry_key = get_entry_key(entry)
+            entry_ts = get_entry_timestamp(entry)
+            if watermark and entry_key == watermark.get('latestId'):
+                # 前回の最新エントリに到達 → 以降は確認済み
                 break
+            if is_below_watermark(watermark, entry_key, entry_ts):
+                watermark_skipped += 1
+                continue
+            checked_entries.append((entry_key, entry_ts))
 
             title = entry.get('title', '').strip()
             link = entry.get('link', '').strip()
@@ -1700,209 +2124,84 @@ def fetch_rss_feed(feed_info: dict) -> list:
             if not title or not link:
                 continue
 
-            # 【除外フィルタ】有料記事URLパターンをスキップ（AI判定前に弾く）
-            if is_paid_article_url(link):
-                continue
-
-            # 【除外フィルタ】除外ドメインをスキップ（ログイン制限等）
-            if is_excluded_domain(link):
-                continue
-
             # RSS内の要約を取得
             rss_summary = entry.get('summary', '') or entry.get('description', '')
             rss_summary = truncate_text(rss_summary)
 
-            # 【除外フィルタ】広告・PR記事をスキップ
-            if contains_exclude_keyword(title, rss_summary):
-                continue
-
-            # 【強力除外フィルタ】サイト理念と完全に無関係な記事を即座に破棄
-            # 政治・一般受験・一般医療・スポーツ・芸能など
-            if contains_strong_exclude_keyword(title, rss_summary):
-                print(f"    [除外] 理念外: {title[:40]}...")
-                continue
-
-            # 【探究学習フィルタ】支援キーワードなしの探究学習記事を除外
-            if is_tankyu_without_support(title, rss_summary):
-                print(f"    [除外] 探究学習（理念なし）: {title[:40]}...")
-                continue
-
-            # 【除外フィルタ】塾・予備校広告をスキップ（AI判定前に弾く）
-            if is_cram_school_ad(title, rss_summary):
-                print(f"    [除外] 塾広告: {title[:40]}...")
-                continue
-
-            # 【除外フィルタ】細かすぎる実践情報をスキップ
-            if contains_practice_exclude_keyword(title, rss_summary):
-                continue
-
-            # 【除外フィルタ】マニアックな技術解説記事をスキップ
-            if contains_tech_exclude_keyword(title, rss_summary):
-                continue
-
-            # 【除外フィルタ】一般の受験情報をスキップ（特別支援関連は例外）
-            if is_general_exam_article(title, rss_summary):
-                continue
-
-            # 【除外フィルタ】小規模な研修・イベント記事をスキップ（公的機関は例外）
-            if is_small_event_article(title, rss_summary):
-                continue
-
-            # 【理念フィルタ】教育専門サイト以外は理念キーワードを含む記事のみ採用
-            if not skip_core_filter and not contains_core_keyword(title, rss_summary):
+            # 【ルールエンジン】AI判定前のフィルタを1回の照合でまとめて判定
+            # 有料URL・除外ドメイン・広告・理念外・探究学習・塾広告・実践テクニック・技術解説・
+            # 一般受験・小規模イベント・コア理念（教育専門サイトは省略）・ソース固有の厳格フィルタ
+            verdict = FILTER_ENGINE.evaluate(
+                title, rss_summary, url=link, source=feed_name,
+                skip_core_filter=skip_core_filter,
+            )
+            if not verdict.accepted:
+                if verdict.verbose:
+                    print(f"    [除外] {verdict.label}: {title[:40]}...")
                 continue
 
-            # 【厳格フィルタ】ソース固有のstrict_keywordsが設定されている場合、
-            # それらのキーワードのいずれかを含まない記事はスキップ
-            strict_keywords = feed_info.get('strict_keywords', [])
-            if strict_keywords:
-                text = f"{title} {rss_summary}"
-                has_strict_keyword = any(kw in text for kw in strict_keywords)
-                if not has_strict_keyword:
-                    print(f"    [除外] 厳格フィルタ: {title[:40]}...")
-                    continue
-
             # 【API節約】重複チェック - 既存記事と同じタイトルまたはURLならAI要約前にスキップ
             if is_duplicate_article(title, link):
                 duplicate_count += 1
                 continue
 
+            # 【近似重複】同じプレスリリースの別配信はページ取得・AI判定の前にまとめる
+            if find_same_story(title, rss_summary, link, feed_name):
+                same_story_count += 1
+                continue
+
             processed += 1
             print(f"    [{processed}] {title[:50]}...")
 
-            # 【省エネ】1回の実行で追加する記事数を制限
-            if len(articles) >= MAX_NEW_ARTICLES_PER_RUN:
-                print(f"    [省エネ] 最大追加数 {MAX_NEW_ARTICLES_PER_RUN}件に達したため終了")
-                break
-
-            # 【省エネ】グローバルAI呼び出し上限チェック
-            global TOTAL_AI_CALLS_THIS_RUN
-            if TOTAL_AI_CALLS_THIS_RUN >= MAX_AI_CALLS_PER_RUN:
-                print(f"    [省エネ] AI呼び出し上限({MAX_AI_CALLS_PER_RUN}件)に達したため終了")
-                break
-
-            # 記事IDを生成
-            article_id = generate_article_id(link)
-
             # 公開日を取得
             date_parsed = entry.get('published_parsed') or entry.get('updated_parsed')
             date_str = parse_date(date_parsed)
 
-            # 【省エネ】開発モードではページ解析とAPI呼び出しをスキップ
-            if IS_DEV_MODE:
-                image_url = get_fallback_image(article_id)
-                original_summary = rss_summary or f"{feed_name}の記事です。"
-                # キーワードベースで簡易カテゴリ判定
-                text = f"{title} {original_summary}".lower()
-                category = "支援・合理的配慮"
-                if any(kw in text for kw in ['脳機能', '脳科学', '神経科学', '認知科学', '理化学研究所', 'riken', '研究成果', '論文']):
-                    category = "研究"
-                elif any(kw in text for kw in ['不登校', 'フリースクール', 'オルタナティブ', '通信制']):
-                    category = "多様な学び"
-                elif any(kw in text for kw in ['ict', 'アプリ', 'デジタル', 'ai', 'edtech']):
-                    category = "ICT・教材"
-                elif any(kw in text for kw in ['文部科学省', '文科省', '法改正', '通知']):
-                    category = "制度・行政"
-                summary = original_summary[:150]
-                main_keyword = ""
-            else:
-                # 本番モード：ページ解析とAI判定を実行
-                print(f"        → ページ解析中...")
-                metadata = fetch_page_metadata(link, timeout=15)
-
-                # 【鉄壁ルール】画像URL - 取得失敗時は必ずフォールバック画像を使用
-                image_url = metadata.get('image')
-                if not image_url or not is_valid_image_url(image_url):
-                    image_url = get_fallback_image(article_id)
-                    print(f"        → フォールバック画像を使用: {image_url[:50]}...")
-                else:
-                    print(f"        → 画像URL: {image_url[:60]}...")
-
-                # 要約（ページのdescriptionを優先、なければRSSの要約）
-                original_summary = metadata.get('description') or rss_summary
-                if not original_summary:
-                    original_summary = f"{feed_name}の記事です。詳しくは元記事をご覧ください。"
-
-                # 【AI要約 + カテゴリー + mainKeyword判定】
-                print(f"        → AI判定（要約＆カテゴリー＆キーワード）...")
-                TOTAL_AI_CALLS_THIS_RUN += 1
-                ai_result = generate_ai_summary_and_category(title, original_summary, feed_name, link)
-
-                # 【SKIP判定】AIが理念に合致しないと判断した記事は除外
-                if ai_result.get("skip"):
-                    continue
-
-                # 【要約取得】AIからの要約を取得（フォールバックなし）
-                summary = ai_result.get("summary", "")
-                category = normalize_category(ai_result.get("category", "支援・合理的配慮"))
-                main_keyword = ai_result.get("mainKeyword", "")
-
-                # 【リトライ必要フラグ】要約が取得できなかった場合はスキップ（後でリトライ）
-                if ai_result.get("needs_retry") or not summary or len(summary) < 20:
-                    print(f"        → 要約取得失敗（後でリトライ）")
-                    # 【著作権保護】原文やタイトルを含めず、プレースホルダーのみ
-                    summary = "【要約準備中】この記事の要約は現在準備中です。"
-
-                # 【キーワードベースのカテゴリ上書き】AIの判定を補完
-                text_for_category = f"{title} {summary}".lower()
-                research_keywords = ['脳機能', '脳科学', '神経科学', '認知科学', '理化学研究所', 'riken', '研究成果', '論文', '脳神経']
-                diverse_learning_keywords = [
-                    '不登校', 'フリースクール', 'オルタナティブ', 'オルティナブル',
-                    '通信制高校', 'ホームスクール', 'ホームエデュケーション',
-                    '多様な学び', '学校外', 'サポート校', 'nijin', 'ニジン'
-                ]
-                ict_keywords = ['ict', 'edtech', 'タブレット', 'デジタル教科書', 'アプリ', 'ai活用', '生成ai']
-                policy_keywords = ['文部科学省', '文科省', '法改正', '通知', 'ガイドライン', '実証事業']
-
-                # 研究カテゴリを最優先でチェック
-                for kw in research_keywords:
-                    if kw in text_for_category:
-                        category = "研究"
-                        print(f"        → カテゴリ上書き: 研究（キーワード: {kw}）")
-                        break
-                else:
-                    for kw in diverse_learning_keywords:
-                        if kw in text_for_category:
-                            category = "多様な学び"
-                            print(f"        → カテゴリ上書き: 多様な学び（キーワード: {kw}）")
-                            break
-                    else:
-                        for kw in ict_keywords:
-                            if kw in text_for_category:
-                                category = "ICT・教材"
-                                break
-                        else:
-                            for kw in policy_keywords:
-                                if kw in text_for_category:
-                                    category = "制度・行政"
-                                    break
-
-                print(f"        → カテゴリー: {category}")
-                if main_keyword:
-                    print(f"        → メインキーワード: {main_keyword}")
-
-            article = {
-                "id": article_id,
+            # 【二段階処理】ここでは候補として集めるだけ（ページ解析・AI判定は全ソースの順位付け後）
+            candidate = {
+                "id": generate_article_id(link),
                 "title": title,
-                "summary": truncate_text(summary),
-                "category": category,
+                "originalSummary": rss_summary,
+                "category": override_category_by_keywords(title, rss_summary, "支援・合理的配慮", verbose=False),  # AI判定前の推定
                 "date": date_str,
-                "url": link,  # 直接記事URLを保存
-                "imageUrl": image_url,
+                "url": link,
+                "imageUrl": "",
                 "source": feed_name,
-                "mainKeyword": main_keyword  # Amazon検索用キーワード
+                "needsAi": True,
             }
+            register_story(candidate)
+
+            # 【AI作業キュー】上限を超えた候補は捨てずに次回以降へ持ち越す
+            if len(articles) >= source_limit:
+                ai_queue.push("new", link, calculate_relevance_score(title, rss_summary), candidate)
+                queued_count += 1
+                continue
+            articles.append(candidate)
+        else:
+            # 前回の最新エントリに届かないまま上限で打ち切った → 残りの古いエントリは未確認
+            if len(feed.entries) > max_check:
+                completed = False
 
-            articles.append(article)
+        if not completed:
+            print(f"    → 確認上限（{max_check}件）で打ち切り: 次回も最新時刻を進めずに確認")
+            http_client.forget_validators(feed_url)
+        update_feed_watermark(feed_url, checked_entries, completed)
 
         # ソースごとのサマリー表示
-        if len(articles) > 0 or duplicate_count > 0:
-            print(f"    → 新規: {len(articles)}件 / 重複スキップ: {duplicate_count}件")
+        if watermark_skipped > 0:
+            print(f"    → 確認済みスキップ: {watermark_skipped}件")
+        if queued_count > 0:
+            print(f"    [省エネ] 上限{source_limit}件を超えた{queued_count}件はAI作業キューへ")
+        if len(articles) > 0 or duplicate_count > 0 or same_story_count > 0:
+            print(f"    → 候補: {len(articles)}件 / 重複スキップ: {duplicate_count}件"
+                  + (f" / 同じ話題: {same_story_count}件" if same_story_count else ""))
 
     except requests.exceptions.RequestException as e:
         print(f"    エラー: {feed_name}の取得に失敗 - {e}")
+        http_client.forget_validators(feed_url)
     except Exception as e:
         print(f"    エラー: {feed_name}の処理中にエラー - {e}")
+        http_client.forget_validators(feed_url)
 
     return articles
 
@@ -1921,6 +2220,133 @@ def apply_domain_limit(articles: list, max_per_domain: int) -> list:
     return filtered_articles
 
 
+def build_articles_from_candidates(candidates: list) -> list:
+    """
+    【二段階処理】選ばれた候補だけページ解析・AI判定を行い、記事データにする
+    AI判定が不要な記事（needsAi なし）はそのまま返す。順序は candidates の順
+
+    Returns:
+        記事リスト（AIがSKIP判定した候補は除く）
+    """
+    ai_targets = []  # AI判定に回す候補（ページ解析済み）
+
+    for candidate in candidates:
+        if not candidate.get('needsAi'):
+            continue
+        print(f"  [{candidate['source']}] {candidate['title'][:50]}...")
+
+        # 【省エネ】開発モードではページ解析とAPI呼び出しをスキップ
+        if IS_DEV_MODE:
+            candidate['imageUrl'] = candidate.get('imageUrl') or get_fallback_image(candidate['id'])
+            candidate['originalSummary'] = candidate.get('originalSummary') or f"{candidate['source']}の記事です。"
+            continue
+
+        # 本番モード：ページ解析を実行し、AI判定は全候補をまとめて行う
+        print(f"        → ページ解析中...")
+        metadata = fetch_page_metadata(candidate['url'], timeout=15)
+
+        # 【鉄壁ルール】画像URL - 取得失敗時は必ずフォールバック画像を使用
+        image_url = candidate.get('imageUrl')
+        if not image_url or not is_valid_image_url(image_url):
+            image_url = metadata.get('image')
+        if not image_url or not is_valid_image_url(image_url):
+            image_url = get_fallback_image(candidate['id'])
+            print(f"        → フォールバック画像を使用: {image_url[:50]}...")
+        else:
+            print(f"        → 画像URL: {image_url[:60]}...")
+        candidate['imageUrl'] = image_url
+
+        # 要約（ページのdescriptionを優先、なければRSSの要約）
+        original_summary = metadata.get('description') or candidate.get('originalSummary')
+        if not original_summary:
+            original_summary = f"{candidate['source']}の記事です。詳しくは元記事をご覧ください。"
+        candidate['originalSummary'] = original_summary
+        candidate['pageText'] = metadata.get('text', '')
+        ai_targets.append(candidate)
+
+    # 【一括AI判定】ソースをまたいでまとめて要約・カテゴリー・キーワード判定
+    ai_results = {}
+    if ai_targets:
+        print(f"  → AI判定（{len(ai_targets)}件を一括）...")
+        for candidate, ai_result in zip(ai_targets, generate_ai_summaries_batch(ai_targets)):
+            ai_results[candidate['url']] = ai_result
+
+    articles = []
+    for candidate in candidates:
+        if not candidate.get('needsAi'):
+            articles.append(candidate)
+            continue
+
+        if IS_DEV_MODE:
+            # キーワードベースの推定カテゴリをそのまま使用
+            summary = candidate['originalSummary'][:150]
+            category = candidate['category']
+            main_keyword = ""
+            summary_source = ""
+            category_source = "keyword"
+        else:
+            ai_result = ai_results[candidate['url']]
+
+            # 【SKIP判定】AIが理念に合致しないと判断した記事は除外（次回以降はAIに送らない）
+            if ai_result.get("skip"):
+                print(f"        → SKIP: {candidate['title'][:40]}...")
+                record_ai_rejection(candidate['title'], candidate['url'])
+                continue
+
+            # 【要約取得】AIからの要約を取得（フォールバックなし）
+            summary = ai_result.get("summary", "")
+            category = normalize_category(ai_result.get("category") or candidate['category'])
+            # 判定結果にカテゴリーがなければ収集時のキーワード推定
+            category_source = ai_result.get("categorySource", "ai") if ai_result.get("category") else "keyword"
+            main_keyword = ai_result.get("mainKeyword", "")
+            summary_source = "ai"
+
+            # 【リトライ必要フラグ】要約が取得できなかった場合はスキップ（後でリトライ）
+            if ai_result.get("needs_retry") or not summary or len(summary) < 20:
+                print(f"        → 要約取得失敗（後でリトライ）: {candidate['title'][:40]}...")
+                # 【ローカル要約】ページの文から暫定の要約を作成（作れなければプレースホルダー）
+                summary = local_summarizer.summarize(candidate['title'], candidate['originalSummary'], candidate.get('pageText', ''))
+                if summary:
+                    summary_source = local_summarizer.SUMMARY_SOURCE
+                    print(f"        → ローカル要約で暫定表示: {summary[:30]}...")
+                else:
+                    # 【著作権保護】原文やタイトルを含めず、プレースホルダーのみ
+                    summary = "【要約準備中】この記事の要約は現在準備中です。"
+                    summary_source = ""
+                # 【AI作業キュー】次回以降の残り枠でリトライ
+                ai_queue.push("retry", candidate['url'], candidate.get('relevance_score', 0), {
+                    "title": candidate['title'],
+                    "originalSummary": candidate['originalSummary'],
+                    "source": candidate['source'],
+                })
+
+            # 【キーワードベースのカテゴリ上書き】AIの判定を補完
+            category, category_source = resolve_category(candidate['title'], summary, category, category_source)
+
+            print(f"        → カテゴリー: {category}（{candidate['title'][:30]}...）")
+            if main_keyword:
+                print(f"        → メインキーワード: {main_keyword}")
+
+        articles.append({
+            "id": candidate['id'],
+            "title": candidate['title'],
+            "summary": truncate_text(summary),
+            "category": category,
+            "date": candidate['date'],
+            "url": candidate['url'],  # 直接記事URLを保存
+            "imageUrl": candidate['imageUrl'],
+            "source": candidate['source'],
+            "mainKeyword": main_keyword,  # Amazon検索用キーワード
+            "summarySource": summary_source,  # ai / local（ローカル要約は後でAI要約に置き換え）
+            "categorySource": category_source,  # ai / local / keyword（ローカル分類器は ai のみ学習）
+            "relevance_score": candidate.get('relevance_score', 0),
+        })
+        if candidate.get('extraSources'):
+            articles[-1]['extraSources'] = candidate['extraSources']
+
+    return articles
+
+
 def validate_all_images(articles: list) -> list:
     """
     【最終検証】全記事の画像URLを検証
@@ -1934,25 +2360,26 @@ def validate_all_images(articles: list) -> list:
     return articles
 
 
-def fetch_mext_press_releases(max_articles: int = 3) -> list:
+def fetch_mext_press_releases(max_articles: int = 3, prefetched: Optional[dict] = None) -> list:
     """
     文部科学省プレスリリースをスクレイピング（RSSがないため）
     教育関連の重要な政策発表を取得
     """
     articles = []
     duplicate_count = 0
-    mext_url = "https://www.mext.go.jp/b_menu/houdou/index.htm"
+    mext_url = MEXT_PRESS_URL
 
     try:
         print("  ■ 文部科学省 プレスリリース")
         print(f"    URL: {mext_url}")
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        response = get_source_response(mext_url, prefetched, timeout=15)
+
+        # 【条件付き取得】一覧ページに変更がなければスキップ
+        if http_client.is_not_modified(response):
+            print(f"    → 変更なし（304）: スキップ")
+            return articles
 
-        response = requests.get(mext_url, headers=headers, timeout=15)
-        response.raise_for_status()
         response.encoding = 'utf-8'
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -1976,8 +2403,8 @@ def fetch_mext_press_releases(max_articles: int = 3) -> list:
                 else:
                     full_url = href
 
-                # 理念キーワードを含むかチェック
-                if not contains_core_keyword(text, ""):
+                # 【ルールエンジン】理念ルールで判定
+                if not FILTER_ENGINE.evaluate(text, "", url=full_url, source="文部科学省", ruleset=RULESET_BASIC).accepted:
                     continue
 
                 # 重複チェック
@@ -2002,33 +2429,39 @@ def fetch_mext_press_releases(max_articles: int = 3) -> list:
                 }
                 articles.append(article)
 
+        # 上限で打ち切った場合は次回も全文取得（304で残りを取りこぼさないため）
+        if count >= max_articles:
+            http_client.forget_validators(mext_url)
+
         if len(articles) > 0 or duplicate_count > 0:
             print(f"    → 新規: {len(articles)}件 / 重複スキップ: {duplicate_count}件")
 
     except Exception as e:
         print(f"    エラー: 文部科学省の取得に失敗 - {e}")
+        http_client.forget_validators(mext_url)
 
     return articles
 
 
-def fetch_tsukuba_human_news(max_articles: int = 2) -> list:
+def fetch_tsukuba_human_news(max_articles: int = 2, prefetched: Optional[dict] = None) -> list:
     """
     筑波大学 人間系のニュースをスクレイピング
     特別支援教育・教育心理学の研究拠点
     """
     articles = []
     duplicate_count = 0
-    tsukuba_url = "https://www.human.tsukuba.ac.jp/human/news/"
+    tsukuba_url = TSUKUBA_HUMAN_NEWS_URL
 
     try:
         print(f"    URL: {tsukuba_url}")
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        response = get_source_response(tsukuba_url, prefetched, timeout=15)
+
+        # 【条件付き取得】一覧ページに変更がなければスキップ
+        if http_client.is_not_modified(response):
+            print(f"    → 変更なし（304）: スキップ")
+            return articles
 
-        response = requests.get(tsukuba_url, headers=headers, timeout=15)
-        response.raise_for_status()
         response.encoding = 'utf-8'
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -2059,8 +2492,8 @@ def fetch_tsukuba_human_news(max_articles: int = 2) -> list:
                     duplicate_count += 1
                     continue
 
-                # 【厳格フィルタ】理念キーワードを含む記事のみ
-                if not contains_core_keyword(text, ""):
+                # 【ルールエンジン】理念ルールで判定（理念キーワードを含む記事のみ）
+                if not FILTER_ENGINE.evaluate(text, "", url=full_url, source="筑波大学 人間系", ruleset=RULESET_BASIC).accepted:
                     continue
 
                 count += 1
@@ -2081,35 +2514,41 @@ def fetch_tsukuba_human_news(max_articles: int = 2) -> list:
                 }
                 articles.append(article)
 
+        # 上限で打ち切った場合は次回も全文取得（304で残りを取りこぼさないため）
+        if count >= max_articles:
+            http_client.forget_validators(tsukuba_url)
+
         if len(articles) > 0 or duplicate_count > 0:
             print(f"    → 新規: {len(articles)}件 / 重複スキップ: {duplicate_count}件")
 
     except Exception as e:
         print(f"    エラー: 筑波大学の取得に失敗 - {e}")
+        http_client.forget_validators(tsukuba_url)
 
     return articles
 
 
-def fetch_kodomo_it_news(max_articles: int = 3) -> list:
+def fetch_kodomo_it_news(max_articles: int = 3, prefetched: Optional[dict] = None) -> list:
     """
-    こどもとIT（Impress Watch）の記事をスクレイピング
+    こどもとIT（Impress Watch）の記事候補をスクレイピング（AI判定前）
     RSSが不安定なため、直接Webページを解析
     教育ICT・プログラミング教育の専門メディア
     """
     articles = []
     duplicate_count = 0
-    kodomo_url = "https://edu.watch.impress.co.jp/"
+    kodomo_url = KODOMO_IT_URL
 
     try:
         print("  ■ こどもとIT")
         print(f"    URL: {kodomo_url}")
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        response = get_source_response(kodomo_url, prefetched, timeout=15)
+
+        # 【条件付き取得】一覧ページに変更がなければスキップ
+        if http_client.is_not_modified(response):
+            print(f"    → 変更なし（304）: スキップ")
+            return articles
 
-        response = requests.get(kodomo_url, headers=headers, timeout=15)
-        response.raise_for_status()
         response.encoding = 'utf-8'
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -2118,7 +2557,7 @@ def fetch_kodomo_it_news(max_articles: int = 3) -> list:
         # パターン1: 記事一覧のリンク
         article_links = soup.find_all('a', href=True)
         count = 0
-        seen_urls = set()
+        seen_urls = url_canon.UrlIndex()
 
         for link in article_links:
             if count >= max_articles:
@@ -2142,32 +2581,27 @@ def fetch_kodomo_it_news(max_articles: int = 3) -> list:
                     continue
                 seen_urls.add(full_url)
 
-                # 強力除外キーワードチェック（理念優先ルール適用）
-                if contains_strong_exclude_keyword(text, ""):
-                    continue
-
-                # 探究学習フィルタ（支援キーワードなしの場合は除外）
-                if is_tankyu_without_support(text, ""):
+                # 【ルールエンジン】強力除外（理念優先ルール）→ 探究学習 → コア理念（こどもとITも例外なし）
+                if not FILTER_ENGINE.evaluate(text, "", url=full_url, source="こどもとIT", ruleset=RULESET_BASIC).accepted:
                     continue
 
-                # 【理念フィルタ】コア理念キーワードチェック（こどもとITも例外なし）
-                if not contains_core_keyword(text, ""):
-                    continue  # 理念キーワードなし → 除外
-
                 # 重複チェック（既存記事との比較）
                 if is_duplicate_article(text, full_url):
                     duplicate_count += 1
                     continue
 
+                # 【近似重複】他ソースで配信済みの話題はまとめる
+                if find_same_story(text, "", full_url, "こどもとIT"):
+                    duplicate_count += 1
+                    continue
+
                 count += 1
                 print(f"    [{count}] {text[:50]}...")
 
                 article_id = generate_article_id(full_url)
 
-                # 画像URL取得を試みる（記事ページのOGP画像を優先）
+                # リンク内の画像（なければ記事ページのOGP画像を build_articles_from_candidates で取得）
                 img_url = ""
-
-                # まずリンク内の画像を試す
                 img_tag = link.find('img')
                 if img_tag and img_tag.get('src'):
                     img_src = img_tag.get('src')
@@ -2175,74 +2609,34 @@ def fetch_kodomo_it_news(max_articles: int = 3) -> list:
                         img_url = img_src
                     elif img_src.startswith('/'):
                         img_url = f"https://edu.watch.impress.co.jp{img_src}"
+                if 'unsplash.com' in img_url:
+                    img_url = ""
 
-                # リンク内に画像がない場合、記事ページからOGP画像を取得
-                if not img_url or 'unsplash.com' in img_url:
-                    try:
-                        article_resp = requests.get(full_url, headers=headers, timeout=10)
-                        if article_resp.status_code == 200:
-                            article_soup = BeautifulSoup(article_resp.text, 'html.parser')
-                            # OGP画像を探す
-                            og_image = article_soup.find('meta', property='og:image')
-                            if og_image and og_image.get('content'):
-                                og_img_url = og_image['content']
-                                if og_img_url.startswith('http') and is_valid_image_url(og_img_url):
-                                    img_url = og_img_url
-                                    print(f"        → OGP画像取得成功")
-                    except Exception as img_err:
-                        print(f"        → OGP画像取得失敗: {img_err}")
-
-                if not img_url or not is_valid_image_url(img_url):
-                    img_url = get_fallback_image(article_id)
-
-                # 【AI要約】グローバルAPI上限チェック
-                global TOTAL_AI_CALLS_THIS_RUN
-                if TOTAL_AI_CALLS_THIS_RUN >= MAX_AI_CALLS_PER_RUN:
-                    print(f"    [省エネ] AI呼び出し上限({MAX_AI_CALLS_PER_RUN}件)に達したため終了")
-                    break
-
-                # 【AI要約 + カテゴリー + mainKeyword判定】
-                summary = "【要約準備中】この記事の要約は現在準備中です。"
-                category = "ICT・教材"
-                main_keyword = ""
-
-                if gemini_client:
-                    print(f"        → AI判定（要約＆カテゴリー＆キーワード）...")
-                    TOTAL_AI_CALLS_THIS_RUN += 1
-                    ai_result = generate_ai_summary_and_category(text, "", "こどもとIT", full_url)
-
-                    # 【SKIP判定】AIが理念に合致しないと判断した記事は除外
-                    if ai_result.get("skip"):
-                        print(f"        → SKIP（理念に合致しない）")
-                        continue
-
-                    # AI結果を取得
-                    if ai_result.get("summary") and len(ai_result.get("summary", "")) > 20:
-                        summary = ai_result.get("summary")
-                        print(f"        → 要約生成成功")
-                    if ai_result.get("category"):
-                        category = normalize_category(ai_result.get("category"))
-                    if ai_result.get("mainKeyword"):
-                        main_keyword = ai_result.get("mainKeyword")
-
-                article = {
+                # 【二段階処理】ここでは候補として集めるだけ（ページ解析・AI判定は全ソースの順位付け後）
+                candidate = {
                     "id": article_id,
                     "title": text,
-                    "summary": summary,
-                    "category": category,
+                    "originalSummary": "",
+                    "category": override_category_by_keywords(text, "", "ICT・教材", verbose=False),  # AI判定前の推定
                     "date": datetime.now().strftime("%Y-%m-%d"),
                     "url": full_url,
                     "imageUrl": img_url,
                     "source": "こどもとIT",
-                    "mainKeyword": main_keyword
+                    "needsAi": True,
                 }
-                articles.append(article)
+                register_story(candidate)
+                articles.append(candidate)
+
+        # 上限で打ち切った場合は次回も全文取得（304で残りを取りこぼさないため）
+        if count >= max_articles:
+            http_client.forget_validators(kodomo_url)
 
         if len(articles) > 0 or duplicate_count > 0:
-            print(f"    → 新規: {len(articles)}件 / 重複スキップ: {duplicate_count}件")
+            print(f"    → 候補: {len(articles)}件 / 重複スキップ: {duplicate_count}件")
 
     except Exception as e:
         print(f"    エラー: こどもとITの取得に失敗 - {e}")
+        http_client.forget_validators(kodomo_url)
 
     return articles
 
@@ -2253,7 +2647,7 @@ def clean_article_data(article: dict) -> dict:
     content, raw_html, description等の長いフィールドを削除
     """
     # 必要なフィールドのみを抽出（軽量化）
-    allowed_fields = {'id', 'title', 'summary', 'category', 'date', 'url', 'imageUrl', 'source', 'mainKeyword'}
+    allowed_fields = {'id', 'title', 'summary', 'category', 'date', 'url', 'imageUrl', 'source', 'mainKeyword', 'summarySource', 'categorySource', 'extraSources'}
     cleaned = {k: v for k, v in article.items() if k in allowed_fields}
 
     # summary は200文字以内に制限
@@ -2264,17 +2658,21 @@ def clean_article_data(article: dict) -> dict:
 
 
 def save_articles(data: dict) -> None:
-    """記事データをJSONファイルに保存（軽量化済み）"""
-    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-
+    """
+    記事データを保存（軽量化済み）
+    変更前との差分だけを記事ジャーナルに追記し、記事ストアに反映する
+    articles.json の書き出しはワークフローの最後のジャーナル圧縮で1回だけ行う
+    """
     # 記事データを軽量化
     if 'articles' in data:
         data['articles'] = [clean_article_data(a) for a in data['articles']]
 
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # 【記事ジャーナル】追加・要約更新・カテゴリー変更・削除をイベントとして記録
+    events = article_journal.diff_events(article_store.get_articles(), data.get('articles', []))
+    article_journal.record_events(events)
 
-    print(f"\n保存完了: {OUTPUT_FILE}")
+    print(f"\n保存完了: 記事ジャーナルに{len(events)}件を記録（記事ストア: {article_store.count()}件）")
+    print(f"  → {OUTPUT_FILE} への書き出し: python scripts/article_journal.py compact")
 
 
 def main():
@@ -2287,15 +2685,24 @@ def main():
     print(f"理念キーワード: {', '.join(CORE_KEYWORDS[:10])}...")
     print()
 
-    # 【キャッシュ読み込み】既存の要約を再利用
-    load_summary_cache()
-
     # 【重複チェック用】既存タイトルを読み込み
     load_existing_titles()
 
+    # 【キャッシュ読み込み】既存の要約を再利用（読み込み済みの既存記事から作成）
+    load_summary_cache()
+
     # 【ブラックリスト読み込み】永久除外URLを読み込み
     load_excluded_urls()
 
+    # 【AI除外キャッシュ】過去にAIがSKIP判定した記事を読み込み
+    load_ai_rejected()
+
+    # 【条件付き取得】前回のETag / Last-Modifiedを読み込み
+    http_client.load_validator_cache()
+
+    # 【既読ウォーターマーク】フィードごとの確認済み位置を読み込み
+    load_feed_watermarks()
+
     # 【既存記事の再フィルタリング】理念に合わない既存記事を削除
     print()
     print("【0.3】既存記事の再フィルタリング...")
@@ -2307,6 +2714,9 @@ def main():
     if existing_removed > 0:
         print(f"  既存記事: {original_existing_count}件 → {len(EXISTING_ARTICLES)}件")
 
+    # 【ローカル分類器】既存記事のカテゴリーから学習（教師データが増えたときのみ再学習）
+    load_category_classifier()
+
     # 【要約リトライ】不完全な要約を持つ既存記事を再処理
     # 【廃止】リトライ機能は廃止（2026-02-12）
     # 全記事に取得時にAI要約を適用する方式に変更
@@ -2318,26 +2728,47 @@ def main():
 
     all_articles = []
 
+    # 【AI作業キュー】前回までに持ち越した新規候補（今回の収集で上限を超えた分は含めない）
+    carried_over = ai_queue.peek(kinds={"new"})
+
+    # 【近似重複】既存記事・持ち越し候補と同じ話題の別配信を収集時に検出
+    load_near_duplicate_index()
+    for item in carried_over:
+        STORIES_BY_ID[item['payload']['id']] = item['payload']
+
     # 【要約専用モード】新規収集をスキップ
     if SUMMARY_ONLY:
         print("【1】新規記事収集をスキップ（--summary-only モード）")
         print("-" * 40)
         print("  → 既存記事の要約生成に集中します")
         print()
+
+        # 【AI作業キュー】保存済み記事の作業を先に処理（残り枠は持ち越した新規候補へ）
+        print("【1.9】AI作業キュー（要約リトライ・カテゴリー再判定）...")
+        print("-" * 40)
+        process_ai_queue()
+        print()
     else:
+        # 全ソースを並列取得（解析・フィルタは以下で元の順番通りに実施）
+        print("【0.9】全ソースを並列取得中...")
+        print(f"    ★ 同時接続: 全体{FETCH_MAX_WORKERS}件 / 同一ホスト{FETCH_PER_HOST_LIMIT}件")
+        print("-" * 40)
+        prefetched = prefetch_sources(build_fetch_sources())
+        print()
+
         # RSSフィードから収集
         print("【1】RSSフィードを取得中...")
         print(f"    ★ 省エネモード: 各ソース最大{MAX_ARTICLES_PER_SOURCE}件、重複スキップ")
         print("-" * 40)
         for feed_info in RSS_FEEDS:
-            articles = fetch_rss_feed(feed_info)
+            articles = fetch_rss_feed(feed_info, prefetched)
             all_articles.extend(articles)
             print()
 
         # 文部科学省プレスリリース（RSSなし、スクレイピング）
         print("【1.5】文部科学省プレスリリースを取得中...")
         print("-" * 40)
-        mext_articles = fetch_mext_press_releases(max_articles=3)
+        mext_articles = fetch_mext_press_releases(max_articles=3, prefetched=prefetched)
         all_articles.extend(mext_articles)
         print()
 
@@ -2347,24 +2778,41 @@ def main():
 
         # 筑波大学 人間系
         print("  ■ 筑波大学 人間系")
-        tsukuba_articles = fetch_tsukuba_human_news(max_articles=2)
+        tsukuba_articles = fetch_tsukuba_human_news(max_articles=2, prefetched=prefetched)
         all_articles.extend(tsukuba_articles)
         print()
 
         # こどもとIT（スクレイピング）
-        kodomo_articles = fetch_kodomo_it_news(max_articles=3)
+        kodomo_articles = fetch_kodomo_it_news(max_articles=3, prefetched=prefetched)
         all_articles.extend(kodomo_articles)
         print()
 
-    # 【要約専用モード】新規記事がないため処理をスキップ
-    if SUMMARY_ONLY:
+    # 【AI作業キュー】前回までに持ち越した新規候補も今回の候補と同じ基準で順位付け
+    # （要約専用モードでは持ち越した候補のみ）
+    queued_scores = {}  # {URL: 待ち時間を加えた優先度}
+    for item in carried_over:
+        candidate = item['payload']
+        if is_duplicate_article(candidate['title'], candidate['url']):
+            ai_queue.remove(item['key'])  # 既に保存済み・除外済み
+            continue
+        queued_scores[candidate['url']] = round(ai_queue.get_priority(item))
+        all_articles.append(candidate)
+    if queued_scores:
+        print(f"【1.95】AI作業キューから持ち越し候補 {len(queued_scores)}件を追加")
+        print()
+
+    if not all_articles:
         print("【2】重複除去をスキップ（新規記事なし）")
         print("【3】ドメイン制限をスキップ（新規記事なし）")
         final_articles = []
     else:
-        # 重複除去（URLベース）
+        # ========================================
+        # 【二段階処理】全ソースの候補を順位付けしてから、上位だけにAI枠を使う
+        # （RSS_FEEDS の後ろのソースもAI枠を先に使い切られない）
+        # ========================================
+        # 重複除去（正規化したURLベース）
         print("【2】重複を除去中...")
-        seen_urls = set()
+        seen_urls = url_canon.UrlIndex()
         unique_articles = []
         for article in all_articles:
             if article['url'] not in seen_urls:
@@ -2372,13 +2820,13 @@ def main():
                 seen_urls.add(article['url'])
         print(f"  重複除去後: {len(unique_articles)}件")
 
-        # 【理念スコアリング】各記事にスコアを付与
+        # 【理念スコアリング】各候補にスコアを付与（AI判定前はRSSの要約で採点）
         print()
         print("【2.5】理念スコアリング...")
         print("-" * 40)
         for article in unique_articles:
-            score = calculate_relevance_score(article.get('title', ''), article.get('summary', ''))
-            article['relevance_score'] = score
+            score = calculate_relevance_score(article.get('title', ''), article.get('summary') or article.get('originalSummary', ''))
+            article['relevance_score'] = max(score, queued_scores.get(article['url'], 0))
 
         # スコア順（降順）→ 日付順（降順）でソート
         unique_articles.sort(key=lambda x: (-x.get('relevance_score', 0), x.get('date', '')), reverse=False)
@@ -2396,13 +2844,42 @@ def main():
         limited_articles = apply_domain_limit(unique_articles, MAX_ARTICLES_PER_DOMAIN)
         print(f"  制限適用後: {len(limited_articles)}件")
 
-        # 【カテゴリ多様性】1つのカテゴリが50%を超えないようにする
+        # 【カテゴリ多様性】1つのカテゴリが50%を超えないようにする（AI判定前は推定カテゴリ）
         print()
         print("【3.5】カテゴリ多様性を確保...")
         print("-" * 40)
         diverse_articles = apply_category_diversity(limited_articles, max_category_ratio=0.5)
 
+        # 【AI枠の配分】残りの枠に収まる上位の候補だけをAI判定に回す
+        print()
+        print("【3.8】上位候補のページ解析・AI判定...")
+        print("-" * 40)
+        ai_slots = max(0, MAX_AI_CALLS_PER_RUN - TOTAL_AI_CALLS_THIS_RUN) * AI_BATCH_SIZE
+        selected = []
+        unselected = []
+        for article in diverse_articles:
+            if article.get('needsAi') and not IS_DEV_MODE:
+                if ai_slots <= 0:
+                    unselected.append(article)
+                    continue
+                ai_slots -= 1
+            selected.append(article)
+        unselected.extend(a for a in unique_articles if a.get('needsAi') and a not in limited_articles)
+
+        # 【AI作業キュー】今回回せなかった候補は持ち越し、今回処理する候補はキューから除く
+        for article in selected:
+            ai_queue.remove(article['url'])
+        for article in unselected:
+            score = calculate_relevance_score(article['title'], article.get('originalSummary', ''))
+            ai_queue.push("new", article['url'], score, {k: v for k, v in article.items() if k != 'relevance_score'})
+        if unselected:
+            print(f"  [省エネ] AI枠外の候補 {len(unselected)}件はAI作業キューへ持ち越し")
+
+        diverse_articles = build_articles_from_candidates(selected)
+
         # カテゴリ比率を表示
+        print()
+        print("  カテゴリ比率:")
         category_counts = defaultdict(int)
         for article in diverse_articles:
             category_counts[article.get('category', '不明')] += 1
@@ -2415,6 +2892,13 @@ def main():
         final_articles = diverse_articles
         print(f"  今回取得: {len(final_articles)}件（既存記事との結合は後で実施）")
 
+    # 【AI作業キュー】残りの枠を保存済み記事の作業（要約リトライ・カテゴリー再判定）へ
+    if not SUMMARY_ONLY:
+        print()
+        print("【3.9】AI作業キュー（要約リトライ・カテゴリー再判定）...")
+        print("-" * 40)
+        process_ai_queue()
+
     # 【最終検証】画像URLを全チェック
     print()
     print("【4】画像URL最終検証...")
@@ -2514,6 +2998,16 @@ def main():
     # ファイルに保存
     save_articles(output_data)
 
+    # 【条件付き取得】今回のETag / Last-Modifiedを保存（記事保存が成功した後のみ）
+    http_client.save_validator_cache()
+    save_feed_watermarks()
+    save_refilter_state(merged_articles)
+    save_ai_rejected()
+    ai_cache.save_cache()
+    ai_queue.save_queue()
+    keep_saved_stories(merged_articles)
+    NEAR_DUP_INDEX.save()
+
     # 【失敗レポート】AI要約に失敗した記事を報告
     if FAILED_SUMMARIES:
         print()
@@ -2535,6 +3029,10 @@ def main():
     print(f"処理完了: 合計 {len(final_articles)}件 の記事を保存")
     print(f"AI要約成功: {ai_success_count}件 / {len(final_articles)}件")
     print(f"API呼び出し回数: {API_CALL_COUNT}回")
+    ai_cache.print_stats()
+    ai_queue.print_stats()
+    category_classifier.print_stats()
+    http_client.print_stats()
     print("=" * 60)
 
     # 【ステータス保存】status.jsonに実行状況を記録
@@ -2547,20 +3045,6 @@ def main():
     )
 
 
-def get_quota_period_start():
-    """現在のクォータ期間の開始時刻を取得（17:00 JSTでリセット）"""
-    now = datetime.now()
-    # 今日の17:00 JST
-    today_reset = now.replace(hour=17, minute=0, second=0, microsecond=0)
-
-    if now >= today_reset:
-        # 17:00以降 → 今日の17:00が期間開始
-        return today_reset
-    else:
-        # 17:00より前 → 昨日の17:00が期間開始
-        return today_reset - timedelta(days=1)
-
-
 def save_status(articles_processed: int, articles_added: int, api_calls: int, has_error: bool, error_message: str = None):
     """システムステータスをstatus.jsonに保存"""
     try:
@@ -2570,20 +3054,10 @@ def save_status(articles_processed: int, articles_added: int, api_calls: int, ha
             with open(STATUS_FILE, 'r', encoding='utf-8') as f:
                 existing_status = json.load(f)
 
-        # クォータ期間の開始時刻（17:00 JSTでリセット）
         now = datetime.now()
-        quota_period_start = get_quota_period_start()
 
-        # API使用率を計算（クォータ期間内の使用量のみ集計）
-        today_api_usage = api_calls
-        for entry in existing_status.get("history", []):
-            try:
-                entry_time = datetime.fromisoformat(entry.get("timestamp", ""))
-                # クォータ期間内のエントリのみカウント
-                if entry_time >= quota_period_start:
-                    today_api_usage += entry.get("apiCalls", 0)
-            except:
-                continue
+        # 【API使用台帳】クォータ期間内の使用量（今回の呼び出しは rate_limiter 経由で記録済み）
+        today_api_usage = quota_ledger.get_usage()["used"]
 
         api_percentage = min(100, int((today_api_usage / DAILY_API_LIMIT) * 100))
 
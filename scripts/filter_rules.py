@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+記事フィルタのルールエンジン
+キーワードリストと除外ルールをここに集約し、収集・再フィルタ・浄化の全経路で共有する
+
+- ルールは宣言的な表（RULESET_*）として定義し、上から順に評価する
+- 本文の照合はオートマトン1回の走査のみ（全リストの一致を同時に取得）
+- 判定結果は Verdict（採用/除外・決め手のルール・一致キーワード・理念スコア）で返す
+
+使用例:
+    engine = FilterEngine()
+    verdict = engine.evaluate("特別支援学級の新しい取り組み", "", url="https://...")
+    if not verdict.accepted:
+        print(verdict.label, verdict.matched)
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from keyword_matcher import KeywordMatcher
+
+
+# ========================================
+# 理念に基づくキーワードフィルタリング（厳格版）
+# ========================================
+
+# 【コア理念キーワード】これらのいずれかを含む記事のみを採用
+# インクルーシブ教育・特別支援教育・神経多様性に特化
+CORE_KEYWORDS = [
+    # インクルーシブ教育・特別支援教育
+    "インクルーシブ", "インクルーシブ教育", "特別支援", "特別支援教育",
+    "支援学級", "支援学校", "通級", "通級指導",
+    # 発達障害・神経多様性
+    "発達障害", "神経多様性", "ニューロダイバーシティ", "脳機能",
+    "学習障害", "LD", "ディスレクシア", "読み書き困難",
+    "ADHD", "注意欠如", "多動性",
+    "自閉症", "自閉スペクトラム", "ASD", "アスペルガー",
+    # ギフテッド・2e
+    "ギフテッド", "特異な才能", "2e", "二重の特別", "高IQ", "過度激動", "OE",
+    # 合理的配慮・支援
+    "合理的配慮", "個別支援", "個別の教育支援計画", "IEP",
+    "ユニバーサルデザイン", "UDL", "医療的ケア", "療育",
+    # 不登校・多様な学び
+    "不登校", "不登校支援", "フリースクール", "多様な学び", "オルタナティブ教育",
+    # 障害全般（教育文脈）
+    "障害児", "障がい児", "障害のある子", "障がいのある子",
+]
+
+# ========================================
+# 【理念スコアリング】記事の優先順位付け
+# ========================================
+
+# 高優先度キーワード（+20点）：サイトの核心テーマ
+HIGH_PRIORITY_KEYWORDS = [
+    "インクルーシブ", "インクルーシブ教育",
+    "特別支援", "特別支援教育",
+    "発達障害", "神経多様性", "ニューロダイバーシティ",
+    "ギフテッド", "2e", "特異な才能",
+    "不登校", "合理的配慮",
+]
+
+# 中優先度キーワード（+10点）：関連テーマ
+MEDIUM_PRIORITY_KEYWORDS = [
+    "支援学級", "支援学校", "通級",
+    "学習障害", "LD", "ディスレクシア",
+    "ADHD", "自閉症", "ASD",
+    "個別支援", "IEP", "療育",
+    "フリースクール", "多様な学び",
+]
+
+
+# 【強力な除外キーワード】これらを含む記事は即座に破棄（理念と無関係）
+STRONG_EXCLUDE_KEYWORDS = [
+    # 政治・情勢（サイト理念と無関係）
+    "首相", "大統領", "会談", "総選挙", "政党", "過半数", "解雇", "辞任",
+    "国会", "与党", "野党", "閣僚", "大臣", "衆議院", "参議院",
+    "ゼレンスキー", "トランプ", "バイデン", "習近平", "総理",
+    # 一般受験・倍率（競争教育）- 「入試」を単独で除外
+    "入試", "高校受験", "大学受験", "中学受験", "入試倍率", "出願状況",
+    "解答速報", "合格判定", "偏差値", "共通テスト", "センター試験",
+    "志願倍率", "確定志願", "志願状況", "募集人員", "志望校",
+    "推薦選抜", "一般選抜", "特色選抜", "公立高", "県立高", "都立高",
+    # 資格試験（教育ではなく資格取得）
+    "司法試験", "予備試験", "行政書士", "司法書士", "公認会計士",
+    "税理士試験", "弁理士試験", "社労士", "宅建", "資格試験",
+    # 塾・予備校（競争教育サービス）
+    "塾", "予備校", "進学塾", "学習塾",
+    # 一般医療・警報（教育・発達に直接関係ないもの）
+    "インフルエンザ", "警報発令", "警報再発令", "感染警報",
+    "コロナ", "ワクチン", "予防接種",
+    # 経済・株価ニュース（サイト理念と無関係）
+    "事業譲渡", "株価", "為替", "経済指標", "決算",
+    "NYダウ", "ダウ平均", "日経平均", "円相場", "ドル円", "値上がり", "値下がり",
+    "株式市場", "東証", "NASDAQ", "S&P", "日銀", "金融政策",
+    # 国際情勢・軍事（サイト理念と無関係）
+    "NATO", "ウクライナ", "ガザ", "パレスチナ", "停戦", "侵攻", "空爆",
+    "無人機", "輸出拠点", "ドローン攻撃", "ミサイル", "軍事",
+    "外務省", "外交", "領土", "紛争", "テロ", "軍",
+    # スポーツ・芸能
+    "甲子園", "高校野球", "プロ野球", "サッカー", "五輪", "オリンピック",
+    "芸能", "アイドル", "ドラマ", "映画", "俳優",
+    "ホワイトソックス", "移籍", "自主トレ", "野球", "MLB", "NPB",
+    # エンタメ・ゲーム・刺激重視コンテンツ（インクルーシブ教育の理念にそぐわない）
+    "Roblox", "ロブロックス", "ブレインロット", "Brain Rot", "brainrot",
+    "Fortnite", "フォートナイト", "Minecraft", "マインクラフト", "マイクラ",
+    "TikTok", "ティックトック", "YouTube", "ユーチューブ", "YouTuber",
+    "ゲーム実況", "eスポーツ", "バズる", "炎上", "インフルエンサー",
+]
+
+# 除外キーワード（広告・PR記事・商業記事をスキップ）
+EXCLUDE_KEYWORDS = [
+    "PR", "広告", "プレゼント", "キャンペーン", "セミナー申込",
+    "応募締切", "抽選で", "モニター募集", "スポンサー",
+    "[PR]", "【PR】", "【広告】", "[AD]",
+    # 商業・セール記事（教育と無関係）
+    "セール", "割引", "OFF", "％OFF", "%OFF", "クーポン", "お買い得",
+    "Kindle本", "タイトルセール", "ポイント還元"
+]
+
+# 有料記事URLパターン（AI判定前に弾く）
+PAID_URL_PATTERNS = [
+    "/paid/", "/member/", "/premium/", "/subscription/",
+    "/login", "?login", "/register", "/subscribe",
+    "membership", "shimbun.com", "nikkei.com/article",
+    "toyokeizai.net/articles/-/", "premium.toyokeizai"
+]
+
+# 除外ドメイン（ログイン制限等で閲覧不可）
+EXCLUDED_DOMAINS = [
+    "kyoiku.sho.jp",  # みんなの教育技術（ログイン必須）
+]
+
+# 【塾・予備校広告の事前除外キーワード】AI判定前に弾く（タイトル・要約）
+CRAM_SCHOOL_KEYWORDS = [
+    # 塾（単体キーワード）
+    "塾",
+    # 塾名・予備校名・塾関連サービス
+    "フリーステップ", "TOMAS", "トーマス", "サピックス", "SAPIX",
+    "早稲田アカデミー", "早稲アカ", "日能研", "四谷大塚", "栄光ゼミナール",
+    "河合塾", "駿台", "東進", "代ゼミ", "Z会", "進研ゼミ",
+    "明光義塾", "個別指導", "家庭教師", "スクールIE",
+    "塾探し", "塾選び", "塾比較", "塾ナビ", "学習塾", "進学塾", "予備校",
+    # 英才教育・競争系キーワード
+    "合格戦略", "合格実績", "偏差値アップ", "点数up", "点数UP",
+    "最難関", "難関突破", "志望校合格", "合格率", "合格者数",
+    "先取り学習", "飛び級", "英才教育",
+    # 講習・模試
+    "夏期講習", "冬期講習", "春期講習", "季節講習",
+    "模試申込", "模試のお知らせ", "テスト対策",
+    # 入試情報（一般）
+    "出願状況", "志願状況", "確定志願", "競争率", "実質倍率",
+    # 私立学校経営ニュース（インクルーシブ教育と無関係）
+    "事業譲渡", "学校法人", "校名変更", "統合", "合併", "経営",
+    "ヴィアトール", "洛星", "ノートルダム"
+]
+
+# 塾広告の例外キーワード（これらがあれば塾広告でも除外しない）
+CRAM_SCHOOL_EXCEPTION_KEYWORDS = [
+    "不登校", "特別支援", "発達障害", "学習障害", "ギフテッド",
+    "合理的配慮", "インクルーシブ", "通信制", "フリースクール"
+]
+
+# 細かすぎる実践情報の除外キーワード（教員向けテクニック）
+PRACTICE_EXCLUDE_KEYWORDS = [
+    "板書", "指導案", "学級開き", "学級づくり", "授業開き",
+    "ワークシート", "プリント", "時短学習", "京女式",
+    "〇年国語", "〇年算数", "小１国語", "小２国語", "小３国語",
+    "小４国語", "小５国語", "小６国語", "小1国語", "小2国語",
+    "小3国語", "小4国語", "小5国語", "小6国語",
+    "教員採用試験", "教採", "採用試験対策", "面接対策"
+]
+
+# マニアックな技術解説記事の除外キーワード
+TECH_EXCLUDE_KEYWORDS = [
+    "Scratch", "スクラッチ", "プログラミング解説", "共通テスト解説",
+    "共テ", "Vol.", "Vol.1", "Vol.2", "Vol.3", "Vol.4", "Vol.5",
+    "コーディング入門", "Python入門", "JavaScript入門"
+]
+
+# 【緩和済み】受験関連は機械的フィルタから除外し、AIによる文脈判断に委ねる
+# 明らかに理念と無関係なものだけを機械的に除外
+EXAM_EXCLUDE_KEYWORDS = [
+    "出願状況", "確定志願者", "志願状況", "募集人員",
+    "大学ランキング", "就職率ランキング", "人気ランキング",
+    "合格者数", "合格実績", "進学実績"
+]
+
+# 受験情報の例外キーワード（これらがあれば除外しない）- AI判定に移行のため縮小
+EXAM_EXCEPTION_KEYWORDS = [
+    "特別支援", "合理的配慮", "インクルーシブ", "不登校",
+    "障害", "障がい", "支援学校", "支援学級"
+]
+
+# 小規模イベント検出キーワード
+EVENT_KEYWORDS = [
+    "セミナー", "研修", "講座", "開催", "募集", "ワークショップ",
+    "オンライン講座", "参加者募集", "申込", "フォーラム"
+]
+
+# 公的機関キーワード（イベント記事の例外許可）
+PUBLIC_INSTITUTION_KEYWORDS = [
+    "文部科学省", "文科省", "OECD", "ユネスコ", "UNESCO",
+    "教育委員会", "内閣府", "厚生労働省", "総務省",
+    "国立", "都道府県", "市区町村", "自治体",
+    "東京大学", "京都大学", "大阪大学", "名古屋大学",
+    "東北大学", "九州大学", "北海道大学", "筑波大学",
+    "早稲田大学", "慶應義塾大学", "上智大学"
+]
+
+# 探究学習キーワード（支援キーワードなしの場合は除外）
+TANKYU_KEYWORDS = ["探究学習", "探究型学習", "探究活動"]
+
+# ========================================
+# 【一括キーワード照合】全リストを1つのオートマトンに集約
+# ========================================
+# - core_ci / high_priority / medium_priority は大文字・小文字を区別しない
+# - strict:<ソース名> はソース固有の strict_keywords（FilterEngine 作成時に追加）
+KEYWORD_LISTS = {
+    "core": CORE_KEYWORDS,
+    "core_ci": CORE_KEYWORDS,
+    "high_priority": HIGH_PRIORITY_KEYWORDS,
+    "medium_priority": MEDIUM_PRIORITY_KEYWORDS,
+    "strong_exclude": STRONG_EXCLUDE_KEYWORDS,
+    "exclude": EXCLUDE_KEYWORDS,
+    "tankyu": TANKYU_KEYWORDS,
+    "cram_school": CRAM_SCHOOL_KEYWORDS,
+    "cram_school_exception": CRAM_SCHOOL_EXCEPTION_KEYWORDS,
+    "practice_exclude": PRACTICE_EXCLUDE_KEYWORDS,
+    "tech_exclude": TECH_EXCLUDE_KEYWORDS,
+    "exam_exclude": EXAM_EXCLUDE_KEYWORDS,
+    "exam_exception": EXAM_EXCEPTION_KEYWORDS,
+    "event": EVENT_KEYWORDS,
+    "public_institution": PUBLIC_INSTITUTION_KEYWORDS,
+}
+CASE_INSENSITIVE_LISTS = {"core_ci", "high_priority", "medium_priority"}
+
+
+# ========================================
+# ルール定義
+# ========================================
+@dataclass(frozen=True)
+class Rule:
+    """
+    1つの除外ルール
+
+    kind:
+        "url"     : URL（小文字）に patterns のいずれかを含めば除外
+        "domain"  : ドメインに patterns のいずれかを含めば除外
+        "exclude" : keywords のリストに一致し、unless のどのリストにも一致しなければ除外
+        "require" : keywords のリストに一致しなければ除外
+        "strict"  : ソース固有の strict_keywords に一致しなければ除外（設定があるソースのみ）
+    """
+    name: str
+    label: str
+    kind: str
+    keywords: str = ""
+    unless: tuple = ()
+    patterns: tuple = ()
+    verbose: bool = False  # 除外時にログを出すか
+
+
+@dataclass
+class Verdict:
+    """フィルタの判定結果"""
+    accepted: bool
+    rule: str = ""  # 判定を決めたルール名（採用時は空）
+    label: str = ""  # ログ表示用のルール名
+    matched: list = field(default_factory=list)  # 決め手となったキーワード（採用時はコア理念キーワード）
+    score: int = 0  # 理念適合スコア
+    verbose: bool = False
+
+
+RULE_PAID_URL = Rule("paid_url", "有料記事", "url", patterns=tuple(PAID_URL_PATTERNS))
+RULE_EXCLUDED_DOMAIN = Rule("excluded_domain", "除外ドメイン", "domain", patterns=tuple(EXCLUDED_DOMAINS))
+RULE_AD = Rule("ad", "広告・PR", "exclude", keywords="exclude")
+RULE_STRONG_EXCLUDE = Rule("strong_exclude", "理念外", "exclude", keywords="strong_exclude", unless=("core",), verbose=True)
+RULE_TANKYU = Rule("tankyu", "探究学習（理念なし）", "exclude", keywords="tankyu", unless=("core",), verbose=True)
+RULE_CRAM_SCHOOL = Rule("cram_school", "塾広告", "exclude", keywords="cram_school", unless=("cram_school_exception",), verbose=True)
+RULE_PRACTICE = Rule("practice", "実践テクニック", "exclude", keywords="practice_exclude")
+RULE_TECH = Rule("tech", "技術解説", "exclude", keywords="tech_exclude")
+RULE_EXAM = Rule("exam", "一般受験情報", "exclude", keywords="exam_exclude", unless=("exam_exception",))
+RULE_SMALL_EVENT = Rule("small_event", "小規模イベント", "exclude", keywords="event", unless=("public_institution",))
+RULE_CORE = Rule("core", "コア理念不足", "require", keywords="core_ci")
+RULE_STRICT = Rule("strict", "厳格フィルタ", "strict", verbose=True)
+
+# 【RSS収集用】全ルール（AI判定前に弾く順）
+RULESET_FEED = (
+    RULE_PAID_URL,
+    RULE_EXCLUDED_DOMAIN,
+    RULE_AD,
+    RULE_STRONG_EXCLUDE,
+    RULE_TANKYU,
+    RULE_CRAM_SCHOOL,
+    RULE_PRACTICE,
+    RULE_TECH,
+    RULE_EXAM,
+    RULE_SMALL_EVENT,
+    RULE_CORE,
+    RULE_STRICT,
+)
+
+# 【基本】理念ルールのみ（スクレイピング・既存記事の再フィルタ・浄化スクリプト用）
+RULESET_BASIC = (
+    RULE_STRONG_EXCLUDE,
+    RULE_TANKYU,
+    RULE_CORE,
+)
+
+
+def calculate_relevance_score(hits: dict) -> int:
+    """
+    照合結果から記事の理念適合スコアを計算
+    - 高優先度キーワード: +20点
+    - 中優先度キーワード（高優先度と重複しないもの）: +10点
+    - その他のCORE_KEYWORDS: +5点
+    """
+    high = hits["high_priority"]
+    medium = hits["medium_priority"] - set(HIGH_PRIORITY_KEYWORDS)
+    other = hits["core_ci"] - set(HIGH_PRIORITY_KEYWORDS) - set(MEDIUM_PRIORITY_KEYWORDS)
+    return len(high) * 20 + len(medium) * 10 + len(other) * 5
+
+
+# ========================================
+# エンジン
+# ========================================
+class FilterEngine:
+    """ルール表に従って記事を判定する"""
+
+    def __init__(self, strict_keywords: dict = None):
+        """
+        Args:
+            strict_keywords: {ソース名: [キーワード, ...]} ソース固有の必須キーワード
+        """
+        lists = dict(KEYWORD_LISTS)
+        for source, keywords in (strict_keywords or {}).items():
+            if keywords:
+                lists[f"strict:{source}"] = keywords
+        self.keyword_lists = lists
+        self.matcher = KeywordMatcher(lists, case_insensitive=CASE_INSENSITIVE_LISTS)
+        # 同じ本文の再走査はキャッシュ（RSS要約と既存記事の再フィルタで同じ本文が何度も来る）
+        self._scan = lru_cache(maxsize=4096)(self.matcher.scan)
+
+    def hits(self, title: str, summary: str = "") -> dict:
+        """タイトル＋要約に対する全リストの一致キーワード"""
+        return self._scan(f"{title} {summary}")
+
+    def score(self, title: str, summary: str = "") -> int:
+        """理念適合スコア"""
+        return calculate_relevance_score(self.hits(title, summary))
+
+    def evaluate(self, title: str, summary: str = "", url: str = "", source: str = "",
+                 ruleset: tuple = RULESET_FEED, skip_core_filter: bool = False,
+                 is_manual: bool = False) -> Verdict:
+        """
+        1件を判定する
+
+        Args:
+            skip_core_filter: コア理念キーワードチェックを省略（教育専門ソース用）
+            is_manual: 手動投稿記事は常に採用
+        """
+        hits = self.hits(title, summary)
+        score = calculate_relevance_score(hits)
+
+        if is_manual:
+            return Verdict(True, rule="manual", label="手動投稿", score=score)
+
+        for rule in ruleset:
+            matched = self._apply(rule, hits, url, source, skip_core_filter)
+            if matched is not None:
+                return Verdict(False, rule=rule.name, label=rule.label, matched=matched,
+                               score=score, verbose=rule.verbose)
+
+        return Verdict(True, matched=sorted(hits["core_ci"]), score=score)
+
+    def evaluate_article(self, article: dict, ruleset: tuple = RULESET_BASIC) -> Verdict:
+        """記事データ（articles.json の1件）を判定"""
+        return self.evaluate(
+            article.get('title', ''),
+            article.get('summary', ''),
+            url=article.get('url', ''),
+            source=article.get('source', ''),
+            ruleset=ruleset,
+            is_manual=article.get('isManual', False),
+        )
+
+    def evaluate_batch(self, articles: list, ruleset: tuple = RULESET_BASIC) -> list:
+        """記事データのリストをまとめて判定（入力と同じ順の Verdict リスト）"""
+        return [self.evaluate_article(article, ruleset) for article in articles]
+
+    def ruleset_hash(self, ruleset: tuple = RULESET_BASIC) -> str:
+        """
+        ルール表と参照するキーワードリストのハッシュ
+        キーワードやルールを変更すると値が変わる（既存記事の再フィルタ要否の判定に使用）
+        """
+        list_names = set()
+        for rule in ruleset:
+            if rule.keywords:
+                list_names.add(rule.keywords)
+            list_names.update(rule.unless)
+            if rule.kind == "strict":
+                list_names.update(name for name in self.keyword_lists if name.startswith("strict:"))
+        if any(rule.kind == "require" for rule in ruleset):
+            list_names.add("core_ci")  # 採用時の matched に使用
+
+        payload = {
+            "rules": [asdict(rule) for rule in ruleset],
+            "lists": {name: self.keyword_lists[name] for name in sorted(list_names)},
+        }
+        encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        return hashlib.md5(encoded).hexdigest()[:12]
+
+    def _apply(self, rule: Rule, hits: dict, url: str, source: str, skip_core_filter: bool):
+        """ルールに該当すれば決め手のキーワード（リスト）を、該当しなければNoneを返す"""
+        if rule.kind == "url":
+            url_lower = url.lower()
+            matched = [p for p in rule.patterns if p in url_lower]
+            return matched or None
+
+        if rule.kind == "domain":
+            domain = get_domain(url)
+            matched = [d for d in rule.patterns if d in domain]
+            return matched or None
+
+        if rule.kind == "exclude":
+            found = hits[rule.keywords]
+            if not found or any(hits[name] for name in rule.unless):
+                return None
+            return sorted(found)
+
+        if rule.kind == "require":
+            if rule.name == "core" and skip_core_filter:
+                return None
+            return None if hits[rule.keywords] else []
+
+        if rule.kind == "strict":
+            list_name = f"strict:{source}"
+            if list_name not in self.keyword_lists:
+                return None
+            return None if hits[list_name] else []
+
+        raise ValueError(f"未知のルール種別: {rule.kind}")
+
+
+def get_domain(url: str) -> str:
+    """URLからドメインを取得"""
+    try:
+        return urlparse(url).netloc.lower()
+    except Exception:
+        return ""
@@ -13,6 +13,8 @@ from datetime import datetime
 sys.stdout.reconfigure(encoding='utf-8')
 from dotenv import load_dotenv
 from google import genai
+import article_store
+import rate_limiter
 
 # .env.local から環境変数を読み込む
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env.local'))
@@ -28,14 +30,10 @@ client = genai.Client(api_key=api_key)
 
 # パス設定
 base_dir = os.path.dirname(__file__)
-articles_path = os.path.join(base_dir, '..', 'public', 'data', 'articles.json')
 output_path = os.path.join(base_dir, '..', 'public', 'data', 'ai-picks.json')
 
-# articles.json を読み込む
-with open(articles_path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
-
-articles = data.get('articles', [])
+# 記事を読み込む（記事ストア: articles.json と同じ日付の新しい順）
+articles = article_store.get_articles()
 print(f"読み込んだ記事数: {len(articles)}件")
 print("-" * 50)
 
@@ -98,6 +96,11 @@ prompt = f"""あなたは「インクルーシブ教育ナビ」の編集長で
 print("Gemini APIに問い合わせ中...")
 print("-" * 50)
 
+# 【レート制限】定時実行・手動投稿と同じ枠を共有（RPMの枠が空くまで待つ）
+if not rate_limiter.acquire("編集部ピックアップ"):
+    print("本日のAPI枠がないため、既存のai-picks.jsonを維持します")
+    exit(0)
+
 # Gemini APIに問い合わせ（エラーハンドリング付き）
 try:
     response = client.models.generate_content(
@@ -12,11 +12,12 @@
 
 import os
 import sys
-import json
 from datetime import datetime
 from xml.etree.ElementTree import Element, SubElement, tostring
 from xml.dom import minidom
 
+import article_store
+
 # Windows環境での文字化け対策
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -25,7 +26,6 @@ if sys.platform == 'win32':
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 OUTPUT_FILE = os.path.join(PROJECT_ROOT, "public", "sitemap.xml")
-ARTICLES_FILE = os.path.join(PROJECT_ROOT, "public", "data", "articles.json")
 
 # サイト設定
 SITE_URL = "https://news-navi.jp/inclusive"
@@ -52,16 +52,13 @@ STATIC_PAGES = [
 
 
 def get_last_modified():
-    """最終更新日を取得（articles.jsonの更新日時）"""
+    """最終更新日を取得（articles.jsonの更新日時・記事ストアに記録済み）"""
     try:
-        if os.path.exists(ARTICLES_FILE):
-            with open(ARTICLES_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                last_updated = data.get('lastUpdated')
-                if last_updated:
-                    # ISO形式をW3C形式に変換
-                    dt = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
-                    return dt.strftime('%Y-%m-%d')
+        last_updated = article_store.get_last_updated()
+        if last_updated:
+            # ISO形式をW3C形式に変換
+            dt = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
+            return dt.strftime('%Y-%m-%d')
     except Exception as e:
         print(f"警告: 最終更新日取得エラー - {e}")
 
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共通HTTPクライアント
+全スクリプトの外部取得をこのモジュール経由に統一する
+
+- 接続プール: ホストごとにKeep-Alive接続を再利用（TCP+TLSハンドシェイクを毎回行わない）
+- ヘッダープロファイル: 用途・ドメインごとのリクエストヘッダー（朝日新聞のブラウザ模倣など）
+- リトライ・タイムアウト: 一時的なサーバーエラーは自動で再試行
+- 条件付き取得: ETag / Last-Modified を保存し、変更がなければ 304 を受け取る
+- 計測: リクエスト数・受信バイト数・所要時間をホスト別に集計
+"""
+
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from state_store import load_state, save_state
+
+# ========================================
+# 設定
+# ========================================
+DEFAULT_TIMEOUT = 15  # 秒
+HTTP_RETRIES = 2  # 接続エラー・5xx時の再試行回数
+HTTP_BACKOFF_FACTOR = 0.5  # 再試行の待機（0.5秒, 1秒, ...）
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+POOL_CONNECTIONS = 16  # 保持するホスト別プール数
+POOL_MAXSIZE = 4  # 1ホストあたりの保持接続数
+
+# 【ヘッダープロファイル】
+HEADER_PROFILES = {
+    # RSSフィード・一覧ページ取得用（従来の最小ヘッダー）
+    "feed": {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    },
+    # 記事ページ取得用
+    "page": {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'ja,en-US;q=0.7,en;q=0.3',
+    },
+    # 【朝日新聞対策】より本格的なブラウザを模倣
+    "asahi": {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'ja-JP,ja;q=0.9,en-US;q=0.8,en;q=0.7',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Cache-Control': 'no-cache',
+        'Pragma': 'no-cache',
+        'Sec-Ch-Ua': '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
+        'Sec-Ch-Ua-Mobile': '?0',
+        'Sec-Ch-Ua-Platform': '"Windows"',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'Upgrade-Insecure-Requests': '1',
+    },
+}
+
+# 記事ページ取得時にドメイン専用プロファイルへ切り替える
+DOMAIN_PROFILES = {
+    "asahi.com": "asahi",
+}
+
+# 【条件付き取得】ETag / Last-Modified の保存先（data/ 配下）
+VALIDATOR_CACHE_FILE = "http-cache.json"
+VALIDATORS = {}  # {URL: {"etag": ..., "lastModified": ..., "checkedAt": ...}}
+
+_session = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_validators_lock = threading.Lock()
+
+# 【計測】ホスト別の集計
+STATS = defaultdict(lambda: {"requests": 0, "bytes": 0, "seconds": 0.0, "notModified": 0, "errors": 0})
+
+
+def get_session() -> requests.Session:
+    """共有セッションを取得（初回のみ作成、スレッド間で共有）"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=HTTP_RETRIES,
+                connect=HTTP_RETRIES,
+                read=HTTP_RETRIES,
+                status=HTTP_RETRIES,
+                backoff_factor=HTTP_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_host(url: str) -> str:
+    """URLからホスト名を取得"""
+    try:
+        return urlparse(url).netloc.lower()
+    except Exception:
+        return ""
+
+
+def resolve_headers(url: str, profile: str = "page") -> dict:
+    """プロファイル名とドメインからリクエストヘッダーを決定"""
+    if profile == "page":
+        host = get_host(url)
+        for domain, domain_profile in DOMAIN_PROFILES.items():
+            if domain in host:
+                profile = domain_profile
+                break
+    return dict(HEADER_PROFILES.get(profile, HEADER_PROFILES["page"]))
+
+
+def get(url: str, timeout: int = DEFAULT_TIMEOUT, profile: str = "page", conditional: bool = False, headers: dict = None) -> requests.Response:
+    """
+    GETリクエストを送信（プール済み接続を再利用）
+
+    Args:
+        profile: ヘッダープロファイル名（"feed" / "page" / "asahi"）
+        conditional: Trueなら保存済みの検証子で条件付き取得し、応答の検証子を記録
+        headers: 追加・上書きするヘッダー
+
+    ステータスコードの検査は呼び出し側で行う（raise_for_status など）
+    """
+    request_headers = resolve_headers(url, profile)
+    if conditional:
+        request_headers.update(build_conditional_headers(url))
+    if headers:
+        request_headers.update(headers)
+
+    host = get_host(url)
+    started = time.time()
+    try:
+        response = get_session().get(url, headers=request_headers, timeout=timeout, allow_redirects=True)
+    except Exception:
+        record_stats(host, 0, time.time() - started, error=True)
+        raise
+
+    size = len(response.content) if response.status_code != 304 else 0
+    record_stats(host, size, time.time() - started, not_modified=response.status_code == 304)
+
+    if conditional and response.ok:
+        remember_validators(url, response)
+    return response
+
+
+# ========================================
+# 条件付き取得（ETag / Last-Modified）
+# ========================================
+def load_validator_cache():
+    """前回実行時のETag / Last-Modifiedを読み込む"""
+    global VALIDATORS
+    VALIDATORS = load_state(VALIDATOR_CACHE_FILE, {}) or {}
+    if VALIDATORS:
+        print(f"✓ 条件付き取得キャッシュ読み込み: {len(VALIDATORS)}件")
+
+
+def save_validator_cache():
+    """ETag / Last-Modifiedを保存"""
+    with _validators_lock:
+        save_state(VALIDATOR_CACHE_FILE, VALIDATORS)
+
+
+def build_conditional_headers(url: str) -> dict:
+    """保存済みの検証子から If-None-Match / If-Modified-Since ヘッダーを作成"""
+    headers = {}
+    with _validators_lock:
+        validators = VALIDATORS.get(url, {})
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('lastModified'):
+        headers['If-Modified-Since'] = validators['lastModified']
+    return headers
+
+
+def remember_validators(url: str, response) -> None:
+    """200応答のETag / Last-Modifiedを記録（304の場合は確認日時のみ更新）"""
+    with _validators_lock:
+        if response.status_code == 304:
+            if url in VALIDATORS:
+                VALIDATORS[url]['checkedAt'] = datetime.now().isoformat()
+            return
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            VALIDATORS[url] = {
+                "etag": etag,
+                "lastModified": last_modified,
+                "checkedAt": datetime.now().isoformat()
+            }
+        else:
+            VALIDATORS.pop(url, None)
+
+
+def forget_validators(url: str) -> None:
+    """
+    検証子を破棄して次回は全文取得させる
+    件数上限などで途中までしか処理できなかったソースに使用（304で残りの記事を取りこぼさないため）
+    """
+    with _validators_lock:
+        VALIDATORS.pop(url, None)
+
+
+def is_not_modified(response) -> bool:
+    """前回から変更なし（304）かどうか"""
+    return response.status_code == 304
+
+
+# ========================================
+# 計測
+# ========================================
+def record_stats(host: str, size: int, seconds: float, not_modified: bool = False, error: bool = False) -> None:
+    """ホスト別の通信量・所要時間を加算"""
+    with _stats_lock:
+        entry = STATS[host]
+        entry["requests"] += 1
+        entry["bytes"] += size
+        entry["seconds"] += seconds
+        if not_modified:
+            entry["notModified"] += 1
+        if error:
+            entry["errors"] += 1
+
+
+def print_stats() -> None:
+    """通信量の集計を表示"""
+    with _stats_lock:
+        items = sorted(STATS.items(), key=lambda x: -x[1]["bytes"])
+    if not items:
+        return
+
+    total_requests = sum(s["requests"] for _, s in items)
+    total_bytes = sum(s["bytes"] for _, s in items)
+    total_seconds = sum(s["seconds"] for _, s in items)
+    print(f"  HTTP: {total_requests}リクエスト / {total_bytes / 1024:.1f}KB / 累計{total_seconds:.1f}秒")
+    for host, s in items:
+        print(f"    {host}: {s['requests']}件 {s['bytes'] / 1024:.1f}KB {s['seconds']:.1f}秒"
+              f"（304: {s['notModified']}件 / エラー: {s['errors']}件）")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+複数キーワードリストの一括照合（Aho-Corasick法）
+
+全リストのキーワードを1つのオートマトンにまとめ、本文を1回走査するだけで
+「どのリストのどのキーワードが含まれるか」をまとめて返す。
+リストごとに大文字・小文字を区別するかを指定できる。
+
+使用例:
+    matcher = KeywordMatcher({"core": ["特別支援", "LD"], "exclude": ["PR"]},
+                             case_insensitive={"core"})
+    hits = matcher.scan("特別支援のPR記事")
+    # => {"core": {"特別支援"}, "exclude": {"PR"}}
+"""
+
+from collections import deque
+
+
+def fold_case(text: str) -> str:
+    """
+    小文字化（文字数を変えない）
+    一致位置を元の文字列と対応させるため、小文字化で文字数が変わる文字はそのまま残す
+    """
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class KeywordMatcher:
+    """複数のキーワードリストを1回の走査で照合するオートマトン"""
+
+    def __init__(self, keyword_lists: dict, case_insensitive=()):
+        """
+        Args:
+            keyword_lists: {リスト名: [キーワード, ...]}
+            case_insensitive: 大文字・小文字を区別しないリスト名の集合
+        """
+        self.list_names = list(keyword_lists.keys())
+        self.case_insensitive = set(case_insensitive)
+
+        # ノードごとの遷移・失敗リンク・出力（[(リスト名, キーワード, 長さ)]）
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for list_name, keywords in keyword_lists.items():
+            for keyword in keywords:
+                if keyword:
+                    self._add(fold_case(keyword), (list_name, keyword, len(keyword)))
+        self._build_fail_links()
+
+    def _add(self, pattern: str, output: tuple) -> None:
+        """トライ木にパターンを追加"""
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        if output not in self._output[node]:
+            self._output[node].append(output)
+
+    def _build_fail_links(self) -> None:
+        """幅優先で失敗リンクを張り、失敗先の出力を引き継ぐ"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def scan(self, text: str) -> dict:
+        """
+        本文を1回走査し、リストごとに一致したキーワードを返す
+
+        Returns:
+            {リスト名: 一致したキーワードのset}（一致なしのリストは空set）
+        """
+        hits = {name: set() for name in self.list_names}
+        if not text:
+            return hits
+
+        folded = fold_case(text)
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+        for i, char in enumerate(folded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not output[node]:
+                continue
+            for list_name, keyword, length in output[node]:
+                if list_name in self.case_insensitive:
+                    hits[list_name].add(keyword)
+                elif text[i - length + 1:i + 1] == keyword:
+                    hits[list_name].add(keyword)
+        return hits
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ローカル要約（ネットワーク・APIを使わない暫定の要約）
+AI要約が失敗した・枠がないときに【要約準備中】の代わりに使う
+
+- ページ取得時に手元にある og:description と本文から文を取り出し、
+  理念キーワード・タイトルとの重なりで順位付けして上位の文を選ぶ
+- 選んだ文は です・ます調 に書き換え、150文字以内の完結した文にする
+- リード文（description の1文目）は避けられる場合は避ける（【著作権保護】丸写しを減らす）
+- 生成した要約は記事の summarySource を "local" にして保存し、
+  AI作業キュー（retry）で後からAI要約に置き換える
+
+使用例:
+    summary = local_summarizer.summarize(title, description, body_text)
+    if summary:
+        article["summary"] = summary
+        article["summarySource"] = local_summarizer.SUMMARY_SOURCE
+"""
+
+import re
+import unicodedata
+
+from filter_rules import CORE_KEYWORDS, HIGH_PRIORITY_KEYWORDS
+
+SUMMARY_SOURCE = "local"
+MAX_SUMMARY_LENGTH = 150
+MIN_SENTENCE_LENGTH = 15
+MAX_SENTENCE_LENGTH = 110
+
+# 要約に使わない文（サイトの定型文・誘導文）
+NOISE_PATTERNS = [
+    "http", "copyright", "©", "クリック", "詳しくは", "続きを読む", "会員登録",
+    "ログイン", "無断転載", "お問い合わせ", "ページ", "関連記事", "記事一覧",
+]
+
+# すでに です・ます調 の文末（書き換えない）
+POLITE_FORMS = ("ます", "ました", "ません", "です", "でした", "でしょう", "ましょう", "ください")
+
+# 文末の書き換え（常体 → です・ます調）。長いものから順に、最初に一致したものを使う
+POLITE_ENDINGS = sorted([
+    ("である", "です"),
+    ("ではない", "ではありません"),
+    ("だった", "でした"),
+    ("した", "しました"),
+    ("している", "しています"),
+    ("していく", "していきます"),
+    ("される", "されます"),
+    ("された", "されました"),
+    ("できる", "できます"),
+    ("できない", "できません"),
+    ("ている", "ています"),
+    ("てきた", "てきました"),
+    ("する", "します"),
+    ("なる", "なります"),
+    ("なった", "なりました"),
+    ("ある", "あります"),
+    ("いる", "います"),
+    ("んだ", "んだそうです"),  # 学んだ・進んだ など（動詞の過去形）
+    ("いだ", "いだそうです"),  # 急いだ など
+    ("だ", "です"),
+], key=lambda pair: -len(pair[0]))
+
+
+def _normalize(text: str) -> str:
+    """全角英数を半角に、連続空白を1つに"""
+    text = unicodedata.normalize('NFKC', text or '')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def split_sentences(text: str) -> list:
+    """文に分割（「。」「！」「？」で区切る。括弧付きのタグ・途中で切れた文は除く）"""
+    text = re.sub(r'【[^】]{0,20}】|\[[^\]]{0,20}\]', '', _normalize(text))
+    sentences = []
+    for sentence in re.split(r'(?<=[。!?])', text):
+        sentence = sentence.strip()
+        if sentence.endswith(('。', '!', '?')):
+            sentences.append(sentence)
+    return sentences
+
+
+def to_polite(sentence: str) -> str:
+    """文末を です・ます調 に書き換え"""
+    body = sentence.rstrip('。!? ')
+    if body.endswith(POLITE_FORMS):
+        return body + "。"
+    for plain, polite in POLITE_ENDINGS:
+        if body.endswith(plain):
+            return body[:len(body) - len(plain)] + polite + "。"
+    # 名詞止め・その他の文末は伝聞の形にする
+    return body + "とのことです。"
+
+
+def _bigrams(text: str) -> set:
+    text = re.sub(r'\s+', '', text)
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def score_sentence(sentence: str, title_bigrams: set, position: int) -> float:
+    """文の重要度（理念キーワード・タイトルとの重なり・位置）"""
+    lowered = sentence.lower()
+    score = 0.0
+    score += sum(3 for kw in HIGH_PRIORITY_KEYWORDS if kw.lower() in lowered)
+    score += sum(1 for kw in CORE_KEYWORDS if kw.lower() in lowered)
+    if title_bigrams:
+        score += 10 * len(_bigrams(sentence) & title_bigrams) / len(title_bigrams)
+    score += max(0, 3 - position) * 0.5  # 冒頭に近い文を少し優先
+    return score
+
+
+def summarize(title: str, description: str = "", body_text: str = "") -> str:
+    """
+    暫定の要約を作成
+    Returns:
+        です・ます調の要約（150文字以内）。使える文がなければ空文字
+    """
+    candidates = []  # [(出現順, 文)]
+    seen = set()
+    for sentence in split_sentences(description) + split_sentences(body_text):
+        if sentence in seen or not MIN_SENTENCE_LENGTH <= len(sentence) <= MAX_SENTENCE_LENGTH:
+            continue
+        if any(pattern in sentence.lower() for pattern in NOISE_PATTERNS):
+            continue
+        seen.add(sentence)
+        candidates.append((len(candidates), sentence))
+
+    if not candidates:
+        return ""
+
+    # 【著作権保護】リード文は他に候補があれば使わない
+    if len(candidates) > 1:
+        candidates = candidates[1:]
+
+    title_bigrams = _bigrams(_normalize(title))
+    ranked = sorted(candidates, key=lambda c: score_sentence(c[1], title_bigrams, c[0]), reverse=True)
+
+    # 上位の文から150文字に収まるだけ選び、元の順に並べる
+    chosen = []
+    length = 0
+    for position, sentence in ranked:
+        polite = to_polite(sentence)
+        if length + len(polite) > MAX_SUMMARY_LENGTH:
+            continue
+        chosen.append((position, polite))
+        length += len(polite)
+        if len(chosen) >= 2:
+            break
+
+    return "".join(polite for _, polite in sorted(chosen))
@@ -15,12 +15,18 @@ import sys
 import json
 import hashlib
 import argparse
-import requests
 from datetime import datetime, timedelta
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 import tweepy
+import ai_cache
+import article_journal
+import article_store
+import http_client
+import local_summarizer
+import rate_limiter
+import url_canon
 
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -30,7 +36,6 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env.loca
 # パス設定
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-ARTICLES_FILE = os.path.join(PROJECT_ROOT, "public", "data", "articles.json")
 MANUAL_FILE = os.path.join(PROJECT_ROOT, "public", "data", "manual-articles.json")
 AI_PICKS_FILE = os.path.join(PROJECT_ROOT, "public", "data", "ai-picks.json")
 POSTED_FILE = os.path.join(PROJECT_ROOT, "public", "data", "posted-tweets.json")
@@ -44,6 +49,8 @@ ARTICLE_RETENTION_DAYS = 7
 
 # Gemini API初期化
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_MODEL = "gemini-2.5-flash"
+PROMPT_VERSION = "manual-summary-v1"  # 【AI応答キャッシュ】プロンプトを変更したら上げる
 gemini_client = None
 
 if GEMINI_API_KEY:
@@ -80,20 +87,15 @@ def save_json(filepath, data):
 
 
 def is_url_exists(url):
-    """URLが既存記事に存在するかチェック"""
-    # articles.json をチェック
-    articles_data = load_json(ARTICLES_FILE)
-    if articles_data:
-        for article in articles_data.get('articles', []):
-            if article.get('url', '').strip() == url.strip():
-                return True
-
-    # manual-articles.json をチェック
+    """URLが既存記事に存在するかチェック（正規化したURLで照合）"""
+    # articles.json の記事（記事ストアの索引で照合）
+    if article_store.has_url(url):
+        return True
+
+    # manual-articles.json の記事
     manual_data = load_json(MANUAL_FILE)
     if manual_data:
-        for article in manual_data.get('articles', []):
-            if article.get('url', '').strip() == url.strip():
-                return True
+        return url in url_canon.UrlIndex(a.get('url', '') for a in manual_data.get('articles', []))
 
     return False
 
@@ -101,10 +103,7 @@ def is_url_exists(url):
 def fetch_article_content(url):
     """URLから記事内容を取得"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_client.get(url, timeout=15, profile="page")
         response.raise_for_status()
 
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -163,6 +162,14 @@ def fetch_article_content(url):
 
 def generate_ai_summary(title, description, body_text, source):
     """Gemini AIで要約を生成"""
+    # 【AI応答キャッシュ】同じ記事の再投稿・削除後の再追加はAPIを使わない
+    cache_key = ai_cache.make_key(GEMINI_MODEL, PROMPT_VERSION, title, description, body_text[:1000])
+    cached = ai_cache.get(cache_key)
+    if cached and cached.get('result'):
+        print("✓ AI応答キャッシュを再利用（API呼び出しなし）")
+        result = cached['result']
+        return result.get('summary', ''), result.get('category', 'ICT・教材'), result.get('mainKeyword', '')
+
     if not gemini_client:
         return None, None
 
@@ -188,9 +195,14 @@ def generate_ai_summary(title, description, body_text, source):
 }}
 ```"""
 
+    # 【レート制限】定時実行と同じ枠を共有（RPMの枠が空くまで待つ）
+    if not rate_limiter.acquire("手動投稿"):
+        print("警告: 本日のAPI枠がないためAI要約をスキップ")
+        return None, None, None
+
     try:
         response = gemini_client.models.generate_content(
-            model="gemini-2.5-flash",
+            model=GEMINI_MODEL,
             contents=prompt
         )
         response_text = response.text
@@ -204,6 +216,9 @@ def generate_ai_summary(title, description, body_text, source):
             json_str = response_text.strip()
 
         result = json.loads(json_str)
+        if result.get('summary'):
+            ai_cache.put(cache_key, response_text, result, GEMINI_MODEL, PROMPT_VERSION)
+            ai_cache.save_cache()
         return result.get('summary', ''), result.get('category', 'ICT・教材'), result.get('mainKeyword', '')
 
     except Exception as e:
@@ -240,9 +255,16 @@ def add_manual_article(url):
         content['source']
     )
 
+    summary_source = "ai"
+    category_source = "ai"  # ai: Geminiの判定（ローカル分類器の教師データになる）
     if not summary:
-        summary = content['description'][:150] if content['description'] else "【要約準備中】この記事の要約は現在準備中です。"
+        # 【ローカル要約】AIが使えない場合は取得した文から暫定の要約を作成
+        summary = local_summarizer.summarize(content['title'], content['description'], content['body_text'])
+        summary_source = local_summarizer.SUMMARY_SOURCE if summary else ""
+        if not summary:
+            summary = content['description'][:150] if content['description'] else "【要約準備中】この記事の要約は現在準備中です。"
         category = "ICT・教材"
+        category_source = ""  # 既定のカテゴリー（教師データにしない）
         main_keyword = ""
 
     print(f"要約: {summary[:50]}...")
@@ -271,6 +293,8 @@ def add_manual_article(url):
         "imageUrl": image_url,
         "source": content['source'],
         "mainKeyword": main_keyword or "",
+        "summarySource": summary_source,
+        "categorySource": category_source,
         "isManual": True,
         "addedAt": datetime.now().isoformat(),
         "expiresAt": (datetime.now() + timedelta(days=ARTICLE_RETENTION_DAYS)).isoformat()
@@ -297,22 +321,14 @@ def add_manual_article(url):
 
 def add_to_main_articles(manual_article):
     """手動記事をarticles.jsonの先頭に追加（メイン記事一覧に表示）"""
-    articles_data = load_json(ARTICLES_FILE)
-    if not articles_data:
-        articles_data = {"articles": [], "lastUpdated": None}
-
     # 重複チェック（既に存在する場合はスキップ）
-    existing_urls = {a.get('url', '') for a in articles_data.get('articles', [])}
-    if manual_article['url'] in existing_urls:
+    if article_store.has_url(manual_article['url']):
         print("  → articles.json に既に存在するためスキップ")
         return
 
-    # 先頭に追加
-    articles_data['articles'].insert(0, manual_article)
-    articles_data['lastUpdated'] = datetime.now().isoformat()
-
-    if save_json(ARTICLES_FILE, articles_data):
-        print(f"✓ articles.json に追加しました（メイン一覧に表示されます）")
+    # 【記事ジャーナル】1行追記（同じ日付の記事より先に並ぶ。articles.json にはワークフローの最後の圧縮で反映）
+    article_journal.record("add", article=manual_article)
+    print(f"✓ articles.json に追加しました（メイン一覧に表示されます）")
 
 
 def update_ai_picks_with_manual(manual_article):
@@ -398,7 +414,7 @@ def post_to_x(article):
         print(f"✓ Xに投稿しました: https://twitter.com/i/status/{response.data['id']}")
 
         # 投稿済みIDを記録
-        save_posted_id(article_id)
+        save_posted_id(article_id, article.get('url', ''))
         return True
 
     except tweepy.TweepyException as e:
@@ -406,15 +422,18 @@ def post_to_x(article):
         return False
 
 
-def save_posted_id(article_id):
-    """投稿済み記事IDを保存"""
+def save_posted_id(article_id, url=""):
+    """投稿済み記事IDを保存（URLは正規化して記録し、別IDの同じ記事の再投稿を防ぐ）"""
     posted_data = load_json(POSTED_FILE) or {"posted_ids": []}
     posted_ids = posted_data.get("posted_ids", [])
+    posted_urls = posted_data.get("posted_urls", [])
 
     if article_id not in posted_ids:
         posted_ids.append(article_id)
         # 最新500件のみ保持
         posted_data["posted_ids"] = posted_ids[-500:]
+        if url and url not in url_canon.UrlIndex(posted_urls):
+            posted_data["posted_urls"] = (posted_urls + [url_canon.canonicalize(url)])[-500:]
         save_json(POSTED_FILE, posted_data)
 
 
@@ -470,18 +489,12 @@ def refill_ai_picks(deleted_article_id):
 
     # 5件未満なら自動記事から補填
     if len(picks_data['picks']) < 5:
-        articles_data = load_json(ARTICLES_FILE)
-        if articles_data:
+        # 日付順の記事（記事ストアから取得）から補填
+        sorted_articles = article_store.get_articles()
+        if sorted_articles:
             # 既にピックに含まれている記事IDを取得
             picked_ids = {p.get('sourceArticleId') for p in picks_data['picks']}
 
-            # 日付順でソートした記事から補填
-            sorted_articles = sorted(
-                articles_data.get('articles', []),
-                key=lambda x: x.get('date', ''),
-                reverse=True
-            )
-
             for article in sorted_articles:
                 if len(picks_data['picks']) >= 5:
                     break
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+同じニュースの別配信（近似重複）の検出（MinHash + LSH）
+PR TIMES・リセマム・ICT教育ニュースなどが同じプレスリリースを配信した場合に、
+ページ解析・AI判定の前に「既にある記事と同じ話題」と判定する
+
+- 特徴: タイトル + 概要の冒頭の文字3-gram（全角半角・記号・空白の違いは無視）
+- MinHash署名（NUM_PERM個）を ROWS 個ずつの帯に分け、帯ごとのバケットで候補を絞る
+  → 全記事と比較せず、同じバケットに入った記事だけ類似度を推定する
+- 状態は data/near-duplicate-index.json（署名は16進文字列で保存、バケットは読み込み時に再構築）
+
+使用例:
+    index = NearDuplicateIndex.load()
+    match = index.find(title, description, source)
+    if match:
+        article_id, similarity = match
+    else:
+        index.add(article_id, title, description, url, source)
+    index.save()
+"""
+
+import re
+import unicodedata
+import zlib
+from datetime import datetime, timedelta
+
+from state_store import load_state, save_state
+
+INDEX_FILE = "near-duplicate-index.json"
+
+SHINGLE_SIZE = 3
+DESCRIPTION_CHARS = 80  # 概要は冒頭のみ（配信元ごとの書き足しで類似度が下がらないように）
+NUM_PERM = 64
+ROWS = 3  # 1帯あたりの行数（類似度0.5で約94%、0.05で約0.3%が候補に入る）
+BANDS = NUM_PERM // ROWS
+SAME_STORY_THRESHOLD = 0.5  # 推定類似度がこれ以上なら同じ話題
+SAME_SOURCE_THRESHOLD = 0.8  # 同じソース同士は連載・定例発表の別の回を誤検出しないよう厳しく
+ENTRY_TTL_DAYS = 60
+MAX_ENTRIES = 6000
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+_MAX_HASH = (1 << 32) - 1
+_BIN_BITS = NUM_PERM.bit_length() - 1
+
+
+def shingles(title: str, description: str = "") -> set:
+    """タイトル + 概要の冒頭の文字n-gram（ハッシュ値）"""
+    def normalize(text):
+        text = unicodedata.normalize('NFKC', text or '').lower()
+        return re.sub(r'[\s\W_]+', '', text)
+
+    text = normalize(title) + normalize(description)[:DESCRIPTION_CHARS]
+    if len(text) < SHINGLE_SIZE:
+        return {zlib.crc32(text.encode('utf-8'))} if text else set()
+    return {zlib.crc32(text[i:i + SHINGLE_SIZE].encode('utf-8')) for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_hashes: set) -> list:
+    """
+    MinHash署名（1回のハッシュを NUM_PERM 個の区画に振り分ける方式）
+    n-gramごとにハッシュを1回だけ計算するため、NUM_PERM 回計算する方式より速い
+    （空の区画は右隣の区画の値で埋める）
+    """
+    signature = [None] * NUM_PERM
+    for x in shingle_hashes:
+        h = (x * _GOLDEN) & _MASK64
+        slot = h >> (64 - _BIN_BITS)
+        value = (h >> 16) & _MAX_HASH
+        if signature[slot] is None or value < signature[slot]:
+            signature[slot] = value
+    if all(v is None for v in signature):
+        return [_MAX_HASH] * NUM_PERM
+    filled = []
+    for i, value in enumerate(signature):
+        offset = 0
+        while value is None:
+            offset += 1
+            value = signature[(i + offset) % NUM_PERM]
+        filled.append((value + offset * _GOLDEN) & _MAX_HASH if offset else value)
+    return filled
+
+
+def similarity(sig1: list, sig2: list) -> float:
+    """署名の一致率（ジャカード係数の推定値）"""
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / NUM_PERM
+
+
+def _band_keys(signature: list) -> list:
+    return [f"{band}:" + "-".join(str(v) for v in signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+def _encode(signature: list) -> str:
+    return "".join(f"{v:08x}" for v in signature)
+
+
+def _decode(text: str) -> list:
+    return [int(text[i:i + 8], 16) for i in range(0, len(text), 8)]
+
+
+class NearDuplicateIndex:
+    """記事ごとのMinHash署名とLSHバケット"""
+
+    def __init__(self, entries: dict = None):
+        """
+        Args:
+            entries: {記事ID: {"sig": 署名(16進), "url", "source", "addedAt"}}
+        """
+        self.entries = {}
+        self.signatures = {}
+        self.buckets = {}
+        self.dirty = False
+        for article_id, entry in (entries or {}).items():
+            self._insert(article_id, entry, _decode(entry["sig"]))
+
+    @classmethod
+    def load(cls) -> "NearDuplicateIndex":
+        """保存済みの索引を読み込む（期限切れの記事は除く）"""
+        data = load_state(INDEX_FILE, {}) or {}
+        cutoff = (datetime.now() - timedelta(days=ENTRY_TTL_DAYS)).isoformat()
+        entries = {k: v for k, v in data.items() if v.get("addedAt", "") >= cutoff and v.get("sig")}
+        index = cls(entries)
+        index.dirty = len(entries) != len(data)
+        return index
+
+    def save(self) -> None:
+        """変更があれば保存（上限を超えたら古い記事から除く）"""
+        if not self.dirty:
+            return
+        if len(self.entries) > MAX_ENTRIES:
+            for article_id in sorted(self.entries, key=lambda k: self.entries[k].get("addedAt", ""))[:len(self.entries) - MAX_ENTRIES]:
+                self.remove(article_id)
+        save_state(INDEX_FILE, self.entries)
+        self.dirty = False
+
+    def __contains__(self, article_id: str) -> bool:
+        return article_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _insert(self, article_id: str, entry: dict, signature: list) -> None:
+        self.entries[article_id] = entry
+        self.signatures[article_id] = signature
+        for key in _band_keys(signature):
+            self.buckets.setdefault(key, set()).add(article_id)
+
+    def add(self, article_id: str, title: str, description: str = "", url: str = "", source: str = "") -> None:
+        """記事を索引に追加"""
+        if article_id in self.entries:
+            return
+        signature = minhash(shingles(title, description))
+        entry = {"sig": _encode(signature), "url": url, "source": source, "addedAt": datetime.now().isoformat()}
+        self._insert(article_id, entry, signature)
+        self.dirty = True
+
+    def remove(self, article_id: str) -> None:
+        """記事を索引から除く"""
+        signature = self.signatures.pop(article_id, None)
+        if signature is None:
+            return
+        self.entries.pop(article_id, None)
+        for key in _band_keys(signature):
+            bucket = self.buckets.get(key)
+            if bucket:
+                bucket.discard(article_id)
+                if not bucket:
+                    del self.buckets[key]
+        self.dirty = True
+
+    def find(self, title: str, description: str = "", source: str = ""):
+        """
+        同じ話題の記事を探す
+        同じソースの記事は SAME_SOURCE_THRESHOLD 以上の場合だけ候補にする
+        （閾値未満の同じソースの記事が、類似度の少し低い別ソースの記事を隠さないように）
+        Returns:
+            (記事ID, 推定類似度) または None
+        """
+        signature = minhash(shingles(title, description))
+        candidates = set()
+        for key in _band_keys(signature):
+            candidates |= self.buckets.get(key, set())
+
+        best = None
+        for article_id in candidates:
+            score = similarity(signature, self.signatures[article_id])
+            threshold = SAME_SOURCE_THRESHOLD if source and self.entries[article_id].get("source") == source else SAME_STORY_THRESHOLD
+            if score >= threshold and (best is None or score > best[1]):
+                best = (article_id, score)
+        return best
@@ -10,6 +10,10 @@ import sys
 import tweepy
 from dotenv import load_dotenv
 
+import article_delta
+import article_store
+import url_canon
+
 # Windows コンソールの文字コード対策
 sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
@@ -18,43 +22,66 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env.loca
 
 # 設定
 SITE_URL = "https://news-navi.jp/inclusive"
-ARTICLES_FILE = "public/data/articles.json"
-POSTED_FILE = "public/data/posted-tweets.json"  # 投稿済み記事IDを保存
+POSTED_FILE = "public/data/posted-tweets.json"  # 投稿済み記事IDと、確認済みの lastUpdated を保存
 
 # ハッシュタグ
 HASHTAGS = "#新着ニュース #インクルーシブ教育 #特別支援教育"
 
 
 def load_articles():
-    """記事データを読み込む"""
+    """記事データを読み込む（記事ストア）"""
     try:
-        with open(ARTICLES_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('articles', [])
+        return article_store.get_articles()
     except Exception as e:
         print(f"記事データ読み込みエラー: {e}")
         return []
 
 
+def load_candidates(checked_until):
+    """
+    投稿候補の記事を読み込む（日付の新しい順）
+    前回確認した lastUpdated 以降の差分フィードに、追加・更新・要約の更新がある記事だけを見る
+    差分で追えない場合（初回・差分が古すぎる等）は全件
+    Returns:
+        (記事リスト, 今回確認した lastUpdated)
+    """
+    changes = article_delta.load_changes_since(checked_until)
+    if changes is None:
+        print("差分フィードで追えないため、全件を確認します")
+        return load_articles(), article_delta.load_index().get('latest', '')
+
+    article_ids = set(changes['added']) | set(changes['updated']) | set(changes['summaries'])
+    articles = [a for a in map(article_store.get_by_id, article_ids) if a]
+    articles.sort(key=lambda a: a.get('date', ''), reverse=True)
+    print(f"差分フィード: {checked_until} 以降に追加・更新された記事 {len(articles)}件")
+    return articles, changes['until']
+
+
 def load_posted_ids():
-    """投稿済み記事IDを読み込む"""
+    """
+    投稿済み記事IDと投稿済みURL、確認済みの lastUpdated を読み込む
+    URLは正規化して照合（IDが違っても同じ記事は再投稿しない）
+    """
     try:
         if os.path.exists(POSTED_FILE):
             with open(POSTED_FILE, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                return set(data.get('posted_ids', []))
+                return (set(data.get('posted_ids', [])), url_canon.UrlIndex(data.get('posted_urls', [])),
+                        data.get('checked_until', ''))
     except Exception as e:
         print(f"投稿済みID読み込みエラー: {e}")
-    return set()
+    return set(), url_canon.UrlIndex(), ''
 
 
-def save_posted_ids(posted_ids):
-    """投稿済み記事IDを保存"""
+def save_posted_ids(posted_ids, posted_urls, checked_until):
+    """投稿済み記事ID・URLと、確認済みの lastUpdated を保存"""
     try:
         # 最新500件のみ保持（ファイル肥大化防止）
         ids_list = list(posted_ids)[-500:]
+        urls_list = list(posted_urls)[-500:]
         with open(POSTED_FILE, 'w', encoding='utf-8') as f:
-            json.dump({'posted_ids': ids_list}, f, ensure_ascii=False, indent=2)
+            json.dump({'posted_ids': ids_list, 'posted_urls': urls_list, 'checked_until': checked_until},
+                      f, ensure_ascii=False, indent=2)
     except Exception as e:
         print(f"投稿済みID保存エラー: {e}")
 
@@ -116,23 +143,19 @@ def main():
     print("X自動投稿スクリプト")
     print("=" * 50)
 
-    # 記事を読み込み
-    articles = load_articles()
-    if not articles:
-        print("記事がありません")
-        return
-
-    print(f"記事数: {len(articles)}件")
-
     # 投稿済みIDを読み込み
-    posted_ids = load_posted_ids()
+    posted_ids, posted_urls, checked_until = load_posted_ids()
     print(f"投稿済み: {len(posted_ids)}件")
 
+    # 記事を読み込み（前回確認した後に追加・更新された記事だけ）
+    articles, latest = load_candidates(checked_until)
+    print(f"確認する記事数: {len(articles)}件")
+
     # 未投稿の記事を抽出（最新5件まで）
     new_articles = []
     for article in articles:
         article_id = article.get('id', '')
-        if article_id and article_id not in posted_ids:
+        if article_id and article_id not in posted_ids and article.get('url', '') not in posted_urls:
             # 要約が空の記事はスキップ
             summary = article.get('summary', '')
             if summary and not summary.startswith('【要約準備中】'):
@@ -142,6 +165,7 @@ def main():
 
     if not new_articles:
         print("新着記事はありません")
+        save_posted_ids(posted_ids, posted_urls, latest)
         return
 
     # 最新3件のみ投稿（API制限対策）
@@ -161,14 +185,17 @@ def main():
         # ツイート投稿
         if post_tweet(tweet_text):
             posted_ids.add(article_id)
+            posted_urls.add(article.get('url', ''))
             posted_count += 1
         else:
             print(f"投稿失敗: {article_id}")
             # エラー時は続行せず終了
             break
 
-    # 投稿済みIDを保存
-    save_posted_ids(posted_ids)
+    # 投稿済みIDを保存（投稿しきれなかった記事が残る場合は、次回も同じ差分から確認する）
+    if posted_count < len(new_articles):
+        latest = checked_until
+    save_posted_ids(posted_ids, posted_urls, latest)
 
     print(f"\n完了: {posted_count}件投稿しました")
 
@@ -7,12 +7,15 @@
 - 7日以上前の記事を削除
 """
 
-import json
 import os
 import sys
 import io
 from datetime import datetime, timedelta
 
+import article_journal
+import article_store
+from filter_rules import FilterEngine, RULESET_BASIC
+
 # Windows環境での文字化け対策
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -26,97 +29,9 @@ ARTICLES_FILE = os.path.join(PROJECT_ROOT, "public", "data", "articles.json")
 # 記事保持日数
 ARTICLE_RETENTION_DAYS = 30
 
-# 【コア理念キーワード】これらのいずれかを含む記事のみを保持
-CORE_KEYWORDS = [
-    # インクルーシブ教育・特別支援教育
-    "インクルーシブ", "インクルーシブ教育", "特別支援", "特別支援教育",
-    "支援学級", "支援学校", "通級", "通級指導",
-    # 発達障害・神経多様性
-    "発達障害", "神経多様性", "ニューロダイバーシティ", "脳機能",
-    "学習障害", "LD", "ディスレクシア", "読み書き困難",
-    "ADHD", "注意欠如", "多動性",
-    "自閉症", "自閉スペクトラム", "ASD", "アスペルガー",
-    # ギフテッド・2e
-    "ギフテッド", "特異な才能", "2e", "二重の特別", "高IQ", "過度激動", "OE",
-    # 合理的配慮・支援
-    "合理的配慮", "個別支援", "個別の教育支援計画", "IEP",
-    "ユニバーサルデザイン", "UDL", "医療的ケア", "療育",
-    # 不登校・多様な学び
-    "不登校", "不登校支援", "フリースクール", "多様な学び", "オルタナティブ教育",
-    # 障害全般（教育文脈）
-    "障害児", "障がい児", "障害のある子", "障がいのある子",
-]
-
-# 【強力な除外キーワード】これらを含む記事は即座に破棄
-STRONG_EXCLUDE_KEYWORDS = [
-    # 政治・情勢
-    "首相", "大統領", "会談", "総選挙", "政党", "過半数", "解雇", "辞任",
-    "国会", "与党", "野党", "閣僚", "大臣", "衆議院", "参議院",
-    "ゼレンスキー", "トランプ", "バイデン", "習近平",
-    # 一般受験・倍率（「入試」を単独で追加）
-    "入試", "高校受験", "大学受験", "中学受験", "入試倍率", "出願状況",
-    "解答速報", "合格判定", "偏差値", "共通テスト", "センター試験",
-    "志願倍率", "確定志願", "志願状況", "募集人員", "志望校",
-    # 塾・予備校
-    "塾", "予備校", "進学塾", "学習塾",
-    # 一般医療・警報
-    "インフルエンザ", "警報発令", "警報再発令", "感染警報",
-    "コロナ", "ワクチン", "予防接種",
-    # 一般ニュース
-    "事業譲渡", "株価", "為替", "経済指標", "決算",
-    # スポーツ・芸能
-    "甲子園", "高校野球", "プロ野球", "サッカー", "五輪", "オリンピック",
-    "芸能", "アイドル", "ドラマ", "映画", "俳優",
-    "ホワイトソックス", "移籍", "自主トレ", "野球", "MLB", "NPB",
-    # 軍事・国際情勢
-    "無人機", "輸出拠点", "ドローン攻撃", "ミサイル", "軍事",
-]
-
-# 教育専門ソース（これらからの記事はCORE_KEYWORDSチェックを緩和）
-TRUSTED_EDUCATION_SOURCES = [
-    "リセマム", "EdTechZine", "こどもとIT",
-]
-
-
-def contains_strong_exclude(title: str, summary: str) -> bool:
-    """
-    強力除外キーワードを含むかチェック
-
-    【理念優先ルール】
-    除外キーワードを含んでいても、コア理念キーワードを同時に含む場合は
-    例外的にFalseを返す（採用）
-    """
-    text = f"{title} {summary}"
-
-    # 除外キーワードを含むかチェック
-    has_exclude = any(kw in text for kw in STRONG_EXCLUDE_KEYWORDS)
-    if not has_exclude:
-        return False  # 除外キーワードなし → 採用
-
-    # 除外キーワードを含むが、コア理念キーワードも含む場合は例外的に採用
-    has_core = any(kw in text for kw in CORE_KEYWORDS)
-    if has_core:
-        return False  # 理念キーワードあり → 例外採用
-
-    # 除外キーワードのみ → 除外
-    return True
-
-
-def contains_core_keyword(title: str, summary: str) -> bool:
-    """コア理念キーワードを含むかチェック"""
-    text = f"{title} {summary}"
-    for keyword in CORE_KEYWORDS:
-        if keyword in text:
-            return True
-    return False
-
-
-def is_trusted_source(source: str) -> bool:
-    """信頼できる教育専門ソースかチェック"""
-    for trusted in TRUSTED_EDUCATION_SOURCES:
-        if trusted in source:
-            return True
-    return False
+# 【ルールエンジン】fetch-news.py の再フィルタと同じ理念ルール（強力除外→探究学習→コア理念）
+# 【廃止】信頼ソース（リセマム・EdTechZine・こどもとIT）の緩和ルールは fetch-news.py に合わせて廃止
+FILTER_ENGINE = FilterEngine()
 
 
 def is_old_article(date_str: str) -> bool:
@@ -137,15 +52,12 @@ def purge_articles():
     print("既存記事の強制浄化を開始")
     print("=" * 60)
 
-    # 記事データを読み込み
-    if not os.path.exists(ARTICLES_FILE):
+    # 記事データを読み込み（記事ストア）
+    if not os.path.exists(ARTICLES_FILE) and not article_store.count():
         print(f"エラー: {ARTICLES_FILE} が見つかりません")
         return
 
-    with open(ARTICLES_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    articles = data.get('articles', [])
+    articles = article_store.get_articles()
     original_count = len(articles)
     print(f"浄化前の記事数: {original_count}件")
     print()
@@ -156,14 +68,14 @@ def purge_articles():
     removed_no_core = []
     removed_old = []
 
-    for article in articles:
+    verdicts = FILTER_ENGINE.evaluate_batch(articles, RULESET_BASIC)
+
+    for article, verdict in zip(articles, verdicts):
         title = article.get('title', '')
-        summary = article.get('summary', '')
-        source = article.get('source', '')
         date = article.get('date', '')
 
-        # 1. 強力除外キーワードチェック
-        if contains_strong_exclude(title, summary):
+        # 1. 強力除外キーワードチェック（理念優先ルール適用・探究学習フィルタ含む）
+        if not verdict.accepted and verdict.rule != "core":
             removed_strong.append(title)
             continue
 
@@ -172,8 +84,8 @@ def purge_articles():
             removed_old.append(title)
             continue
 
-        # 3. コア理念キーワードチェック（信頼ソース以外）
-        if not is_trusted_source(source) and not contains_core_keyword(title, summary):
+        # 3. コア理念キーワードチェック（全ソース共通）
+        if not verdict.accepted:
             removed_no_core.append(title)
             continue
 
@@ -211,20 +123,12 @@ def purge_articles():
     print("=" * 60)
 
     if total_removed > 0:
-        # 日付でソート（新しい順）
-        purged_articles.sort(key=lambda x: x.get('date', ''), reverse=True)
-
-        # 保存データを作成
-        output_data = {
-            "articles": purged_articles,
-            "lastUpdated": datetime.now().isoformat(),
-            "totalCount": final_count,
-            "sources": list(set(a.get('source', '') for a in purged_articles if a.get('source')))
-        }
-
-        # ファイルに保存
-        with open(ARTICLES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+        # 【記事ジャーナル】削除した記事だけを purge として記録 → articles.json を書き出し（圧縮）
+        kept_ids = {a['id'] for a in purged_articles}
+        article_journal.record_events([
+            article_journal.make_event("purge", a['id'], a.get('url', '')) for a in articles if a['id'] not in kept_ids
+        ])
+        article_journal.compact()
 
         print(f"\n[OK] {ARTICLES_FILE} を更新しました")
     else:
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+データ更新のコミットをpushするスクリプト（記事データを書き換えるワークフローの最後に実行）
+他のワークフローが先にpushしていれば、その上にrebaseしてから再試行する
+
+【rebase時の扱い】（.gitattributes で指定）
+- merge=union: 追記専用の台帳・記事ジャーナル（data/quota-ledger.jsonl・data/article-journal*）
+  → 両方の実行の行を残す
+- merge=regenerate: 台帳・ジャーナルから作り直せるファイル（articles.json・分割ファイル・差分フィード・
+  data/quota-aggregate.json・status.json）→ 先にpushされた側を残し、rebase後に作り直す
+  - 記事: 先にpushされた articles.json に、この実行で圧縮したジャーナルのイベントを適用して書き出す
+  - API使用量: 台帳から集計を作り直す（status.json も更新）
+- それ以外のファイルが衝突した場合は自動では解決しない（エラーで終了するので、ワークフローを再実行する）
+
+使用方法:
+  python scripts/push-data.py [--branch main] [--attempts 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import article_delta
+import article_journal
+import article_store
+import quota_ledger
+from state_store import PROJECT_ROOT
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+ARCHIVE_PATH = "data/" + article_journal.ARCHIVE_DIR
+STATUS_SCRIPT = os.path.join(PROJECT_ROOT, "scripts", "update-status.py")
+# 作り直したファイル（rebase後にコミットを修正する）
+REGENERATED_PATHS = [
+    "public/data/articles.json", "public/data/shards", "public/data/articles-delta",
+    "public/data/status.json", "data/quota-aggregate.json",
+]
+RETRY_WAIT_SECONDS = 15
+
+
+def git(*args, check: bool = True) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=PROJECT_ROOT, check=check, capture_output=True, text=True)
+
+
+def _show_lines(rev: str, path: str) -> list:
+    result = git("show", f"{rev}:{path}", check=False)
+    return result.stdout.splitlines() if result.returncode == 0 else []
+
+
+def compacted_events(base: str) -> list:
+    """このコミットで記事ジャーナルのアーカイブに移したイベント（rebase後に先方の articles.json へ適用する）"""
+    paths = git("diff", "--name-only", base, "HEAD", "--", ARCHIVE_PATH).stdout.split()
+    events = []
+    for path in sorted(p for p in paths if p.endswith(".jsonl")):
+        before = set(_show_lines(base, path))
+        for line in _show_lines("HEAD", path):
+            if line.strip() and line not in before:
+                events.append(json.loads(line))
+    return events
+
+
+def remove_orphan_deltas() -> None:
+    """差分フィードの一覧にない差分ファイル（rebaseで取り残されたこの実行の分）を削除"""
+    listed = {entry["file"] for entry in article_delta.load_index().get("deltas", [])}
+    if not os.path.isdir(article_delta.DELTA_DIR):
+        return
+    for name in os.listdir(article_delta.DELTA_DIR):
+        if name.endswith(".json") and name != article_delta.INDEX_FILE and name not in listed:
+            os.remove(os.path.join(article_delta.DELTA_DIR, name))
+
+
+def regenerate(events: list) -> None:
+    """rebase後、先にpushされた内容を元に articles.json などと使用量の集計を作り直す"""
+    if events:
+        # 記事ストアは先方の articles.json（と未圧縮のジャーナル）を取り込み直してから、この実行の分を適用
+        article_store.connect()
+        article_store.apply_events(events)
+        article_journal._export()
+        remove_orphan_deltas()
+        print(f"✓ 先にpushされた articles.json にこの実行のイベント{len(events)}件を適用")
+    quota_ledger.rebuild()
+    subprocess.run([sys.executable, STATUS_SCRIPT], cwd=PROJECT_ROOT, check=True)
+
+    git("add", "-A", "--", *REGENERATED_PATHS)
+    if git("diff", "--staged", "--quiet", check=False).returncode != 0:
+        git("commit", "--amend", "--no-edit")
+
+
+def push(branch: str, attempts: int) -> bool:
+    for attempt in range(1, attempts + 1):
+        git("fetch", "origin", branch)
+        upstream = f"origin/{branch}"
+        if git("merge-base", "--is-ancestor", upstream, "HEAD", check=False).returncode != 0:
+            base = git("merge-base", upstream, "HEAD").stdout.strip()
+            # 先方が articles.json を変えていなければ、この実行の articles.json がそのまま残る
+            upstream_exported = git("diff", "--quiet", base, upstream, "--", article_store.ARTICLES_FILE,
+                                    check=False).returncode != 0
+            events = compacted_events(base) if upstream_exported else []
+            print(f"リモートに新しいコミットがあるため rebase します（{attempt}/{attempts}回目）")
+            rebase = git("-c", "merge.regenerate.driver=true", "rebase", upstream, check=False)
+            if rebase.returncode != 0:
+                conflicts = git("diff", "--name-only", "--diff-filter=U", check=False).stdout.split()
+                git("rebase", "--abort", check=False)
+                print(f"::error::自動で解決できない衝突: {', '.join(conflicts) or rebase.stderr.strip()}"
+                      "（ワークフローを再実行してください）")
+                return False
+            regenerate(events)
+
+        result = git("push", "origin", f"HEAD:{branch}", check=False)
+        if result.returncode == 0:
+            print(f"✓ push しました（{attempt}回目）")
+            return True
+        print(f"  push に失敗（{result.stderr.strip()[:120]}）、{RETRY_WAIT_SECONDS * attempt}秒後に再試行")
+        time.sleep(RETRY_WAIT_SECONDS * attempt)
+
+    print(f"::error::{attempts}回試しても push できませんでした（ワークフローを再実行してください）")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='データ更新のコミットをpush')
+    parser.add_argument('--branch', default='main', help='push先のブランチ')
+    parser.add_argument('--attempts', type=int, default=5, help='最大試行回数')
+    args = parser.parse_args()
+    sys.exit(0 if push(args.branch, args.attempts) else 1)
+
+
+if __name__ == "__main__":
+    main()
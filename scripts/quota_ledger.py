@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemini API 使用量の台帳（クォータ期間: 17:00 JSTリセット / 20回）
+API使用量の集計はすべてこのモジュールを通す
+
+- data/quota-ledger.jsonl: 追記専用の記録（使用・予約・解放）
+  新しい期間の最初の読み込みで、過去の期間の行を削除する（集計に使うのは現在の期間のみ）
+- data/quota-aggregate.json: 現在の期間の集計（使用数・予約中の枠・実行済みルーティン）
+  → 使用量の参照は履歴を走査せず集計値を読むだけ
+- 予約: ワークフローの実行ごとに --max-calls 分の枠を確保し、他の実行が使えないようにする
+  （ファイルロックは同じマシン内の排他のみ。別のワークフローの実行が並行した場合は、
+   push時に scripts/push-data.py が両方の台帳の行を残して集計を作り直す）
+- 使用: rate_limiter.acquire() が1回ごとに consume() を呼ぶ（上限を超える呼び出しはできない）
+
+コマンドライン（ワークフローから使用）:
+  python scripts/quota_ledger.py check --run-type morning --reserve --github-output
+  python scripts/quota_ledger.py release
+  python scripts/quota_ledger.py status
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from state_store import load_state, save_state, state_path
+
+try:
+    import fcntl
+except ImportError:  # Windows（ローカル開発）ではロックなしで動作
+    fcntl = None
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# ========================================
+# 設定
+# ========================================
+DAILY_API_LIMIT = 20
+RESET_HOUR_JST = 17
+RESERVATION_TTL_HOURS = 3  # 解放されなかった予約（実行の異常終了）を自動で失効させる
+
+# ルーティン実行の最大使用枠
+ROUTINE_QUOTAS = {
+    "morning": 5,  # 朝刊（7:00 JST）
+    "evening": 6,  # 夕刊（18:00 JST）+ AIピック
+}
+# 期間内の最後のルーティン（--leftover 指定時）が余った枠を使うときも、手動投稿用に残す枠
+LEFTOVER_KEEP = 2
+
+LEDGER_FILE = "quota-ledger.jsonl"
+AGGREGATE_FILE = "quota-aggregate.json"
+LOCK_FILE = "quota-ledger.lock"
+
+JST = timezone(timedelta(hours=9))
+
+
+def get_jst_now() -> datetime:
+    """日本時間の現在時刻"""
+    return datetime.now(JST)
+
+
+def get_quota_period_start(now: datetime = None) -> datetime:
+    """現在のクォータ期間の開始時刻（17:00 JSTでリセット）"""
+    now = now or get_jst_now()
+    today_reset = now.replace(hour=RESET_HOUR_JST, minute=0, second=0, microsecond=0)
+    if now >= today_reset:
+        return today_reset
+    return today_reset - timedelta(days=1)
+
+
+def get_reset_time(now: datetime = None) -> datetime:
+    """次のリセット時刻（17:00 JST）"""
+    return get_quota_period_start(now) + timedelta(days=1)
+
+
+def get_run_id() -> str:
+    """実行ID（GitHub Actionsの実行ID、ローカルではプロセスID）"""
+    return os.getenv('GITHUB_RUN_ID') or f"local-{os.getpid()}"
+
+
+@contextmanager
+def locked():
+    """台帳の排他ロック（プロセス間）"""
+    path = state_path(LOCK_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# ========================================
+# 台帳・集計
+# ========================================
+def _append(event: dict) -> None:
+    """台帳に1行追記"""
+    path = state_path(LEDGER_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+def _rotate(period: str) -> None:
+    """台帳から現在の期間以外の行を削除（コミットされる台帳を大きくしない）"""
+    path = state_path(LEDGER_FILE)
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    kept = []
+    for line in lines:
+        try:
+            if json.loads(line).get("period") == period:
+                kept.append(line)
+        except ValueError:
+            continue
+    if len(kept) == len(lines):
+        return
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".jsonl")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.writelines(kept)
+    os.replace(tmp_path, path)
+
+
+def _empty_aggregate(period: str) -> dict:
+    return {"period": period, "used": 0, "reservations": {}, "routineRuns": []}
+
+
+def _rebuild_aggregate(period: str) -> dict:
+    """集計ファイルが失われた場合のみ、台帳から現在の期間を再集計"""
+    aggregate = _empty_aggregate(period)
+    path = state_path(LEDGER_FILE)
+    if not os.path.exists(path):
+        return aggregate
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get("period") != period:
+                continue
+            _apply(aggregate, event)
+    return aggregate
+
+
+def _apply(aggregate: dict, event: dict) -> None:
+    """イベントを集計に反映"""
+    run_id = event.get("runId", "")
+    calls = event.get("calls", 0)
+    reservations = aggregate["reservations"]
+
+    if event["type"] == "reserve":
+        reservations[run_id] = {"calls": calls, "kind": event.get("kind", ""), "expiresAt": event.get("expiresAt")}
+        if event.get("kind") in ROUTINE_QUOTAS and event["kind"] not in aggregate["routineRuns"]:
+            aggregate["routineRuns"].append(event["kind"])
+    elif event["type"] == "use":
+        aggregate["used"] += calls
+        if run_id in reservations:
+            reservations[run_id]["calls"] = max(0, reservations[run_id]["calls"] - calls)
+    elif event["type"] == "release":
+        reservations.pop(run_id, None)
+
+
+def _load_aggregate() -> dict:
+    """現在の期間の集計を読み込む（期間が変わっていれば新しい集計を開始、失効した予約は除外）"""
+    now = get_jst_now()
+    period = get_quota_period_start(now).isoformat()
+    aggregate = load_state(AGGREGATE_FILE)
+    if not aggregate:
+        aggregate = _rebuild_aggregate(period)
+    elif aggregate.get("period") != period:
+        aggregate = _empty_aggregate(period)
+        _rotate(period)
+
+    now_str = now.isoformat()
+    aggregate["reservations"] = {
+        run_id: r for run_id, r in aggregate["reservations"].items()
+        if r.get("calls", 0) > 0 and (not r.get("expiresAt") or r["expiresAt"] > now_str)
+    }
+    return aggregate
+
+
+def _record(aggregate: dict, event_type: str, calls: int, run_id: str, **extra) -> None:
+    """イベントを台帳に追記し、集計を更新・保存"""
+    event = {
+        "ts": get_jst_now().isoformat(),
+        "period": aggregate["period"],
+        "type": event_type,
+        "runId": run_id,
+        "calls": calls,
+    }
+    event.update(extra)
+    _append(event)
+    _apply(aggregate, event)
+    save_state(AGGREGATE_FILE, aggregate)
+
+
+def _reserved_by_others(aggregate: dict, run_id: str) -> int:
+    return sum(r["calls"] for rid, r in aggregate["reservations"].items() if rid != run_id)
+
+
+# ========================================
+# 公開API
+# ========================================
+def get_usage() -> dict:
+    """
+    現在の期間の使用状況
+    Returns:
+        {"period", "used", "reserved", "remaining", "limit", "routineRuns"}
+    """
+    with locked():
+        aggregate = _load_aggregate()
+    reserved = sum(r["calls"] for r in aggregate["reservations"].values())
+    return {
+        "period": aggregate["period"],
+        "used": aggregate["used"],
+        "reserved": reserved,
+        "remaining": max(0, DAILY_API_LIMIT - aggregate["used"]),
+        "limit": DAILY_API_LIMIT,
+        "routineRuns": list(aggregate["routineRuns"]),
+    }
+
+
+def get_pending_routine_reserve(routine_runs: list, run_type: str) -> int:
+    """この期間にまだ実行されていないルーティンのために残すべき枠"""
+    return sum(quota for kind, quota in ROUTINE_QUOTAS.items()
+               if kind != run_type and kind not in routine_runs)
+
+
+def reserve(calls: int, kind: str = "manual", run_id: str = None) -> int:
+    """
+    この実行のために枠を予約（他の実行の予約・未実行のルーティン枠は使わない）
+    Returns:
+        実際に予約できた回数
+    """
+    run_id = run_id or get_run_id()
+    with locked():
+        aggregate = _load_aggregate()
+        free = DAILY_API_LIMIT - aggregate["used"] - _reserved_by_others(aggregate, run_id)
+        if kind not in ROUTINE_QUOTAS:
+            free -= get_pending_routine_reserve(aggregate["routineRuns"], kind)
+        granted = max(0, min(calls, free))
+        expires_at = (get_jst_now() + timedelta(hours=RESERVATION_TTL_HOURS)).isoformat()
+        _record(aggregate, "reserve", granted, run_id, kind=kind, expiresAt=expires_at)
+    return granted
+
+
+def consume(calls: int = 1, run_id: str = None) -> bool:
+    """
+    API呼び出し分を使用済みとして記録
+    予約があれば予約から、なければ誰も予約していない残り枠から使う
+    （予約なしの実行は、未実行のルーティンのために残す枠も使わない）
+    Returns:
+        False: 枠がない（呼び出してはいけない）
+    """
+    run_id = run_id or get_run_id()
+    with locked():
+        aggregate = _load_aggregate()
+        own = aggregate["reservations"].get(run_id, {}).get("calls", 0)
+        free = DAILY_API_LIMIT - aggregate["used"] - _reserved_by_others(aggregate, run_id)
+        if own == 0:
+            free -= get_pending_routine_reserve(aggregate["routineRuns"], "")
+        if own < calls and free < calls:
+            return False
+        _record(aggregate, "use", calls, run_id)
+    return True
+
+
+def rebuild() -> dict:
+    """台帳から現在の期間の集計を作り直す（rebaseで別の実行の台帳の行を取り込んだ後など）"""
+    with locked():
+        aggregate = _rebuild_aggregate(get_quota_period_start().isoformat())
+        save_state(AGGREGATE_FILE, aggregate)
+    return aggregate
+
+
+def release(run_id: str = None) -> int:
+    """予約の残りを解放（実行終了時）。解放した回数を返す"""
+    run_id = run_id or get_run_id()
+    with locked():
+        aggregate = _load_aggregate()
+        remaining = aggregate["reservations"].get(run_id, {}).get("calls", 0)
+        if remaining > 0:
+            _record(aggregate, "release", remaining, run_id)
+    return remaining
+
+
+# ========================================
+# コマンドライン
+# ========================================
+def print_usage(usage: dict) -> None:
+    print(f"クォータ期間: {usage['period'][:16]} 〜")
+    print(f"使用済み: {usage['used']}/{usage['limit']}")
+    print(f"予約中: {usage['reserved']}")
+    print(f"残り: {usage['remaining']}")
+    print(f"実行済みルーティン: {', '.join(usage['routineRuns']) or 'なし'}")
+
+
+def command_check(args) -> int:
+    """ワークフローの実行前チェック（--reserve で枠を予約）"""
+    run_type = args.run_type
+    usage = get_usage()
+    free = usage["limit"] - usage["used"] - usage["reserved"]
+
+    if run_type in ROUTINE_QUOTAS:
+        # ルーティン実行：必要枠があるかチェック
+        needed = ROUTINE_QUOTAS[run_type]
+        available = needed if free >= needed else 0
+        if available and args.leftover and get_pending_routine_reserve(usage["routineRuns"], run_type) == 0:
+            # 期間内の最後のルーティン：リセットで失われる枠をAI作業キューに回す
+            available = max(needed, free - LEFTOVER_KEEP)
+    else:
+        # 非ルーティン実行：未実行のルーティン枠を除いた分のみ利用可能
+        available = max(0, free - get_pending_routine_reserve(usage["routineRuns"], run_type))
+        if args.need:
+            available = min(available, args.need) if available >= args.need else 0
+
+    print("=" * 50)
+    print(f"実行タイプ: {run_type}")
+    print_usage(usage)
+    print(f"利用可能: {available}")
+    print("=" * 50)
+
+    if available > 0 and args.reserve:
+        available = reserve(available, kind=run_type)
+        print(f"[OK] {available}件を予約しました（実行ID: {get_run_id()}）")
+    elif available > 0:
+        print(f"[OK] {available}件まで利用可能")
+    elif run_type in ROUTINE_QUOTAS:
+        print(f"::error::[NG] ルーティン枠不足: 残り{free} < 必要{ROUTINE_QUOTAS[run_type]}")
+    else:
+        print("::warning::[スキップ] ルーティン予約のため利用可能枠なし")
+
+    if args.github_output and os.getenv('GITHUB_OUTPUT'):
+        with open(os.environ['GITHUB_OUTPUT'], 'a') as f:
+            f.write(f"quota_ok={'true' if available > 0 else 'false'}\n")
+            f.write(f"available={available}\n")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API使用量の台帳')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    check = sub.add_parser('check', help='実行前の枠チェック')
+    check.add_argument('--run-type', default='manual', help='morning / evening / manual / manual-post')
+    check.add_argument('--need', type=int, default=0, help='必要なAPI呼び出し数（非ルーティン実行）')
+    check.add_argument('--reserve', action='store_true', help='利用可能な枠を予約する')
+    check.add_argument('--github-output', action='store_true', help='GITHUB_OUTPUT に quota_ok / available を書き出す')
+    check.add_argument('--leftover', action='store_true', help='期間内の最後のルーティンなら余った枠もまとめて使う')
+
+    sub.add_parser('release', help='この実行の予約の残りを解放')
+    sub.add_parser('status', help='現在の使用状況を表示')
+
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        sys.exit(command_check(args))
+    elif args.command == 'release':
+        released = release()
+        print(f"予約を解放: {released}件")
+    else:
+        print_usage(get_usage())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemini API のレート制限（トークンバケット）
+全スクリプト・同時実行中のワークフローで1つの枠を共有する
+
+- RPM: 1分あたりの上限。トークンが溜まるまでだけ待つ（固定の待機はしない）
+- RPD: 1日あたりの上限。quota_ledger の台帳で管理（枠がなければ待たずに「枠なし」を返す）
+- 状態は data/rate-limit.json に保存し、ファイルロックで排他制御する
+- 429を受けた場合は backoff() で全プロセスの呼び出しを一時停止させる
+
+使用例:
+    if not rate_limiter.acquire():
+        print("本日のAPI枠がありません")
+    else:
+        response = client.models.generate_content(...)
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import quota_ledger
+from state_store import load_state, save_state, state_path
+
+try:
+    import fcntl
+except ImportError:  # Windows（ローカル開発）ではロックなしで動作
+    fcntl = None
+
+# ========================================
+# 設定（Gemini 無料枠: 5 RPM, 20 RPD）
+# ========================================
+RPM_LIMIT = 5
+RPM_BURST = 1  # 連続で即時に送れる数
+# 補充速度: どの60秒間をとっても RPM_BURST + 補充分 が RPM_LIMIT を超えないようにする（= 15秒に1回）
+RPM_REFILL_PER_SECOND = (RPM_LIMIT - RPM_BURST) / 60
+
+RATE_LIMIT_FILE = "rate-limit.json"
+LOCK_FILE = "rate-limit.lock"
+
+
+@contextmanager
+def locked():
+    """状態ファイルの排他ロック（プロセス間）"""
+    path = state_path(LOCK_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _load(now: float) -> dict:
+    """状態を読み込み、経過時間分のトークンを補充"""
+    state = load_state(RATE_LIMIT_FILE, {}) or {}
+
+    rpm = state.get("rpm") or {"tokens": RPM_BURST, "updatedAt": now}
+    elapsed = max(0.0, now - rpm.get("updatedAt", now))
+    rpm["tokens"] = min(RPM_BURST, rpm.get("tokens", RPM_BURST) + elapsed * RPM_REFILL_PER_SECOND)
+    rpm["updatedAt"] = now
+
+    return {"rpm": rpm, "blockedUntil": state.get("blockedUntil", 0)}
+
+
+def acquire(label: str = "") -> bool:
+    """
+    API呼び出し1回分の枠を確保（RPMの枠が空くまで待つ）
+
+    Returns:
+        True: 呼び出してよい / False: 本日（17:00 JSTまで）の枠がない
+    """
+    while True:
+        with locked():
+            now = time.time()
+            state = _load(now)
+
+            wait = max(0.0, state["blockedUntil"] - now)
+            if wait <= 0 and state["rpm"]["tokens"] >= 1:
+                # 【RPD】台帳に使用を記録（この実行の予約、または誰も予約していない枠から）
+                if not quota_ledger.consume(1):
+                    save_state(RATE_LIMIT_FILE, state)
+                    print(f"        [レート制限] 本日のAPI枠（{quota_ledger.DAILY_API_LIMIT}回）がありません")
+                    return False
+                state["rpm"]["tokens"] -= 1
+                save_state(RATE_LIMIT_FILE, state)
+                return True
+
+            if wait <= 0:
+                wait = (1 - state["rpm"]["tokens"]) / RPM_REFILL_PER_SECOND
+            save_state(RATE_LIMIT_FILE, state)
+
+        # ロックを外して待機（他のプロセスも同じ時刻まで待つ）
+        print(f"        [レート制限] {wait:.1f}秒待機{f'（{label}）' if label else ''}")
+        time.sleep(wait)
+
+
+def backoff(seconds: float) -> None:
+    """429を受けたとき、全プロセスの次の呼び出しを seconds 秒後まで止める"""
+    with locked():
+        now = time.time()
+        state = _load(now)
+        state["blockedUntil"] = max(state["blockedUntil"], now + seconds)
+        save_state(RATE_LIMIT_FILE, state)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+検索用の転置インデックス（文字2-gram）
+検索ページが articles.json 全体ではなく、検索語の2-gramを含む小さなファイルだけを取得できるようにする
+
+- 対象: タイトル・要約・ソース・キーワード（mainKeyword）
+- 正規化: NFKC（全角英数・半角カナの統一）→ 小文字 → 長音・ダッシュ類を「-」に → 空白を除く
+  （src/lib/search.ts の normalizeSearchText と同じ）
+- public/data/search/<番号>.json: {2-gram: [記事ID, ...]}（記事IDは articles.json と同じ並び順）
+  2-gramの先頭の文字のコードポイント % SHARD_COUNT で分割する
+- public/data/search/manifest.json: 分割数・記事数・2-gram数
+- デプロイ時に build-data-artifacts.py が articles.json から作る（記事1件の追加で多くの分割ファイルが
+  変わるため、コミットしない: .gitignore 済み）
+
+使用例:
+    search_index.export_index(articles)
+"""
+
+import json
+import os
+import re
+import tempfile
+import unicodedata
+from datetime import datetime
+
+from state_store import PROJECT_ROOT
+
+INDEX_DIR = os.path.join(PROJECT_ROOT, "public", "data", "search")
+MANIFEST_FILE = "manifest.json"
+SHARD_COUNT = 256  # src/lib/search.ts の SEARCH_SHARD_COUNT と同じ値にする
+FIELDS = ("title", "summary", "source", "mainKeyword")
+
+
+def normalize(text: str) -> str:
+    """検索用にテキストを正規化"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    text = re.sub(r'[ー―‐−–—]', '-', text)
+    return re.sub(r'\s+', '', text)
+
+
+def bigrams(text: str) -> set:
+    """正規化したテキストの文字2-gram"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def shard_of(gram: str) -> int:
+    return ord(gram[0]) % SHARD_COUNT
+
+
+def build_index(articles: list) -> dict:
+    """{2-gram: [記事ID, ...]}（記事は与えられた順）"""
+    index = {}
+    for article in articles:
+        article_id = article.get('id')
+        if not article_id:
+            continue
+        grams = set()
+        for field in FIELDS:
+            grams |= bigrams(normalize(article.get(field) or ''))
+        for gram in grams:
+            index.setdefault(gram, []).append(article_id)
+    return index
+
+
+def _write_if_changed(path: str, content: bytes) -> bool:
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
+def load_manifest(index_dir: str = None) -> dict:
+    """保存済みの一覧（なければ空）"""
+    path = os.path.join(index_dir or INDEX_DIR, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def export_index(articles: list, index_dir: str = None) -> dict:
+    """
+    検索インデックスを分割して書き出す
+    Args:
+        articles: 記事一覧（articles.json と同じ並び順）
+        index_dir: 出力先（省略時は public/data/search）
+    Returns:
+        書き出した一覧
+    """
+    index_dir = index_dir or INDEX_DIR
+    index = build_index(articles)
+
+    shards = {}
+    for gram in sorted(index):
+        shards.setdefault(shard_of(gram), {})[gram] = index[gram]
+
+    written = 0
+    sizes = []
+    for number, postings in shards.items():
+        content = json.dumps(postings, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        sizes.append(len(content))
+        if _write_if_changed(os.path.join(index_dir, f"{number}.json"), content):
+            written += 1
+
+    # 2-gramがなくなった分割ファイルを削除
+    removed = 0
+    if os.path.isdir(index_dir):
+        for name in os.listdir(index_dir):
+            stem = name[:-len(".json")] if name.endswith(".json") else ""
+            if stem.isdigit() and int(stem) not in shards:
+                os.remove(os.path.join(index_dir, name))
+                removed += 1
+
+    manifest = {
+        "generatedAt": datetime.now().isoformat(),
+        "shardCount": SHARD_COUNT,
+        "fields": list(FIELDS),
+        "totalCount": len(articles),
+        "bigramCount": len(index),
+        "maxShardBytes": max(sizes) if sizes else 0,
+    }
+    _write_if_changed(os.path.join(index_dir, MANIFEST_FILE),
+                      json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    print(f"✓ 検索インデックス: 2-gram {len(index)}件 / 分割ファイル {len(shards)}件"
+          f"（更新 {written}件 / 削除 {removed}件、最大 {manifest['maxShardBytes'] // 1024}KB）")
+    return manifest
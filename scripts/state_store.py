@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+収集パイプラインの内部状態ファイル（data/ 配下）の読み書き
+- 公開データ（public/data/）とは分けて保存し、サイトには配信しない
+- GitHub Actions の実行間で引き継ぐため、ワークフローで data/ をコミットする
+"""
+
+import json
+import os
+import tempfile
+
+# パス設定
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+STATE_DIR = os.path.join(PROJECT_ROOT, "data")
+
+
+def state_path(name: str) -> str:
+    """状態ファイルのフルパスを取得"""
+    return os.path.join(STATE_DIR, name)
+
+
+def load_state(name: str, default=None):
+    """状態ファイルを読み込む（存在しない・壊れている場合はdefaultを返す）"""
+    path = state_path(name)
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"警告: {name} 読み込みエラー - {e}")
+    return default
+
+
+def save_state(name: str, data) -> bool:
+    """
+    状態ファイルを保存
+    一時ファイルに書いてから置き換えるため、途中で落ちても壊れたJSONが残らない
+    """
+    path = state_path(name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"警告: {name} 保存エラー - {e}")
+        return False
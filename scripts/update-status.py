@@ -10,7 +10,9 @@ status.jsonのAPI使用量を再計算して更新する
 import os
 import sys
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
+
+import quota_ledger
 
 # Windows環境での文字化け対策
 if sys.platform == 'win32':
@@ -21,22 +23,14 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 STATUS_FILE = os.path.join(PROJECT_ROOT, "public", "data", "status.json")
 
-DAILY_API_LIMIT = 20
-
-
-def get_quota_period_start():
-    """現在のクォータ期間の開始時刻を取得（17:00 JSTでリセット）"""
-    now = datetime.now()
-    today_reset = now.replace(hour=17, minute=0, second=0, microsecond=0)
-
-    if now >= today_reset:
-        return today_reset
-    else:
-        return today_reset - timedelta(days=1)
+DAILY_API_LIMIT = quota_ledger.DAILY_API_LIMIT
 
 
 def update_status(api_calls: int = 0, articles_processed: int = 0, success: bool = True, add_history: bool = False, is_manual: bool = False):
-    """ステータスを更新（API使用量を再計算）"""
+    """
+    ステータスを更新（API使用量は台帳から取得）
+    api_calls は履歴表示用（使用量はAPI呼び出し時に rate_limiter 経由で台帳に記録済み）
+    """
     try:
         # 既存のステータスを読み込み
         existing_status = {"history": []}
@@ -45,17 +39,10 @@ def update_status(api_calls: int = 0, articles_processed: int = 0, success: bool
                 existing_status = json.load(f)
 
         now = datetime.now()
-        quota_period_start = get_quota_period_start()
-
-        # クォータ期間内のAPI使用量を集計
-        period_api_usage = api_calls  # 今回の呼び出し分
-        for entry in existing_status.get("history", []):
-            try:
-                entry_time = datetime.fromisoformat(entry.get("timestamp", ""))
-                if entry_time >= quota_period_start:
-                    period_api_usage += entry.get("apiCalls", 0)
-            except:
-                continue
+
+        # 【API使用台帳】クォータ期間内のAPI使用量
+        usage = quota_ledger.get_usage()
+        period_api_usage = usage["used"]
 
         api_percentage = min(100, int((period_api_usage / DAILY_API_LIMIT) * 100))
 
@@ -103,7 +90,7 @@ def update_status(api_calls: int = 0, articles_processed: int = 0, success: bool
             json.dump(status_data, f, ensure_ascii=False, indent=2)
 
         print(f"ステータス更新完了")
-        print(f"  クォータ期間開始: {quota_period_start.strftime('%Y-%m-%d %H:%M')}")
+        print(f"  クォータ期間開始: {usage['period'][:16].replace('T', ' ')}")
         print(f"  API使用量: {period_api_usage}/{DAILY_API_LIMIT} ({api_percentage}%)")
         print(f"  残り: {DAILY_API_LIMIT - period_api_usage}回")
 
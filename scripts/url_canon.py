@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+URLの正規化（重複チェック・ブラックリスト照合で共通）
+同じ記事のURLの表記ゆれ（トラッキング用パラメータ・http/https・www.・
+末尾のスラッシュ・AMP/モバイル版・転送用URL）を1つのキーにまとめる
+
+- canonicalize(): 正規化したURL（https・ホスト名小文字・不要なパラメータなし）
+- UrlIndex: 正規化したURLをキーにした索引（集合・辞書として使う）
+  線形探索ではなく、正規化キーの辞書で照合する
+
+使用例:
+    excluded = url_canon.UrlIndex(data.get('excludedUrls', []))
+    if url in excluded:
+        ...
+"""
+
+import re
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+# すべてのドメインで除くパラメータ（計測・流入元の記録用）
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "yclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "from", "rss", "feed", "via", "share", "cmpid", "amp",
+}
+TRACKING_PREFIXES = ("utm_", "cx_", "_hs")
+
+# ホスト名の先頭から除く部分（モバイル版・AMP版）
+HOST_PREFIXES = ("www.", "m.", "sp.", "amp.", "mobile.")
+
+# ドメインごとの規則
+# - drop_params: 記事の中身が変わらないパラメータ（ページ番号・表示切替など）
+DOMAIN_RULES = {
+    "asahi.com": {"drop_params": {"iref", "p"}},
+    "dot.asahi.com": {"drop_params": {"page"}},
+    "news.yahoo.co.jp": {"drop_params": {"page", "source"}},
+    "toyokeizai.net": {"drop_params": {"page", "display"}},
+    "president.jp": {"drop_params": {"page"}},
+    "newsdig.tbs.co.jp": {"drop_params": {"display", "page"}},
+    "natgeo.nikkeibp.co.jp": {"drop_params": {"st"}},
+    "resemom.jp": {"drop_params": {"pickup_list_click1", "pickup_list_click2"}},
+    "ict-enews.net": {"drop_params": {"page"}},
+}
+
+# 転送用URL（RSS・RDFの計測リンク、検索エンジンのAMPキャッシュ）から元のURLを取り出す
+# - path_prefix: このパスの後ろが転送先（https:// を省略した形）
+# - params: 転送先のURLが入るパラメータ
+REDIRECT_RULES = {
+    "google.com": {"path_prefix": "/amp/s/", "params": ("url", "q")},
+    "google.co.jp": {"path_prefix": "/amp/s/", "params": ("url", "q")},
+    "news.google.com": {"params": ("url",)},
+    "feedproxy.google.com": {"params": ("url",)},
+    "rss.rssad.jp": {"params": ("url", "lnk")},
+    "ad.rssad.jp": {"params": ("url", "lnk")},
+    "rd.yahoo.co.jp": {"params": ("url",)},
+    "b.hatena.ne.jp": {"params": ("url",)},
+    "l.facebook.com": {"params": ("u",)},
+    "t.co": {"params": ("url",)},
+}
+MAX_REDIRECT_DEPTH = 3
+
+
+def _strip_host(host: str) -> str:
+    host = host.lower().split(":")[0].rstrip(".")
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") >= 2:
+            return host[len(prefix):]
+    return host
+
+
+def _domain_rule(host: str, rules: dict) -> dict:
+    """ホスト名とその上位ドメインで規則を探す（例: edua.asahi.com → asahi.com）"""
+    parts = host.split(".")
+    for i in range(len(parts) - 1):
+        rule = rules.get(".".join(parts[i:]))
+        if rule:
+            return rule
+    return {}
+
+
+def unwrap_redirect(url: str) -> str:
+    """転送用URLであれば転送先のURLを返す（そうでなければそのまま）"""
+    for _ in range(MAX_REDIRECT_DEPTH):
+        parts = urlsplit(url)
+        rule = _domain_rule(_strip_host(parts.netloc), REDIRECT_RULES)
+        if not rule:
+            return url
+        target = ""
+        prefix = rule.get("path_prefix")
+        if prefix and parts.path.startswith(prefix):
+            target = "https://" + parts.path[len(prefix):] + (f"?{parts.query}" if parts.query else "")
+        else:
+            query = dict(parse_qsl(parts.query))
+            for name in rule.get("params", ()):
+                value = unquote(query.get(name, ""))
+                if value.startswith(("http://", "https://")):
+                    target = value
+                    break
+        if not target:
+            return url
+        url = target
+    return url
+
+
+def canonicalize(url: str) -> str:
+    """
+    URLを正規化
+    Returns:
+        https://ホスト名/パス?パラメータ（httpのURL・解析できないURLは空白を除いただけの文字列）
+    """
+    url = (url or "").strip()
+    if not url.startswith(("http://", "https://")):
+        return url
+    url = unwrap_redirect(url)
+    parts = urlsplit(url)
+    host = _strip_host(parts.netloc)
+    rule = _domain_rule(host, DOMAIN_RULES)
+    drop_params = rule.get("drop_params", set())
+
+    # AMP版のパス（/amp/〜・〜/amp）と末尾のスラッシュ・index.html
+    path = re.sub(r'/+', '/', parts.path or "/")
+    path = re.sub(r'^/amp(?=/)', '', path)
+    path = re.sub(r'/amp/?$', '/', path)
+    path = re.sub(r'/index\.(html?|php)$', '/', path)
+    path = path.rstrip('/') or '/'
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS
+        and k.lower() not in drop_params
+        and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+class UrlIndex:
+    """正規化したURLをキーにした索引（in・get・add・discard は元のURLのまま使える）"""
+
+    def __init__(self, urls=None):
+        self._items = {}
+        for url in urls or []:
+            self.add(url)
+
+    def add(self, url: str, value=True) -> None:
+        if url:
+            self._items[canonicalize(url)] = value
+
+    def get(self, url: str, default=None):
+        return self._items.get(canonicalize(url), default)
+
+    def discard(self, url: str) -> None:
+        self._items.pop(canonicalize(url), None)
+
+    def __contains__(self, url) -> bool:
+        return bool(url) and canonicalize(url) in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
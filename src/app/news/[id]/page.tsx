@@ -22,7 +22,14 @@ type ArticlesData = {
   articles: Article[];
 };
 
-// ビルド時に記事データを読み込む
+// 記事別ファイルの一覧（scripts/article_shards.py が書き出す）
+type ArticleManifest = {
+  ids: Record<string, string>;
+};
+
+const ARTICLE_DIR = path.join(process.cwd(), 'public', 'data', 'articles');
+
+// ビルド時に記事データを読み込む（記事別ファイルがない場合のみ使用）
 function getArticlesData(): Article[] {
   try {
     const filePath = path.join(process.cwd(), 'public', 'data', 'articles.json');
@@ -35,14 +42,36 @@ function getArticlesData(): Article[] {
   }
 }
 
-// 記事IDから記事を取得
+// 記事別ファイルの一覧を読み込む（なければ null）
+function getArticleManifest(): ArticleManifest | null {
+  try {
+    const fileContents = fs.readFileSync(path.join(ARTICLE_DIR, 'manifest.json'), 'utf8');
+    return JSON.parse(fileContents);
+  } catch {
+    return null;
+  }
+}
+
+// 記事IDから記事を取得（記事別ファイルのみ読み込み、なければ全記事から探す）
 function getArticleById(id: string): Article | undefined {
+  if (/^[\w-]+$/.test(id)) {
+    try {
+      const fileContents = fs.readFileSync(path.join(ARTICLE_DIR, `${id}.json`), 'utf8');
+      return JSON.parse(fileContents);
+    } catch {
+      // 記事別ファイルがない場合は全記事から探す
+    }
+  }
   const articles = getArticlesData();
   return articles.find((article) => article.id === id);
 }
 
 // 静的パス生成（ビルド時にすべての記事ページを生成）
 export function generateStaticParams() {
+  const manifest = getArticleManifest();
+  if (manifest) {
+    return Object.keys(manifest.ids).map((id) => ({ id }));
+  }
   const articles = getArticlesData();
   return articles.map((article) => ({
     id: article.id,
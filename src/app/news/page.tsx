@@ -4,7 +4,7 @@ import { useState, useEffect } from 'react';
 import Link from 'next/link';
 import Sidebar from '@/components/Sidebar';
 import NewsCard from '@/components/NewsCard';
-import { Article, ArticlesData, BASE_PATH, filterPublishableArticles, fetchTrashedUrls, filterOutTrashedArticles } from '@/lib/types';
+import { Article, ArticlesData, filterPublishableArticles, fetchTrashedUrls, filterOutTrashedArticles, fetchDataFile } from '@/lib/types';
 
 export default function NewsPage() {
   const [articles, setArticles] = useState<Article[]>([]);
@@ -16,7 +16,7 @@ export default function NewsPage() {
       try {
         // 記事データとゴミ箱データを並列取得
         const [res, trashedUrls] = await Promise.all([
-          fetch(`${BASE_PATH}/data/articles.json`),
+          fetchDataFile('articles.json'),
           fetchTrashedUrls()
         ]);
         if (!res.ok) throw new Error('記事データの取得に失敗しました');
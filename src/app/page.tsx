@@ -8,7 +8,7 @@ import RankingBlock from '@/components/RankingBlock';
 import SupportCard from '@/components/SupportCard';
 import FeaturedBooksBlock from '@/components/FeaturedBooksBlock';
 import CommentSection from '@/components/CommentSection';
-import { Article, ArticlesData, BASE_PATH, filterPublishableArticles, fetchTrashedUrls, filterOutTrashedArticles } from '@/lib/types';
+import { Article, ArticlesData, BASE_PATH, filterPublishableArticles, fetchTrashedUrls, filterOutTrashedArticles, fetchDataFile } from '@/lib/types';
 import { useBookmarks } from '@/contexts/BookmarkContext';
 import { supabase, EditorMessage } from '@/lib/supabase';
 import AddToHomeScreen from '@/components/AddToHomeScreen';
@@ -137,7 +137,7 @@ export default function Home() {
       try {
         // 記事データとゴミ箱データを並列取得
         const [articlesRes, trashedUrls] = await Promise.all([
-          fetch(`${BASE_PATH}/data/articles.json`),
+          fetchDataFile('articles.json'),
           fetchTrashedUrls()
         ]);
 
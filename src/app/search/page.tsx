@@ -4,7 +4,8 @@ import { useSearchParams } from 'next/navigation';
 import { Suspense, useEffect, useState } from 'react';
 import Link from 'next/link';
 import NewsCard from '@/components/NewsCard';
-import { getCategoryByName, BASE_PATH, isPublishableSummary } from '@/lib/types';
+import { getCategoryByName, isPublishableSummary } from '@/lib/types';
+import { fetchSearchCandidates, matchesQuery } from '@/lib/search';
 
 type Article = {
   id: string;
@@ -18,19 +19,6 @@ type Article = {
   mainKeyword?: string;
 };
 
-// 検索用にテキストを正規化（全角→半角、大文字→小文字）
-function normalizeText(text: string): string {
-  return text
-    .toLowerCase()
-    // 全角英数字を半角に変換
-    .replace(/[Ａ-Ｚａ-ｚ０-９]/g, (s) => String.fromCharCode(s.charCodeAt(0) - 0xFEE0))
-    // 全角スペースを半角に
-    .replace(/　/g, ' ')
-    // 長音記号の統一
-    .replace(/[ー－―]/g, '-')
-    .trim();
-}
-
 function SearchResults() {
   const searchParams = useSearchParams();
   const query = searchParams.get('q') || '';
@@ -39,18 +27,21 @@ function SearchResults() {
   const [fetchError, setFetchError] = useState<string | null>(null);
 
   useEffect(() => {
-    // ニュースデータを取得（BASE_PATHを使用）
-    fetch(`${BASE_PATH}/data/articles.json`)
-      .then(res => {
-        if (!res.ok) throw new Error(`HTTP ${res.status}`);
-        return res.json();
-      })
-      .then(data => {
+    if (!query) {
+      setArticles([]);
+      setIsLoading(false);
+      return;
+    }
+    setIsLoading(true);
+    // 検索インデックスで候補の記事だけを取得（使えない場合は全記事）
+    fetchSearchCandidates(query)
+      .then(candidates => {
         // 【公開フィルタ】AI要約が完了した記事のみを検索対象にする
-        const publishableArticles = (data.articles || []).filter(
+        const publishableArticles = candidates.filter(
           (article: Article) => isPublishableSummary(article.summary)
         );
         setArticles(publishableArticles);
+        setFetchError(null);
         setIsLoading(false);
       })
       .catch((err) => {
@@ -59,22 +50,12 @@ function SearchResults() {
         setArticles([]);
         setIsLoading(false);
       });
-  }, []);
+  }, [query]);
 
   // 検索クエリで記事をフィルタリング（あいまい検索対応）
-  // タイトルと要約（記事内容）のみで検索、タグ（カテゴリ・ソース・キーワード）では検索しない
+  // タイトル・要約・ソース・キーワードの部分一致（全角半角・空白・長音の違いは無視）
   const searchResults = query
-    ? articles.filter((article) => {
-        const normalizedQuery = normalizeText(query);
-        const normalizedTitle = normalizeText(article.title);
-        const normalizedSummary = normalizeText(article.summary);
-
-        // 部分一致検索（タイトルと要約のみ）
-        return (
-          normalizedTitle.includes(normalizedQuery) ||
-          normalizedSummary.includes(normalizedQuery)
-        );
-      })
+    ? articles.filter((article) => matchesQuery(article, query))
     : [];
 
   if (isLoading) {
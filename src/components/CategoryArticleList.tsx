@@ -1,7 +1,7 @@
 'use client';
 
 import { useState, useEffect } from 'react';
-import { Article, BASE_PATH, getCategoryByName, Category, isPublishableSummary, fetchTrashedUrls } from '@/lib/types';
+import { Article, BASE_PATH, getCategoryByName, Category, isPublishableSummary, fetchTrashedUrls, fetchDataFile } from '@/lib/types';
 import NewsCard from '@/components/NewsCard';
 import BookmarkShortcut from '@/components/BookmarkShortcut';
 
@@ -17,11 +17,12 @@ export default function CategoryArticleList({ category }: Props) {
   useEffect(() => {
     async function fetchData() {
       try {
-        // 記事データとゴミ箱データを並列取得
-        const [res, trashedUrls] = await Promise.all([
-          fetch(`${BASE_PATH}/data/articles.json`),
+        // カテゴリー別の分割ファイルとゴミ箱データを並列取得（分割ファイルがなければ全記事）
+        const [shardRes, trashedUrls] = await Promise.all([
+          fetch(`${BASE_PATH}/data/shards/category/${category.id}.json`),
           fetchTrashedUrls()
         ]);
+        const res = shardRes.ok ? shardRes : await fetchDataFile('articles.json');
         if (!res.ok) throw new Error('記事データの取得に失敗しました');
         const data = await res.json();
 
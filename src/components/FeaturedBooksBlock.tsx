@@ -1,7 +1,7 @@
 'use client';
 
 import { useState, useEffect } from 'react';
-import { BASE_PATH, Article, isPublishableSummary } from '@/lib/types';
+import { Article, BASE_PATH, isPublishableSummary, fetchDataFile } from '@/lib/types';
 import { generateAmazonSearchUrl, generateRakutenSearchUrl } from '@/data/articles';
 import { trackClick } from '@/hooks/useTracking';
 
@@ -13,25 +13,56 @@ type BookKeyword = {
   rakutenUrl: string;
 };
 
+// キーワード抽出に使う最新記事の件数
+const RECENT_ARTICLE_COUNT = 5;
+
+type MonthShard = { key: string; file: string };
+
+// 【公開フィルタ】AI要約が完了した最新の記事を取得
+// 月別の分割ファイルを新しい月から読み、件数に達したら止める（分割ファイルがなければ全記事）
+async function fetchRecentArticles(count: number): Promise<Article[]> {
+  const manifestRes = await fetch(`${BASE_PATH}/data/shards/manifest.json`);
+  if (manifestRes.ok) {
+    const manifest = await manifestRes.json();
+    const months: MonthShard[] = (manifest.shards?.month || [])
+      .filter((entry: MonthShard) => entry.key !== 'unknown')
+      .sort((a: MonthShard, b: MonthShard) => b.key.localeCompare(a.key));
+    const articles: Article[] = [];
+    let complete = true;
+    for (const entry of months) {
+      const res = await fetch(`${BASE_PATH}/data/shards/${entry.file}`);
+      if (!res.ok) {
+        complete = false;
+        break;
+      }
+      const data = await res.json();
+      articles.push(...(data.articles || []).filter((article: Article) => isPublishableSummary(article.summary)));
+      if (articles.length >= count) break;
+    }
+    if (complete) return articles.slice(0, count);
+  }
+
+  const res = await fetchDataFile('articles.json');
+  if (!res.ok) throw new Error(`HTTP ${res.status}`);
+  const data = await res.json();
+  return (data.articles || [])
+    .filter((article: Article) => isPublishableSummary(article.summary))
+    .slice(0, count);
+}
+
 export default function FeaturedBooksBlock() {
   const [bookKeywords, setBookKeywords] = useState<BookKeyword[]>([]);
 
   useEffect(() => {
-    // 記事データを取得してキーワードを抽出
-    fetch(`${BASE_PATH}/data/articles.json`)
-      .then(res => res.json())
-      .then(data => {
-        // 【公開フィルタ】AI要約が完了した記事のみをキーワード抽出対象にする
-        const articles: Article[] = (data.articles || []).filter(
-          (article: Article) => isPublishableSummary(article.summary)
-        );
-
+    // 最新の記事を取得してキーワードを抽出
+    fetchRecentArticles(RECENT_ARTICLE_COUNT)
+      .then(articles => {
         // キーワードを抽出（重複を除去）
         const keywordSet = new Set<string>();
         const keywords: BookKeyword[] = [];
 
         // 最新5件の記事からキーワードを抽出
-        for (const article of articles.slice(0, 5)) {
+        for (const article of articles) {
           // mainKeywordがあれば使用
           if (article.mainKeyword && article.mainKeyword.trim() && !keywordSet.has(article.mainKeyword)) {
             keywordSet.add(article.mainKeyword);
@@ -54,7 +85,7 @@ export default function FeaturedBooksBlock() {
         };
 
         if (keywords.length < 3) {
-          for (const article of articles.slice(0, 5)) {
+          for (const article of articles) {
             const catKeyword = categoryKeywords[article.category];
             if (catKeyword && !keywordSet.has(catKeyword) && keywords.length < 4) {
               keywordSet.add(catKeyword);
@@ -1,7 +1,7 @@
 'use client';
 
 import { useState, useEffect } from 'react';
-import { Article, BASE_PATH, isPublishableSummary } from '@/lib/types';
+import { Article, isPublishableSummary, fetchDataFile } from '@/lib/types';
 import { supabase } from '@/lib/supabase';
 
 type RankedArticle = {
@@ -20,7 +20,7 @@ export default function RankingBlock() {
     async function calculateRanking() {
       try {
         // 記事データを取得
-        const res = await fetch(`${BASE_PATH}/data/articles.json`);
+        const res = await fetchDataFile('articles.json');
         if (!res.ok) return;
 
         const data = await res.json();
@@ -0,0 +1,107 @@
+import { Article, BASE_PATH, fetchDataFile } from '@/lib/types';
+
+// 検索インデックスの分割数（scripts/search_index.py の SHARD_COUNT と同じ）
+export const SEARCH_SHARD_COUNT = 256;
+
+// 候補がこれより多い場合は記事別ファイルではなく articles.json をまとめて取得
+const MAX_ARTICLE_FETCHES = 40;
+
+// 検索用にテキストを正規化（scripts/search_index.py の normalize と同じ）
+// NFKC（全角英数・半角カナの統一）→ 小文字 → 長音・ダッシュ類を「-」に → 空白を除く
+export function normalizeSearchText(text: string): string {
+  return (text || '')
+    .normalize('NFKC')
+    .toLowerCase()
+    .replace(/[ー―‐−–—]/g, '-')
+    .replace(/\s+/g, '');
+}
+
+// 正規化したテキストの文字2-gram
+function bigrams(text: string): string[] {
+  const chars = Array.from(text);
+  const grams = new Set<string>();
+  for (let i = 0; i < chars.length - 1; i++) {
+    grams.add(chars[i] + chars[i + 1]);
+  }
+  return Array.from(grams);
+}
+
+// 記事が検索語を含むか（タイトル・要約・ソース・キーワード）
+type SearchableArticle = Pick<Article, 'title' | 'summary'> & { source?: string; mainKeyword?: string };
+
+export function matchesQuery(article: SearchableArticle, query: string): boolean {
+  const normalizedQuery = normalizeSearchText(query);
+  if (!normalizedQuery) return false;
+  return [article.title, article.summary, article.source, article.mainKeyword]
+    .some((field) => normalizeSearchText(field || '').includes(normalizedQuery));
+}
+
+// 検索インデックスから候補の記事IDを取得（インデックスが使えない場合は null）
+async function searchArticleIds(normalizedQuery: string): Promise<string[] | null> {
+  const grams = bigrams(normalizedQuery);
+  if (grams.length === 0) return null; // 1文字の検索語はインデックスでは引けない
+
+  const shardNumbers = Array.from(new Set(grams.map((gram) => gram.codePointAt(0)! % SEARCH_SHARD_COUNT)));
+  const [manifestRes, ...shards] = await Promise.all([
+    fetch(`${BASE_PATH}/data/search/manifest.json`),
+    ...shardNumbers.map(async (number) => {
+      const res = await fetch(`${BASE_PATH}/data/search/${number}.json`);
+      if (res.status === 404) return {} as Record<string, string[]>; // この分割に該当する2-gramがない
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      return res.json() as Promise<Record<string, string[]>>;
+    }),
+  ]);
+  if (!(manifestRes as Response).ok) return null; // インデックスがまだ書き出されていない
+  const postings: Record<string, string[]> = Object.assign({}, ...shards);
+
+  // すべての2-gramを含む記事（並び順は最初の2-gramの一覧 = 日付の新しい順）
+  let ids: string[] | null = null;
+  for (const gram of grams) {
+    const list = postings[gram] || [];
+    if (ids === null) {
+      ids = list;
+    } else {
+      const listSet = new Set(list);
+      ids = ids.filter((id) => listSet.has(id));
+    }
+    if (ids.length === 0) break;
+  }
+  return ids || [];
+}
+
+// 全記事を取得
+async function fetchAllArticles(): Promise<Article[]> {
+  const res = await fetchDataFile('articles.json');
+  if (!res.ok) throw new Error(`HTTP ${res.status}`);
+  const data = await res.json();
+  return data.articles || [];
+}
+
+// 検索語を含む可能性のある記事を取得（検索インデックス → 記事別ファイル、使えなければ全記事）
+// 返した記事は matchesQuery で絞り込んでから表示する
+export async function fetchSearchCandidates(query: string): Promise<Article[]> {
+  const normalizedQuery = normalizeSearchText(query);
+  let ids: string[] | null = null;
+  try {
+    ids = await searchArticleIds(normalizedQuery);
+  } catch (err) {
+    console.warn('検索インデックスの取得に失敗、全記事から検索します:', err);
+  }
+  if (ids === null || ids.length > MAX_ARTICLE_FETCHES) {
+    return fetchAllArticles();
+  }
+  if (ids.length === 0) {
+    return [];
+  }
+
+  try {
+    return await Promise.all(ids.map(async (id) => {
+      const res = await fetch(`${BASE_PATH}/data/articles/${id}.json`);
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      return res.json() as Promise<Article>;
+    }));
+  } catch (err) {
+    console.warn('記事別ファイルの取得に失敗、全記事から検索します:', err);
+    return fetchAllArticles();
+  }
+}
@@ -10,6 +10,7 @@ export type Article = {
   source: string;
   mainKeyword?: string; // Amazon検索用キーワード（AI抽出）
   importanceScore?: number; // AI重要度スコア（1-100）
+  extraSources?: { source: string; url: string }[]; // 同じ話題を配信した他のソース
 };
 
 // ランキング用の記事型
@@ -63,10 +64,26 @@ export type TrashedArticlesData = {
   lastUpdated: string | null;
 };
 
+// 配信用データの対応表（論理名 → ハッシュ付きファイル）
+// デプロイ時に scripts/build-data-artifacts.py が生成し、next.config.mjs がビルドに埋め込む
+// → 実行時に対応表を取得しないため、リクエストは増えない
+const DATA_FILES: Record<string, string> = JSON.parse(process.env.DATA_FILES || '{}');
+
+// public/data のファイルを取得（ハッシュ付きのファイルがあればそちら、なければ元のファイル）
+// ファイル名が内容ごとに変わるため、デプロイ直後に古いキャッシュのデータが表示されない
+export async function fetchDataFile(name: string): Promise<Response> {
+  const hashedFile = DATA_FILES[name];
+  if (hashedFile) {
+    const res = await fetch(`${BASE_PATH}/data/${hashedFile}`);
+    if (res.ok) return res;
+  }
+  return fetch(`${BASE_PATH}/data/${name}`);
+}
+
 // ゴミ箱のURLリストを取得
 export async function fetchTrashedUrls(): Promise<Set<string>> {
   try {
-    const res = await fetch(`${BASE_PATH}/data/trashed-articles.json`);
+    const res = await fetchDataFile('trashed-articles.json');
     if (!res.ok) return new Set();
     const data: TrashedArticlesData = await res.json();
     return new Set(data.articles.map(a => a.url));